@@ -14,10 +14,49 @@
 # and limitations under the License.
 #
 
-from base64 import b64encode
+import hashlib
+import json
+import math
+import threading
+import time
+from base64 import b64encode, urlsafe_b64decode
+from collections import deque
+from collections.abc import Collection, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from typing import Callable, Optional
+from urllib.parse import parse_qs, urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from cydarm_cache import TTLCache
+from cydarm_case_data import matches_case_data, prepare_case_data
+from cydarm_case_filter import CaseFilter, sort_cases
+from cydarm_deadline import Deadline
+from cydarm_logging import CydarmLogger
+from cydarm_metrics import Metrics
+from cydarm_rate_limit import RateLimiter
+from cydarm_retry import RETRYABLE_STATUS_CODES, CircuitBreaker, RetryPolicy
+from cydarm_upload import Base64JSONBody, UploadData
+
+
+# max number of pooled (keep-alive) connections to the Cydarm API
+DEFAULT_POOL_MAXSIZE = 10
+# case data items per page. Items carry their data, so pages are kept small.
+DEFAULT_CASE_DATA_PAGE_SIZE = 50
+# seconds to wait for a connection to Cydarm, and then for each read of its response
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 60.0
+# refresh the bearer token this many seconds before its JWT 'exp' claim
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+
+
+def split_tags(tags: Optional[str]) -> list[str]:
+    """
+    Splits a comma separated list of tags, dropping blanks.
+    """
+    return [tag.strip() for tag in (tags or "").split(",") if tag.strip()]
 
 
 class CydarmAPI:
@@ -28,60 +67,295 @@ class CydarmAPI:
         password,
         basic_auth_creds: Optional[tuple[str, str]] = None,
         log_function: Optional[Callable[[str], None]] = None,
+        bearer_token: Optional[str] = None,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        reference_cache: Optional[TTLCache] = None,
+        validator_cache: Optional[TTLCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        logger: Optional[CydarmLogger] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[Metrics] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        deadline: Optional[Deadline] = None,
     ):
         # base_url should look like https://xyz.cydarm.io/cydarm_api
         self.base_url = base_url
         self.username = username
         self.password = password
         self.basic_auth_creds = basic_auth_creds
-        self.log_function = log_function
+        # logger takes precedence over log_function, which is logged to at the default level
+        self.logger = logger or CydarmLogger(log_function)
+        self.pool_maxsize = pool_maxsize
+        # caches GET responses for rarely changing objects (users, ACLs, playbooks, playbook actions). None disables caching.
+        self.reference_cache = reference_cache
+        # last response body and its validators per URL, for conditional GETs of cases. None disables conditional GETs.
+        self.validator_cache = validator_cache
+        # retries idempotent requests that failed with a connection error or a 'try again later' status. None disables retries.
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        # throttles requests per endpoint class (auth, read, write). None disables rate limiting.
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics or Metrics()
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        # no request is started, and no retry waited for, past the deadline. None means no deadline.
+        self.deadline = deadline
+
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+
+        self._bearer_token: Optional[str] = None
+        self._bearer_token_expiry: Optional[float] = None
+        self._bearer_token_lock = threading.Lock()
+        if bearer_token:
+            self.set_bearer_token(bearer_token)
 
     @staticmethod
     def to_base64(string):
-        return b64encode(string.encode("ascii")).decode("ascii")
+        return b64encode(string.encode("utf-8")).decode("ascii")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
 
     def generate_bearer_token(self) -> str:
-        session = self.create_session(with_bearer_token=False)
-        resp = self.rest_call_with_session(
-            session,
-            "post",
-            "/auth/password",
-            return_json=False,
-            json={"username": self.to_base64(self.username), "password": self.to_base64(self.password)},
-        )
-        return resp.headers["Access-Token"]
+        with self.metrics.timer("generate_bearer_token"):
+            resp = self.rest_call_with_session(
+                self.session,
+                "post",
+                "/auth/password",
+                return_json=False,
+                json={"username": self.to_base64(self.username), "password": self.to_base64(self.password)},
+            )
+            return resp.headers["Access-Token"]
+
+    @staticmethod
+    def get_token_expiry(token: str) -> Optional[float]:
+        """
+        Reads the 'exp' claim of a JWT bearer token.
+
+        :return: expiry as a unix timestamp, or None if the token is not a JWT with an 'exp' claim.
+        """
+        try:
+            payload = token.split(".")[1]
+            payload += "=" * (-len(payload) % 4)
+            return float(json.loads(urlsafe_b64decode(payload))["exp"])
+        except (IndexError, KeyError, TypeError, ValueError):
+            return None
+
+    @property
+    def bearer_token(self) -> Optional[str]:
+        return self._bearer_token
+
+    def set_bearer_token(self, token: str):
+        self._bearer_token = token
+        self._bearer_token_expiry = self.get_token_expiry(token)
+
+    def invalidate_bearer_token(self, token: Optional[str] = None):
+        # only drop the cached token if it is the one that was rejected - another thread may have refreshed it already
+        with self._bearer_token_lock:
+            if token is None or token == self._bearer_token:
+                self._bearer_token = None
+                self._bearer_token_expiry = None
+
+    def is_bearer_token_valid(self) -> bool:
+        if not self._bearer_token:
+            return False
+        if self._bearer_token_expiry is None:
+            # expiry unknown - keep using the token until the server rejects it
+            return True
+        return time.time() < self._bearer_token_expiry - TOKEN_REFRESH_MARGIN_SECONDS
+
+    def get_bearer_token(self) -> str:
+        """
+        Returns the cached bearer token, generating a new one if there is none or it is about to expire.
+        """
+        with self._bearer_token_lock:
+            if not self.is_bearer_token_valid():
+                self.set_bearer_token(self.generate_bearer_token())
+            return self._bearer_token
 
-    def create_session(self, with_bearer_token=True):
+    def create_session(self) -> requests.Session:
         session = requests.session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
 
         if self.basic_auth_creds:
             session.auth = self.basic_auth_creds
-
-        if with_bearer_token:
-            session.headers.update({"x-cydarm-authz": self.generate_bearer_token()})
         return session
 
+    @property
+    def session(self) -> requests.Session:
+        """
+        Long-lived session shared by all calls, so connections are reused. Closed by close().
+        """
+        with self._session_lock:
+            if self._session is None:
+                self._session = self.create_session()
+            return self._session
+
     def rest_call_with_session(self, session, method: str, url_path: str, return_json: bool = True, **kwargs):
         func = getattr(session, method)
         url = f"{self.base_url}{url_path}"
 
-        if self.log_function:
-            self.log_function(f"HTTP {method} request to {url} with auth={session.auth}, headers={session.headers} and kwargs={kwargs}")
+        self.logger.debug("HTTP %s request to %s with headers=%s and kwargs=%s", method, url, session.headers, kwargs)
 
-        resp = func(url, **kwargs)
+        attempt = 0
+        while True:
+            if self.circuit_breaker:
+                self.circuit_breaker.before_call()
+            if self.rate_limiter:
+                waited = self.rate_limiter.acquire(method, url_path)
+                if waited:
+                    self.logger.debug("Waited %.2fs for the rate limit before HTTP %s request to %s", waited, method, url)
+            self.check_deadline()
+
+            resp = None
+            start = time.perf_counter()
+            try:
+                resp = func(url, timeout=self.get_timeout(), **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.metrics.record_request(method, url_path, None, time.perf_counter() - start)
+                self.record_call_outcome(success=False)
+                if not (self.retry_policy and self.retry_policy.should_retry(method, attempt)):
+                    self.check_deadline()
+                    raise
+                error = e
+                retry_after = None
+            else:
+                self.metrics.record_request(method, url_path, resp.status_code, time.perf_counter() - start, len(resp.content))
+                is_retryable_status = resp.status_code in RETRYABLE_STATUS_CODES
+                self.record_call_outcome(success=not (is_retryable_status or resp.status_code >= 500))
+                if not (is_retryable_status and self.retry_policy and self.retry_policy.should_retry(method, attempt)):
+                    break
+                retry_after = resp.headers.get("Retry-After")
+
+            delay = self.retry_policy.get_delay(attempt, retry_after)
+            remaining = self.deadline.remaining() if self.deadline else None
+            if remaining is not None and delay >= remaining:
+                # the retry could not start before the deadline, so give up now rather than sleep through it
+                self.check_deadline()
+                if resp is None:
+                    raise error
+                break
+            attempt += 1
+            self.logger.warning(
+                "Retrying HTTP %s request to %s in %.1fs (retry %d of %d)", method, url, delay, attempt, self.retry_policy.max_retries
+            )
+            time.sleep(delay)
+
+        self.logger.debug("HTTP %s response from %s: %d", method, url, resp.status_code)
         resp.raise_for_status()
         if return_json:
-            return resp.json()
+            with self.metrics.timer("json_decode"):
+                return resp.json()
         else:
             return resp
 
+    def get_timeout(self) -> tuple[float, float]:
+        """
+        (connect, read) timeouts for the next request, cut down to the time left before the deadline. The read timeout
+        applies to each read from the socket, so a slowly streamed response can still overrun the deadline a little.
+        """
+        remaining = self.deadline.remaining() if self.deadline else None
+        if remaining is None:
+            return self.connect_timeout, self.read_timeout
+        return min(self.connect_timeout, remaining), min(self.read_timeout, remaining)
+
+    def check_deadline(self):
+        """
+        :raises DeadlineExceededError: if the deadline has passed.
+        """
+        if self.deadline:
+            self.deadline.check()
+
+    def record_call_outcome(self, success: bool):
+        if not self.circuit_breaker:
+            return
+        if success:
+            self.circuit_breaker.record_success()
+        else:
+            self.circuit_breaker.record_failure()
+
+    def rest_call_with_token(self, token: str, method: str, url_path: str, return_json: bool = True, headers: Optional[dict] = None, **kwargs):
+        headers = dict(headers or {})
+        headers["x-cydarm-authz"] = token
+        return self.rest_call_with_session(self.session, method, url_path, return_json=return_json, headers=headers, **kwargs)
+
     def rest_call(self, method: str, url_path: str, return_json: bool = True, **kwargs):
-        session = self.create_session()
-        return self.rest_call_with_session(session, method, url_path, return_json=return_json, **kwargs)
+        token = self.get_bearer_token()
+        try:
+            return self.rest_call_with_token(token, method, url_path, return_json=return_json, **kwargs)
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 401:
+                raise
+            # cached token was rejected (e.g. revoked or expired early) - retry once with a fresh token
+            self.invalidate_bearer_token(token)
+
+        return self.rest_call_with_token(self.get_bearer_token(), method, url_path, return_json=return_json, **kwargs)
 
     def rest_get(self, url, **kwargs):
         return self.rest_call(method="get", url_path=url, **kwargs)
 
+    def rest_get_cached(self, url, **kwargs):
+        """
+        Like rest_get(), but served from the reference cache when it holds an unexpired response for url.
+        """
+        if self.reference_cache is None:
+            return self.rest_get(url, **kwargs)
+        resp = self.reference_cache.get(url)
+        if resp is None:
+            resp = self.rest_get(url, **kwargs)
+            self.reference_cache.set(url, resp)
+        return resp
+
+    def rest_get_conditional(self, url, headers: Optional[dict] = None, **kwargs):
+        """
+        Like rest_get(), but revalidates the last response for url with If-None-Match / If-Modified-Since.
+
+        On HTTP 304 the cached body is returned. If the server ignores the validators, a body with the same hash as the
+        cached one is still not parsed again. The returned object may be shared with the cache - don't modify it.
+        """
+        if self.validator_cache is None:
+            return self.rest_get(url, headers=headers, **kwargs)
+
+        cached = self.validator_cache.get(url)
+        headers = dict(headers or {})
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        resp = self.rest_get(url, return_json=False, headers=headers, **kwargs)
+        if cached and resp.status_code == 304:
+            return cached["body"]
+
+        body_hash = hashlib.sha256(resp.content).hexdigest()
+        body = cached["body"] if cached and cached["body_hash"] == body_hash else resp.json()
+        self.validator_cache.set(
+            url,
+            {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "body_hash": body_hash,
+                "body": body,
+            },
+        )
+        return body
+
     def rest_post(self, url, **kwargs):
         return self.rest_call(method="post", url_path=url, **kwargs)
 
@@ -92,28 +366,34 @@ class CydarmAPI:
         return self.rest_call(method="put", url_path=url, return_json=False, **kwargs)
 
     def get_case(self, case_uuid):
-        return self.rest_get(f"/case/{case_uuid}")
+        return self.rest_get_conditional(f"/case/{case_uuid}")
 
     def get_playbook(self, playbook_uuid):
-        return self.rest_get(f"/playbook/{playbook_uuid}")
+        return self.rest_get_cached(f"/playbook/{playbook_uuid}")
 
     def create_playbook(self, name: Optional[str] = None, description: Optional[str] = None, acl_uuid: Optional[str] = None):
         return self.rest_post("/playbook", json={"atc": {"name": name, "description": description, "acl": acl_uuid}})
 
     def get_playbook_action(self, action_uuid):
-        return self.rest_get(f"/playbook-action/{action_uuid}")
+        return self.rest_get_cached(f"/playbook-action/{action_uuid}")
 
     def create_playbook_action(self, name: Optional[str] = None, description: Optional[str] = None, acl_uuid: Optional[str] = None):
         return self.rest_post("/playbook-action", json={"atc": {"name": name, "description": description, "acl": acl_uuid}})
 
     def add_action_to_playbook(self, playbook_uuid: str, action_uuid: str):
-        return self.rest_post(f"/playbook/{playbook_uuid}/playbook-action/{action_uuid}", json={"atc": {}}, return_json=False)
+        try:
+            return self.rest_post(f"/playbook/{playbook_uuid}/playbook-action/{action_uuid}", json={"atc": {}}, return_json=False)
+        finally:
+            # the playbook's action list changes. Invalidating once the request is done also drops any copy that a
+            # concurrent get_playbook() cached while it was in flight; a failed request may still have been applied.
+            if self.reference_cache is not None:
+                self.reference_cache.invalidate(f"/playbook/{playbook_uuid}")
 
     def get_case_playbook(self, case_uuid, case_playbook_uuid):
         return self.rest_get(f"/case/{case_uuid}/playbook/{case_playbook_uuid}")
 
     def get_case_playbooks(self, case_uuid):
-        return self.rest_get(f"/case/{case_uuid}/playbook")
+        return self.rest_get_conditional(f"/case/{case_uuid}/playbook")
 
     def create_case_playbook(self, case_uuid, playbook_uuid):
         return self.rest_post(f"/case/{case_uuid}/playbook/{playbook_uuid}")
@@ -150,45 +430,268 @@ class CydarmAPI:
         body.update(**kwargs)
         return self.rest_post("/case", json=body)
 
-    def create_action_instance_data(self, action_instance_uuid: str, comment: str):
-        return self.rest_post(
-            f"/action-instance/{action_instance_uuid}/data",
-            json={"data": self.to_base64(comment), "mimeType": "text/plain", "significance": "Comment"},
-        )
+    def create_action_instance_data(
+        self, action_instance_uuid: str, comment: UploadData, mime_type: str = "text/plain", significance: str = "Comment"
+    ):
+        return self.upload_data(f"/action-instance/{action_instance_uuid}/data", comment, mime_type=mime_type, significance=significance)
 
     def create_case_data_comment(self, case_uuid: str, comment: str):
-        return self.rest_post(
-            f"/case/{case_uuid}/data", json={"data": self.to_base64(comment), "mimeType": "text/plain", "significance": "Comment"}
-        )
+        return self.create_case_data(case_uuid, comment)
+
+    def create_case_data(self, case_uuid: str, data: UploadData, mime_type: str = "text/plain", significance: str = "Comment"):
+        """
+        :param data: text (sent UTF-8 encoded), bytes, or the path of a file to upload.
+        """
+        return self.upload_data(f"/case/{case_uuid}/data", data, mime_type=mime_type, significance=significance)
+
+    def upload_data(self, url_path: str, data: UploadData, mime_type: str = "text/plain", significance: str = "Comment"):
+        # the base64 encoded data is streamed into the request body rather than built up in memory
+        body = Base64JSONBody(data, mime_type=mime_type, significance=significance)
+        return self.rest_post(url_path, data=body, headers={"Content-Type": "application/json"})
 
     def get_case_data_list(self, case_uuid: str):
         return self.rest_get(f"/case/{case_uuid}/data")
 
+    def get_case_data_paginated(self, case_uuid: str, page_size: int = DEFAULT_CASE_DATA_PAGE_SIZE, page_num: int = 0):
+        return self.rest_get(f"/case/{case_uuid}/data", params={"page[number]": page_num, "page[size]": page_size})
+
+    def iter_case_data(
+        self,
+        case_uuid: str,
+        page_size: int = DEFAULT_CASE_DATA_PAGE_SIZE,
+        significances: Optional[Collection[str]] = None,
+        mime_types: Optional[Collection[str]] = None,
+        decode: bool = False,
+        max_size: Optional[int] = None,
+        max_results: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """
+        Yields the data items of a case one page at a time, following links.next.
+
+        :param significances: only yield items with one of these significances.
+        :param mime_types: only yield items with one of these mime types; 'type/*' matches any subtype.
+        :param decode: add the decoded text of text items as 'decoded_data'. Each item is decoded as it is yielded.
+        :param max_size: cut the data of larger items down to this many bytes.
+        :param max_results: stop after this many items.
+        """
+        num_results = 0
+        page_number = 0
+        while True:
+            resp = self.get_case_data_paginated(case_uuid, page_size=page_size, page_num=page_number)
+            for item in resp.get("case_data") or []:
+                if not matches_case_data(item, significances=significances, mime_types=mime_types):
+                    continue
+                yield prepare_case_data(item, decode=decode, max_size=max_size)
+                num_results += 1
+                if max_results is not None and num_results >= max_results:
+                    return
+            if "next" not in resp.get("links", {}):
+                return
+            page_number += 1
+
     def get_case_quick_search(self, search_string: str):
         return self.rest_post("/case/quick-search", json={"searchString": search_string})
 
-    def get_cases_filtered(self, page_size=1000, filter_text: str = "", tags_included: str = ""):
-        # TODO: implement remaining query params for getCasesFiltered
-        # TODO: Cydarm API seems to have bug with cases that have multiple assigned tags - returns HTTP 500
+    def get_cases_filtered(
+        self, page_size=1000, filter_text: str = "", tags_included: str = "", max_workers: int = 1, case_filter: Optional[CaseFilter] = None
+    ):
         """
 
         :param page_size:
         :param filter_text:
-        :param tags_included: comma separated list of tags.
+        :param tags_included: comma separated list of tags. Cases with any of the tags are returned.
+        :param max_workers: number of pages to fetch concurrently. With 1, pages are fetched one after the other.
+        :param case_filter: the other filters and the sort order, applied to the cases as they are read.
         :return:
         """
-        all_data = []
-        page_number = 0
-        while True:
-            resp = self.get_cases_filtered_paginated(
+        return list(
+            self.iter_cases_filtered(
+                page_size=page_size, filter_text=filter_text, tags_included=tags_included, max_workers=max_workers, case_filter=case_filter
+            )
+        )
+
+    def iter_cases_filtered(
+        self,
+        page_size=1000,
+        filter_text: str = "",
+        tags_included: str = "",
+        max_workers: int = 1,
+        max_results: Optional[int] = None,
+        case_filter: Optional[CaseFilter] = None,
+    ) -> Iterator[dict]:
+        """
+        Same as get_cases_filtered(), but yields the cases page by page instead of collecting them all in a list.
+
+        :param max_results: stop after this many cases. No further pages are requested once it is reached.
+        """
+        if max_results is not None and max_results <= 0:
+            return
+        case_filter = case_filter or CaseFilter()
+        if case_filter.sort:
+            # every matching case has to be read before the first one can be yielded
+            cases = self.iter_cases_filtered(
+                page_size=page_size,
+                filter_text=filter_text,
+                tags_included=tags_included,
+                max_workers=max_workers,
+                case_filter=case_filter.without_sort(),
+            )
+            yield from sort_cases(cases, case_filter.sort)[:max_results]
+            return
+        tags = split_tags(tags_included)
+        if len(tags) > 1:
+            # Cydarm returns HTTP 500 for cases with several tags when filter[inc_tag] lists more than one tag
+            yield from self.iter_cases_by_tags(
+                tags_included=tags,
+                page_size=page_size,
+                filter_text=filter_text,
+                max_workers=max_workers,
+                max_results=max_results,
+                case_filter=case_filter,
+            )
+            return
+        if max_results is not None and not case_filter.filters_cases:
+            page_size = min(page_size, max_results)
+
+        num_results = 0
+        for page in self.iter_cases_filtered_pages(
+            page_size=page_size, filter_text=filter_text, tags_included=tags_included, max_workers=max_workers
+        ):
+            for case in page["data"]:
+                if not case_filter.matches(case):
+                    continue
+                yield case
+                num_results += 1
+                if max_results is not None and num_results >= max_results:
+                    return
+
+    def iter_cases_by_tags(
+        self,
+        tags_included: Collection[str] = (),
+        tags_required: Collection[str] = (),
+        tags_excluded: Collection[str] = (),
+        page_size=1000,
+        filter_text: str = "",
+        max_workers: int = 1,
+        max_results: Optional[int] = None,
+        case_filter: Optional[CaseFilter] = None,
+    ) -> Iterator[dict]:
+        """
+        Yields each case that has any of tags_included, every one of tags_required and none of tags_excluded.
+
+        Every tag is queried on its own and the results are combined by case UUID. The UUIDs of the cases with each
+        filtering tag are fetched first, up to max_workers tags at a time; then the cases of the first required tag, or
+        else of each included tag, are streamed and yielded once each. Only UUIDs are held in memory. If neither
+        tags_included nor tags_required is given, every case is read.
+
+        :param case_filter: applied to the streamed cases. If it sorts them, every matching case is read first.
+        """
+        if case_filter and case_filter.sort:
+            cases = self.iter_cases_by_tags(
+                tags_included=tags_included,
+                tags_required=tags_required,
+                tags_excluded=tags_excluded,
+                page_size=page_size,
+                filter_text=filter_text,
+                max_workers=max_workers,
+                case_filter=case_filter.without_sort(),
+            )
+            yield from sort_cases(cases, case_filter.sort)[:max_results]
+            return
+        tags_included, tags_required, tags_excluded = (list(dict.fromkeys(tags)) for tags in (tags_included, tags_required, tags_excluded))
+        if tags_required:
+            streamed_tags = tags_required[:1]
+            filter_tags = tags_required[1:] + tags_included + tags_excluded
+        else:
+            streamed_tags = tags_included or [""]
+            filter_tags = tags_excluded
+
+        def get_uuids(tag: str) -> set[str]:
+            cases = self.iter_cases_filtered(page_size=page_size, filter_text=filter_text, tags_included=tag)
+            return {case["uuid"] for case in cases}
+
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            uuids = dict(zip(filter_tags, executor.map(get_uuids, filter_tags)))
+        required = set.intersection(*(uuids[tag] for tag in tags_required[1:])) if len(tags_required) > 1 else None
+        included = set().union(*(uuids[tag] for tag in tags_included)) if tags_required and tags_included else None
+        excluded = set().union(*(uuids[tag] for tag in tags_excluded))
+
+        seen = set()
+        for tag in streamed_tags:
+            cases = self.iter_cases_filtered(
+                page_size=page_size, filter_text=filter_text, tags_included=tag, max_workers=max_workers, case_filter=case_filter
+            )
+            for case in cases:
+                uuid = case["uuid"]
+                if (
+                    uuid in seen
+                    or uuid in excluded
+                    or (required is not None and uuid not in required)
+                    or (included is not None and uuid not in included)
+                ):
+                    continue
+                seen.add(uuid)
+                yield case
+                if max_results is not None and len(seen) >= max_results:
+                    return
+
+    def iter_cases_filtered_pages(self, page_size=1000, filter_text: str = "", tags_included: str = "", max_workers: int = 1) -> Iterator[dict]:
+        """
+        Yields the raw responses of get_cases_filtered_paginated(), in page order.
+
+        If max_workers > 1 and the first page reports the last page number, up to max_workers pages are fetched ahead
+        concurrently. Otherwise links.next is followed one page at a time.
+        """
+
+        def get_page(page_number):
+            return self.get_cases_filtered_paginated(
                 page_num=page_number, page_size=page_size, filter_text=filter_text, tags_included=tags_included
             )
-            all_data.extend(resp["data"])
-            if "next" in resp["links"]:
-                page_number += 1
-            else:
-                break
-        return all_data
+
+        resp = get_page(0)
+        yield resp
+        last_page_number = self.get_last_page_number(resp, page_size) if max_workers > 1 else None
+
+        if last_page_number is not None:
+            page_numbers = iter(range(1, last_page_number + 1))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending = deque(executor.submit(get_page, page_number) for page_number in islice(page_numbers, max_workers))
+                try:
+                    while pending:
+                        page = pending.popleft().result()
+                        next_page_number = next(page_numbers, None)
+                        if next_page_number is not None:
+                            pending.append(executor.submit(get_page, next_page_number))
+                        yield page
+                finally:
+                    # consumer stopped early - don't fetch pages nobody will read
+                    for future in pending:
+                        future.cancel()
+            return
+
+        page_number = 0
+        while "next" in resp["links"]:
+            page_number += 1
+            resp = get_page(page_number)
+            yield resp
+
+    @staticmethod
+    def get_last_page_number(resp: dict, page_size: int) -> Optional[int]:
+        """
+        Works out the (zero-based) number of the last page from the 'last' link or the total count of a paginated response.
+
+        :return: the last page number, or None if the response doesn't say.
+        """
+        last_link = resp.get("links", {}).get("last")
+        if last_link:
+            page_number = parse_qs(urlsplit(last_link).query).get("page[number]")
+            if page_number and page_number[0].isdigit():
+                return int(page_number[0])
+
+        total = resp.get("meta", {}).get("total")
+        if isinstance(total, int):
+            return max(math.ceil(total / page_size) - 1, 0)
+        return None
 
     def get_cases_filtered_paginated(self, page_size=1000, page_num=0, filter_text: Optional[str] = None, tags_included: Optional[str] = None):
         params = {
@@ -202,10 +705,10 @@ class CydarmAPI:
         return self.rest_get("/case", params=params)
 
     def get_user(self, user_uuid):
-        return self.rest_get(f"/user/{user_uuid}")
+        return self.rest_get_cached(f"/user/{user_uuid}")
 
     def get_acl(self, acl_uuid):
-        return self.rest_get(f"/acl/{acl_uuid}")
+        return self.rest_get_cached(f"/acl/{acl_uuid}")
 
     def add_case_tag(self, case_uuid: str, tag_value: str):
         return self.rest_post(f"/case/{case_uuid}/tag", json={"tagValue": tag_value})
@@ -0,0 +1,266 @@
+# File: cydarm_async_api.py
+#
+# Copyright (c) Splunk, 2023-2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from cydarm_api import DEFAULT_CASE_DATA_PAGE_SIZE, CydarmAPI
+from cydarm_case_filter import CaseFilter
+from cydarm_upload import UploadData
+
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+
+class AsyncCydarmAPI:
+    """
+    asyncio front-end with the same methods as CydarmAPI.
+
+    Each call runs the matching CydarmAPI method on a thread pool, so all calls share the wrapped instance's pooled
+    session and cached bearer token. At most max_concurrency calls are in flight at once - the wrapped CydarmAPI
+    should have a pool_maxsize of at least this, otherwise extra connections are not kept alive.
+    If rate_limit is set, calls are started no faster than rate_limit per second.
+
+    This is not a native async transport: each in-flight call blocks a worker thread in requests, so concurrency is
+    bounded by the max_concurrency threads, each with its own stack, rather than by open sockets. That suits the tens
+    of concurrent requests a SOAR action makes, and keeps one HTTP code path - retries, rate limiting, the circuit
+    breaker, deadlines and caches - for both clients. Fanning out to thousands of requests at once would need an
+    async HTTP client instead.
+    """
+
+    def __init__(self, cydarm: CydarmAPI, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, rate_limit: Optional[float] = None):
+        self.cydarm = cydarm
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        # created on first use, so they belong to the event loop that runs the calls
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._rate_limit_lock: Optional[asyncio.Lock] = None
+        self._next_call_time = 0.0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        # the wrapped CydarmAPI (and its session) is owned by the caller and left open
+        self._executor.shutdown(wait=True)
+
+    async def call(self, func: Callable, *args, **kwargs):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            # calls still queued when the deadline passes fail straight away
+            self.cydarm.check_deadline()
+            await self._wait_for_rate_limit()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def _wait_for_rate_limit(self):
+        if not self.rate_limit:
+            return
+        if self._rate_limit_lock is None:
+            self._rate_limit_lock = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+        async with self._rate_limit_lock:
+            delay = self._next_call_time - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_call_time = max(loop.time(), self._next_call_time) + 1 / self.rate_limit
+
+    @staticmethod
+    async def gather(*aws) -> list:
+        """
+        Runs the awaitables concurrently. Results are in the given order; a failed call gives its exception instead of a result.
+        """
+        return await asyncio.gather(*aws, return_exceptions=True)
+
+    async def get_case(self, case_uuid):
+        return await self.call(self.cydarm.get_case, case_uuid)
+
+    async def get_playbook(self, playbook_uuid):
+        return await self.call(self.cydarm.get_playbook, playbook_uuid)
+
+    async def create_playbook(self, name: Optional[str] = None, description: Optional[str] = None, acl_uuid: Optional[str] = None):
+        return await self.call(self.cydarm.create_playbook, name=name, description=description, acl_uuid=acl_uuid)
+
+    async def get_playbook_action(self, action_uuid):
+        return await self.call(self.cydarm.get_playbook_action, action_uuid)
+
+    async def create_playbook_action(self, name: Optional[str] = None, description: Optional[str] = None, acl_uuid: Optional[str] = None):
+        return await self.call(self.cydarm.create_playbook_action, name=name, description=description, acl_uuid=acl_uuid)
+
+    async def add_action_to_playbook(self, playbook_uuid: str, action_uuid: str):
+        return await self.call(self.cydarm.add_action_to_playbook, playbook_uuid, action_uuid)
+
+    async def get_case_playbook(self, case_uuid, case_playbook_uuid):
+        return await self.call(self.cydarm.get_case_playbook, case_uuid, case_playbook_uuid)
+
+    async def get_case_playbooks(self, case_uuid):
+        return await self.call(self.cydarm.get_case_playbooks, case_uuid)
+
+    async def get_case_playbook_tree(self, case_uuid: str) -> tuple[dict, dict]:
+        """
+        Gets every playbook instance of a case, with each of its action statuses carrying the playbook action, as one
+        nested document with the case's completion counts.
+
+        Each instance is expanded as soon as it is fetched, and the action of each actionInstanceUuid is fetched once
+        however many statuses refer to it. The counts are the case's totalActionsInAllPlaybooks and
+        totalCompletedActionsInAllPlaybooks, fetched alongside. A failed lookup leaves a gap in the tree rather than
+        failing it: an instance falls back to its entry in the case's playbook list, a status gets an 'action' of None,
+        and the counts are None.
+
+        :return: the tree, and the exception raised by each failed lookup keyed by the UUID looked up.
+        """
+        errors = {}
+        actions: dict[str, asyncio.Future] = {}
+
+        def get_action(action_instance_uuid: str) -> asyncio.Future:
+            # the memo holds the future rather than the result, so concurrent lookups of one action share a request
+            if action_instance_uuid not in actions:
+                actions[action_instance_uuid] = asyncio.ensure_future(self.get_playbook_action(action_instance_uuid))
+            return actions[action_instance_uuid]
+
+        async def expand(listed_playbook: dict) -> dict:
+            case_playbook_uuid = listed_playbook["casePlaybookUuid"]
+            try:
+                playbook = await self.get_case_playbook(case_uuid, case_playbook_uuid)
+            except Exception as e:
+                errors[case_playbook_uuid] = e
+                playbook = listed_playbook
+            statuses = playbook.get("action_statuses") or []
+            results = await self.gather(*[get_action(status["actionInstanceUuid"]) for status in statuses if status.get("actionInstanceUuid")])
+            results = iter(results)
+            action_statuses = []
+            for status in statuses:
+                action = next(results) if status.get("actionInstanceUuid") else None
+                if isinstance(action, Exception):
+                    errors[status["actionInstanceUuid"]] = action
+                    action = None
+                action_statuses.append({**status, "action": action})
+            return {**playbook, "action_statuses": action_statuses, "total_actions": len(action_statuses)}
+
+        async def expand_all() -> list[dict]:
+            return await asyncio.gather(*[expand(listed_playbook) for listed_playbook in await self.get_case_playbooks(case_uuid)])
+
+        case, playbooks = await asyncio.gather(self.get_case(case_uuid), expand_all(), return_exceptions=True)
+        if isinstance(playbooks, Exception):
+            raise playbooks
+        if isinstance(case, Exception):
+            errors[case_uuid] = case
+            case = {}
+        tree = {
+            "caseUuid": case_uuid,
+            "playbooks": playbooks,
+            "totalActionsInAllPlaybooks": case.get("totalActionsInAllPlaybooks"),
+            "totalCompletedActionsInAllPlaybooks": case.get("totalCompletedActionsInAllPlaybooks"),
+        }
+        return tree, errors
+
+    async def create_case_playbook(self, case_uuid, playbook_uuid):
+        return await self.call(self.cydarm.create_case_playbook, case_uuid, playbook_uuid)
+
+    async def add_watcher_to_case(self, case_uuid: str, user_uuid: str):
+        return await self.call(self.cydarm.add_watcher_to_case, case_uuid, user_uuid)
+
+    async def add_member_to_case(self, case_uuid: str, member_case_uuid: str):
+        return await self.call(self.cydarm.add_member_to_case, case_uuid, member_case_uuid)
+
+    async def update_case(self, case_uuid: str, **kwargs):
+        return await self.call(self.cydarm.update_case, case_uuid, **kwargs)
+
+    async def update_case_history(self, case_uuid: str, modified: str, status: str):
+        return await self.call(self.cydarm.update_case_history, case_uuid, modified, status)
+
+    async def create_case(self, description: str, org: str, **kwargs):
+        return await self.call(self.cydarm.create_case, description, org, **kwargs)
+
+    async def create_action_instance_data(
+        self, action_instance_uuid: str, comment: UploadData, mime_type: str = "text/plain", significance: str = "Comment"
+    ):
+        return await self.call(
+            self.cydarm.create_action_instance_data, action_instance_uuid, comment, mime_type=mime_type, significance=significance
+        )
+
+    async def create_case_data_comment(self, case_uuid: str, comment: str):
+        return await self.call(self.cydarm.create_case_data_comment, case_uuid, comment)
+
+    async def create_case_data(self, case_uuid: str, data: UploadData, mime_type: str = "text/plain", significance: str = "Comment"):
+        return await self.call(self.cydarm.create_case_data, case_uuid, data, mime_type=mime_type, significance=significance)
+
+    async def get_case_data_list(self, case_uuid: str):
+        return await self.call(self.cydarm.get_case_data_list, case_uuid)
+
+    async def get_case_data_paginated(self, case_uuid: str, page_size: int = DEFAULT_CASE_DATA_PAGE_SIZE, page_num: int = 0):
+        return await self.call(self.cydarm.get_case_data_paginated, case_uuid, page_size=page_size, page_num=page_num)
+
+    async def get_case_quick_search(self, search_string: str):
+        return await self.call(self.cydarm.get_case_quick_search, search_string)
+
+    async def get_case_quick_search_hydrated(self, search_string: str, max_results: Optional[int] = None) -> tuple[list[dict], list]:
+        """
+        Quick search, then fetch the full case of each of the top max_results hits concurrently.
+
+        :return: the hits in rank order, and for each hit either its case (with the hit's rank added) or the exception
+            raised getting it.
+        :raises ValueError: if the quick search doesn't return a list of hits.
+        """
+        hits = await self.get_case_quick_search(search_string)
+        if not isinstance(hits, list):
+            raise ValueError(f"Expected a list of hits from the Cydarm quick search, got {type(hits).__name__}")
+        hits = hits[:max_results]
+        cases = await self.gather(*[self.get_case(hit["uuid"]) for hit in hits])
+        # gather() keeps the order of the hits, so the cases stay in rank order
+        return hits, [case if isinstance(case, Exception) else {**case, "rank": hit.get("rank")} for hit, case in zip(hits, cases)]
+
+    async def get_cases_filtered(
+        self, page_size=1000, filter_text: str = "", tags_included: str = "", max_workers: int = 1, case_filter: Optional[CaseFilter] = None
+    ):
+        return await self.call(
+            self.cydarm.get_cases_filtered,
+            page_size=page_size,
+            filter_text=filter_text,
+            tags_included=tags_included,
+            max_workers=max_workers,
+            case_filter=case_filter,
+        )
+
+    async def get_cases_filtered_paginated(
+        self, page_size=1000, page_num=0, filter_text: Optional[str] = None, tags_included: Optional[str] = None
+    ):
+        return await self.call(
+            self.cydarm.get_cases_filtered_paginated,
+            page_size=page_size,
+            page_num=page_num,
+            filter_text=filter_text,
+            tags_included=tags_included,
+        )
+
+    async def get_user(self, user_uuid):
+        return await self.call(self.cydarm.get_user, user_uuid)
+
+    async def get_acl(self, acl_uuid):
+        return await self.call(self.cydarm.get_acl, acl_uuid)
+
+    async def add_case_tag(self, case_uuid: str, tag_value: str):
+        return await self.call(self.cydarm.add_case_tag, case_uuid, tag_value)
+
+    async def delete_case_tag(self, case_uuid: str, tag_value: str):
+        return await self.call(self.cydarm.delete_case_tag, case_uuid, tag_value)
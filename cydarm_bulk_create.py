@@ -0,0 +1,94 @@
+# File: cydarm_bulk_create.py
+#
+# Copyright (c) Splunk, 2023-2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import json
+import os
+from collections.abc import Iterator
+from typing import Union
+
+from gen_app_json.create_case import INPUT_PARAMS_CREATE_CASE
+
+
+# case fields given as JSON, either encoded in a string (as for the create case action) or as a JSON value
+JSON_CASE_FIELDS = ("metadata", "tags", "members")
+CASE_PARAMS = {param.name: param for param in INPUT_PARAMS_CREATE_CASE}
+
+# a row number, and either the case definition or the exception raised parsing it
+CaseRow = tuple[int, Union[dict, Exception]]
+
+
+def iter_case_rows(source: Union[str, os.PathLike]) -> Iterator[CaseRow]:
+    """
+    Reads case definitions from a JSON Lines file, one line at a time, or from a string holding a JSON array.
+    Rows are numbered from 1; for a file, blank lines are skipped but still counted, so row numbers are line numbers.
+    """
+    if isinstance(source, os.PathLike):
+        with open(source, encoding="utf-8") as f:
+            for row_num, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield row_num, json.loads(line)
+                except ValueError as e:
+                    yield row_num, ValueError(f"Invalid JSON: {e}")
+        return
+
+    rows = json.loads(source)
+    if not isinstance(rows, list):
+        raise ValueError("Expected a JSON array of case definitions")
+    yield from enumerate(rows, start=1)
+
+
+def validate_case_row(row) -> dict:
+    """
+    Checks a case definition against the create case action's parameters.
+
+    :return: keyword arguments for CydarmAPI.create_case().
+    :raises ValueError: listing every problem with the row.
+    """
+    if not isinstance(row, dict):
+        raise ValueError(f"Expected a JSON object, got {type(row).__name__}")
+
+    problems = [f"unknown field '{name}'" for name in row if name not in CASE_PARAMS]
+    problems += [
+        f"missing required field '{param.name}'" for param in INPUT_PARAMS_CREATE_CASE if param.required and row.get(param.name) is None
+    ]
+    kwargs = {}
+    for name, value in row.items():
+        param = CASE_PARAMS.get(name)
+        if param is None or value is None:
+            continue
+        if name in JSON_CASE_FIELDS:
+            if isinstance(value, str):
+                try:
+                    value = json.loads(value)
+                except ValueError as e:
+                    problems.append(f"'{name}' is not valid JSON: {e}")
+                    continue
+        elif param.data_type == "boolean" and not isinstance(value, bool):
+            problems.append(f"'{name}' must be a boolean")
+        elif param.data_type == "numeric" and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            problems.append(f"'{name}' must be a number")
+        elif param.data_type == "string" and not isinstance(value, str):
+            problems.append(f"'{name}' must be a string")
+        kwargs[name] = value
+
+    severity = kwargs.get("severity")
+    if isinstance(severity, (int, float)) and not isinstance(severity, bool) and not 1 <= severity <= 5:
+        problems.append(f"'severity' must be 1 to 5, got {severity}")
+    if problems:
+        raise ValueError("; ".join(problems))
+    return kwargs
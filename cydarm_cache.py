@@ -0,0 +1,94 @@
+# File: cydarm_cache.py
+#
+# Copyright (c) Splunk, 2023-2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_CACHE_TTL_SECONDS = 300
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache. Entries expire ttl seconds after they were stored; the least recently used entry is
+    evicted once max_size is reached. A ttl of None means entries never expire.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE, ttl: Optional[float] = DEFAULT_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl = ttl
+        # key -> (expires_at, value). Expiry uses wall-clock time so entries can be persisted between action runs.
+        self._entries: OrderedDict[str, tuple[Optional[float], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: str):
+        return self.get(key) is not None
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def to_dict(self) -> dict:
+        """
+        Unexpired entries, least recently used first, in a JSON-serialisable form that load() accepts.
+        """
+        now = time.time()
+        with self._lock:
+            return {key: [expires_at, value] for key, (expires_at, value) in self._entries.items() if expires_at is None or expires_at > now}
+
+    def load(self, entries: dict):
+        now = time.time()
+        with self._lock:
+            for key, (expires_at, value) in entries.items():
+                if self.ttl is not None:
+                    # the ttl may have been lowered since the entries were saved
+                    expires_at = min(expires_at or math.inf, now + self.ttl)
+                if expires_at is None or expires_at > now:
+                    self._entries[key] = (expires_at, value)
+                    self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
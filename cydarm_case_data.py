@@ -0,0 +1,71 @@
+# File: cydarm_case_data.py
+#
+# Copyright (c) Splunk, 2023-2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+from base64 import b64decode
+from collections.abc import Collection
+from typing import Optional
+
+
+# mime types whose data is decoded to text by prepare_case_data()
+TEXT_MIME_TYPES = frozenset({"application/json", "application/xml", "application/x-yaml"})
+
+
+def get_data_size(item: dict) -> int:
+    """
+    Size in bytes of the base64 'data' of a case data item, worked out without decoding it.
+    """
+    data = item.get("data") or ""
+    return len(data) * 3 // 4 - data[-2:].count("=")
+
+
+def is_text_mime_type(mime_type: Optional[str]) -> bool:
+    mime_type = (mime_type or "").split(";")[0].strip().lower()
+    return mime_type.startswith("text/") or mime_type in TEXT_MIME_TYPES
+
+
+def matches_case_data(item: dict, significances: Optional[Collection[str]] = None, mime_types: Optional[Collection[str]] = None) -> bool:
+    """
+    :param significances: significances to keep, compared case-insensitively. None keeps all.
+    :param mime_types: mime types to keep, e.g. 'text/plain', or 'image/*' for all images. None keeps all.
+    """
+    if significances and (item.get("significance") or "").lower() not in {x.lower() for x in significances}:
+        return False
+    if mime_types:
+        mime_type = (item.get("mimeType") or "").split(";")[0].strip().lower()
+        for pattern in mime_types:
+            pattern = pattern.lower()
+            if mime_type == pattern or (pattern.endswith("/*") and mime_type.startswith(pattern[:-1])):
+                return True
+        return False
+    return True
+
+
+def prepare_case_data(item: dict, decode: bool = False, max_size: Optional[int] = None) -> dict:
+    """
+    Adds 'data_size' to a copy of a case data item. The data is cut down to max_size bytes (setting 'data_truncated'),
+    and, if decode is set, text data is decoded into 'decoded_data'.
+    """
+    item = dict(item)
+    size = get_data_size(item)
+    item["data_size"] = size
+    item["data_truncated"] = max_size is not None and size > max_size
+    if item["data_truncated"]:
+        # whole base64 quanta only, so the remaining data still decodes
+        item["data"] = item["data"][: max_size // 3 * 4]
+    if decode and item.get("data") and is_text_mime_type(item.get("mimeType")):
+        # a truncated multi-byte character is replaced rather than failing the decode
+        item["decoded_data"] = b64decode(item["data"]).decode("utf-8", errors="replace")
+    return item
@@ -0,0 +1,100 @@
+# File: cydarm_case_filter.py
+#
+# Copyright (c) Splunk, 2023-2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import dataclasses
+from collections.abc import Iterable
+from typing import Optional
+
+from cydarm_ingest import parse_timestamp
+
+
+# CaseFilter field -> case field matched against its values. No getCasesFiltered query parameters for these filters are
+# documented, so like the tag filters they are applied to each case as it is read.
+LIST_FILTERS = {
+    "statuses": "status",
+    "severities": "severity",
+    "assignees": "assignee",
+    "orgs": "org",
+}
+# CaseFilter field -> (case field, whether the filter is the earliest time allowed rather than the latest)
+TIME_FILTERS = {
+    "created_from": ("created", True),
+    "created_to": ("created", False),
+    "modified_from": ("modified", True),
+    "modified_to": ("modified", False),
+}
+
+
+@dataclasses.dataclass
+class CaseFilter:
+    """
+    Case filters other than the text filter and the tags, and the sort order. Lists match any of their values; times
+    are ISO-8601 strings and bound the range inclusively. A case without a filtered field doesn't match.
+    """
+
+    statuses: list[str] = dataclasses.field(default_factory=list)
+    statuses_excluded: list[str] = dataclasses.field(default_factory=list)
+    severities: list[int] = dataclasses.field(default_factory=list)
+    assignees: list[str] = dataclasses.field(default_factory=list)
+    orgs: list[str] = dataclasses.field(default_factory=list)
+    created_from: Optional[str] = None
+    created_to: Optional[str] = None
+    modified_from: Optional[str] = None
+    modified_to: Optional[str] = None
+    # field names, each prefixed with '-' to sort in descending order, e.g. ['-severity', 'created']
+    sort: list[str] = dataclasses.field(default_factory=list)
+
+    def __post_init__(self):
+        for name in TIME_FILTERS:
+            value = getattr(self, name)
+            if value and parse_timestamp(value) is None:
+                raise ValueError(f"{name} is not an ISO-8601 time: {value}")
+
+    @property
+    def filters_cases(self) -> bool:
+        return any(getattr(self, name) for name in (*LIST_FILTERS, "statuses_excluded", *TIME_FILTERS))
+
+    def matches(self, case: dict) -> bool:
+        for name, field in LIST_FILTERS.items():
+            values = getattr(self, name)
+            if values and str(case.get(field)) not in map(str, values):
+                return False
+        if self.statuses_excluded and case.get("status") in self.statuses_excluded:
+            return False
+        for name, (field, earliest) in TIME_FILTERS.items():
+            bound = parse_timestamp(getattr(self, name))
+            if bound is None:
+                continue
+            value = parse_timestamp(case.get(field))
+            if value is None or (value < bound if earliest else value > bound):
+                return False
+        return True
+
+    def without_sort(self) -> "CaseFilter":
+        return dataclasses.replace(self, sort=[])
+
+
+def sort_cases(cases: Iterable[dict], sort: list[str]) -> list[dict]:
+    """
+    Sorts cases by the given fields, each prefixed with '-' for descending order. Cases without a field sort before
+    those with it.
+    """
+    cases = list(cases)
+    # sorting is stable, so sorting by each field from the last to the first orders by all of them
+    for field in reversed(sort):
+        name = field.removeprefix("-")
+        cases.sort(key=lambda case: (case.get(name) is not None, case.get(name)), reverse=field.startswith("-"))
+    return cases
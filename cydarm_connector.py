@@ -14,17 +14,44 @@
 # and limitations under the License.
 #
 
+import asyncio
+import dataclasses
+import hashlib
 import json
-from collections.abc import Iterable
+import pathlib
+from collections.abc import Awaitable, Iterable, Iterator
+from datetime import datetime, timezone
 from typing import Callable, Optional
 
 # Phantom App imports
+import encryption_helper
 import phantom.app as phantom
+import phantom.rules as phantom_rules
 import requests
 from phantom.action_result import ActionResult
 from phantom.base_connector import BaseConnector
 
-from cydarm_api import CydarmAPI
+from cydarm_api import DEFAULT_CONNECT_TIMEOUT, DEFAULT_POOL_MAXSIZE, DEFAULT_READ_TIMEOUT, CydarmAPI
+from cydarm_async_api import DEFAULT_MAX_CONCURRENCY, AsyncCydarmAPI
+from cydarm_bulk_create import JSON_CASE_FIELDS, iter_case_rows, validate_case_row
+from cydarm_cache import DEFAULT_CACHE_SIZE, DEFAULT_CACHE_TTL_SECONDS, TTLCache
+from cydarm_case_filter import CaseFilter
+from cydarm_deadline import Deadline, DeadlineExceededError
+from cydarm_ingest import Watermark, case_to_container
+from cydarm_logging import CydarmLogger
+from cydarm_mirror import CaseMirror
+from cydarm_projection import Projector, compile_projection
+from cydarm_rate_limit import ENDPOINT_CLASSES, RateLimiter
+from cydarm_retry import CircuitBreaker, RetryPolicy
+from cydarm_upload import UploadData
+
+
+# number of case responses kept for conditional GETs
+DEFAULT_VALIDATOR_CACHE_SIZE = 32
+# number of containers saved per save_containers() call during on_poll
+DEFAULT_POLL_BATCH_SIZE = 100
+# seconds since the last sync after which query_local_cases refuses to answer
+DEFAULT_MIRROR_MAX_AGE = 3600
 
 
 class RetVal(tuple):
@@ -32,12 +59,47 @@ class RetVal(tuple):
         return tuple.__new__(RetVal, (val1, val2))
 
 
+@dataclasses.dataclass
+class BulkResult:
+    """
+    Outcome of a bulk action: one data item per successful operation and an error message per failed one.
+    """
+
+    data: list = dataclasses.field(default_factory=list)
+    errors: dict = dataclasses.field(default_factory=dict)
+    # True if the action deadline was reached before every operation was attempted
+    partial: bool = False
+    # added to the action result summary
+    summary: dict = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def from_results(cls, keys: Iterable[str], results: Iterable) -> "BulkResult":
+        """
+        :param keys: identifies each operation in the errors dict, e.g. a case UUID.
+        :param results: results of AsyncCydarmAPI.gather() - an exception for each failed operation.
+        """
+        bulk_result = cls()
+        for key, result in zip(keys, results):
+            if isinstance(result, Exception):
+                bulk_result.errors[key] = str(result)
+                bulk_result.partial |= isinstance(result, DeadlineExceededError)
+            else:
+                bulk_result.data.append(result)
+        return bulk_result
+
+
 class CydarmConnector(BaseConnector):
     def __init__(self):
         super().__init__()
 
         self._state = None
         self.cydarm: Optional[CydarmAPI] = None
+        self.logger = CydarmLogger(self.save_progress)
+        self.max_concurrency = DEFAULT_MAX_CONCURRENCY
+        self.persist_reference_cache = False
+        self.persist_validator_cache = False
+        self.poll_batch_size = DEFAULT_POLL_BATCH_SIZE
+        self.metrics_file: Optional[str] = None
 
     def _handle_test_connectivity(self, param):
         # Add an action result object to self (BaseConnector) to represent the action for this param
@@ -50,32 +112,263 @@ class CydarmConnector(BaseConnector):
 
         self.save_progress("Verifying connection & auth to Cydarm")
         try:
-            self.cydarm.generate_bearer_token()
+            self.cydarm.set_bearer_token(self.cydarm.generate_bearer_token())
             self.save_progress("Test Connectivity Passed")
             return action_result.set_status(phantom.APP_SUCCESS)
         except Exception as e:
             return action_result.set_status(phantom.APP_ERROR, f"Connection failed: {e}")
 
+    def _handle_on_poll(self, param):
+        action_result = self.add_action_result(ActionResult(dict(param)))
+
+        watermark = Watermark.from_dict(self._state.get("poll_watermark"))
+        new_watermark = Watermark.from_dict(watermark.to_dict())
+        max_containers = int(param.get("container_count") or 0) if self.is_poll_now() else 0
+        label = self.get_config().get("ingest", {}).get("container_label")
+        self.save_progress(f"Ingesting cases modified since: {watermark.modified or 'the beginning'}")
+
+        sweep_started_at = datetime.now(timezone.utc)
+        num_ingested = 0
+        num_failed = 0
+        batch = []
+
+        def save_batch():
+            nonlocal num_ingested, num_failed
+            ret_val, message, _ = self.save_containers([case_to_container(case, label) for case in batch])
+            if phantom.is_fail(ret_val):
+                self.save_progress(f"Failed to save {len(batch)} containers: {message}")
+                num_failed += len(batch)
+            else:
+                num_ingested += len(batch)
+                for case in batch:
+                    new_watermark.advance(case)
+            batch.clear()
+
+        partial = False
+        try:
+            for case in self.cydarm.iter_cases_filtered(max_workers=self.max_concurrency):
+                if not watermark.is_new(case):
+                    continue
+                batch.append(case)
+                if len(batch) >= self.poll_batch_size:
+                    save_batch()
+                if max_containers and num_ingested + num_failed + len(batch) >= max_containers:
+                    break
+        except DeadlineExceededError:
+            partial = True
+        if batch:
+            save_batch()
+
+        self.add_metrics_summary(action_result)
+        # the watermark can only move forward once every changed case has been saved, as they arrive in no particular order.
+        # Cases changed since the sweep started are ingested again next time; their artifacts are deduplicated by
+        # source_data_identifier.
+        if not (self.is_poll_now() or num_failed or partial):
+            new_watermark.cap(sweep_started_at)
+            self._state["poll_watermark"] = new_watermark.to_dict()
+
+        summary = {
+            "total_objects": num_ingested + num_failed,
+            "total_objects_successful": num_ingested,
+        }
+        if partial:
+            summary["partial_results"] = True
+        action_result.update_summary(summary)
+        if num_failed:
+            return action_result.set_status(phantom.APP_ERROR, f"Failed to ingest {num_failed} cases")
+        if partial:
+            return action_result.set_status(phantom.APP_SUCCESS, f"Action deadline reached after ingesting {num_ingested} cases")
+        return action_result.set_status(phantom.APP_SUCCESS, f"Ingested {num_ingested} cases")
+
+    def _handle_sync_local_cases(self, param):
+        full = bool(param.get("full_sync", False))
+        self.save_progress(f"{'Fully syncing' if full else 'Syncing changed cases to'} the local case mirror")
+        partial = False
+        stats = {}
+        with CaseMirror(self.get_mirror_path()) as mirror:
+            try:
+                cases = self.cydarm.iter_cases_filtered(max_workers=self.max_concurrency)
+                stats["cases_written"] = mirror.sync(cases, full=full)
+            except DeadlineExceededError:
+                # cases written so far are kept, and the next sync picks up where this one stopped
+                partial = True
+            stats["cases_in_mirror"] = mirror.count()
+            last_synced_at = mirror.last_synced_at
+        if last_synced_at is not None:
+            stats["last_synced_at"] = datetime.fromtimestamp(last_synced_at, timezone.utc).isoformat()
+        return BulkResult(data=[stats], partial=partial, summary=stats)
+
+    def _handle_query_local_cases(self, param):
+        max_age = float(param.get("max_age", DEFAULT_MIRROR_MAX_AGE) or 0)
+        list_params = {
+            name: self.parse_list_param(param[name]) if param.get(name) else None for name in ("status", "severity", "tags", "assignee", "org")
+        }
+        # answered from the local mirror only; Cydarm is never called
+        with CaseMirror(self.get_mirror_path()) as mirror:
+            age = mirror.get_age()
+            if age is None:
+                raise ValueError("The local case mirror has not been synced. Run the 'sync local cases' action first")
+            if max_age and age > max_age:
+                raise ValueError(f"The local case mirror was last synced {age:.0f} seconds ago, more than max_age ({max_age:.0f} seconds)")
+            cases = list(
+                mirror.query(
+                    statuses=list_params["status"],
+                    severities=[int(x) for x in list_params["severity"]] if list_params["severity"] else None,
+                    tags=list_params["tags"],
+                    assignees=list_params["assignee"],
+                    orgs=list_params["org"],
+                    max_results=int(param.get("max_results") or 0) or None,
+                )
+            )
+        return BulkResult(data=cases, summary={"mirror_age_seconds": round(age, 1)})
+
+    def get_mirror_path(self) -> str:
+        return str(pathlib.Path(self.get_state_dir(), f"{self.get_asset_id()}_cases.db"))
+
     def _handle_get_case_playbook(self, param):
         func = self.cydarm.get_case_playbook
         kwargs = self.extract_args_dict(param, ["case_uuid", "case_playbook_uuid"])
         return self.call_cydarm_api(func, kwargs)
 
+    def _handle_get_case_playbook_tree(self, param):
+        tree, errors = self.run_async(lambda api: api.get_case_playbook_tree(param["case_uuid"]))
+        # the tree is the one data item; lookups that failed are reported as the bulk errors
+        bulk_result = BulkResult.from_results(errors.keys(), errors.values())
+        bulk_result.data.append(tree)
+        bulk_result.summary = {
+            "total_playbooks": len(tree["playbooks"]),
+            "total_actions": tree["totalActionsInAllPlaybooks"],
+            "total_completed_actions": tree["totalCompletedActionsInAllPlaybooks"],
+        }
+        return bulk_result
+
     def _handle_get_case(self, param):
         func = self.cydarm.get_case
         kwargs = self.extract_args_dict(param, ["case_uuid"])
         return self.call_cydarm_api(func, kwargs)
 
+    def _handle_get_cases(self, param):
+        case_uuids = self.parse_list_param(param["case_uuids"])
+        self.save_progress(f"Getting {len(case_uuids)} cases with up to {self.max_concurrency} concurrent requests")
+        results = self.run_async(lambda api: api.gather(*[api.get_case(case_uuid) for case_uuid in case_uuids]))
+        return BulkResult.from_results(case_uuids, results)
+
+    def _handle_bulk_add_case_tags(self, param):
+        return self.bulk_update_case_tags(param, AsyncCydarmAPI.add_case_tag)
+
+    def _handle_bulk_delete_case_tags(self, param):
+        return self.bulk_update_case_tags(param, AsyncCydarmAPI.delete_case_tag)
+
+    def bulk_update_case_tags(self, param, api_func: Callable[[AsyncCydarmAPI, str, str], Awaitable]) -> BulkResult:
+        case_uuids = self.parse_list_param(param["case_uuids"])
+        tag_values = self.parse_list_param(param["tag_values"])
+        rate_limit = param.get("requests_per_second") or None
+        pairs = [(case_uuid, tag_value) for case_uuid in case_uuids for tag_value in tag_values]
+        self.save_progress(f"Updating {len(tag_values)} tags on {len(case_uuids)} cases ({len(pairs)} requests)")
+
+        async def update_tags(api: AsyncCydarmAPI):
+            async def update_tag(case_uuid, tag_value):
+                await api_func(api, case_uuid, tag_value)
+                return {"case_uuid": case_uuid, "tag_value": tag_value}
+
+            return await api.gather(*[update_tag(case_uuid, tag_value) for case_uuid, tag_value in pairs])
+
+        results = self.run_async(update_tags, rate_limit=rate_limit)
+        return BulkResult.from_results([f"{case_uuid}:{tag_value}" for case_uuid, tag_value in pairs], results)
+
+    def _handle_bulk_create_cases(self, param):
+        rows = iter_case_rows(self.get_upload_data(param))
+        rate_limit = param.get("requests_per_second") or None
+        self.save_progress(f"Creating cases with up to {self.max_concurrency} concurrent requests")
+
+        async def create_cases(api: AsyncCydarmAPI) -> dict:
+            results = {}
+
+            # a fixed pool of workers pulls rows from the one iterator, so only the rows being created are held in memory
+            async def worker():
+                for row_num, row in rows:
+                    try:
+                        if isinstance(row, Exception):
+                            raise row
+                        case = await api.create_case(**validate_case_row(row))
+                        results[row_num] = {"row": row_num, "uuid": case["uuid"]}
+                    except DeadlineExceededError as e:
+                        results[row_num] = e
+                        return
+                    except Exception as e:
+                        results[row_num] = e
+
+            await asyncio.gather(*[worker() for _ in range(self.max_concurrency)])
+            return results
+
+        results = self.run_async(create_cases, rate_limit=rate_limit)
+        row_nums = sorted(results)
+        return BulkResult.from_results([f"row {row_num}" for row_num in row_nums], [results[row_num] for row_num in row_nums])
+
     def _handle_get_case_quick_search(self, param):
         func = self.cydarm.get_case_quick_search
         kwargs = self.extract_args_dict(param, ["search_string"])
+        max_results = int(param.get("max_results") or 0) or None
+        if not param.get("hydrate"):
+            hits = self.call_cydarm_api(func, kwargs)
+            if not isinstance(hits, list):
+                raise ValueError(f"Expected a list of hits from the Cydarm quick search, got {type(hits).__name__}")
+            return hits[:max_results]
+
+        hits, results = self.run_async(lambda api: api.get_case_quick_search_hydrated(param["search_string"], max_results=max_results))
+        return BulkResult.from_results([hit["uuid"] for hit in hits], results)
+
+    def _handle_list_case_data(self, param):
+        # returns a generator, so items go into the action result page by page, each decoded only as it is added
+        func = self.cydarm.iter_case_data
+        kwargs = self.extract_args_dict(param, ["case_uuid"])
+        kwargs["significances"] = self.parse_list_param(param["significance"]) if param.get("significance") else None
+        kwargs["mime_types"] = self.parse_list_param(param["mime_type"]) if param.get("mime_type") else None
+        kwargs["decode"] = bool(param.get("decode_data", False))
+        for arg, kwarg in (("page_size", "page_size"), ("max_item_size", "max_size"), ("max_results", "max_results")):
+            if param.get(arg):
+                kwargs[kwarg] = int(param[arg])
         return self.call_cydarm_api(func, kwargs)
 
     def _handle_get_cases_filtered(self, param):
-        func = self.cydarm.get_cases_filtered
-        kwargs = self.extract_args_dict(param, ["filter_text", "tags_included"])
+        # returns a generator, so cases go straight into the action result without being collected in a list first
+        func = self.cydarm.iter_cases_filtered
+        kwargs = self.extract_args_dict(param, ["filter_text", "max_workers", "max_results", "page_size"])
+        for arg in ("max_workers", "max_results", "page_size"):
+            if arg in kwargs:
+                kwargs[arg] = int(kwargs[arg])
+        kwargs["case_filter"] = self.parse_case_filter(param)
+        tags_included = self.parse_list_param(param.get("tags_included") or [])
+        tags_required = self.parse_list_param(param.get("tags_required") or [])
+        tags_excluded = self.parse_list_param(param.get("tags_excluded") or [])
+        if tags_required or tags_excluded or len(tags_included) > 1:
+            # Cydarm only filters by one included tag, so other tag filters are combined client-side
+            func = self.cydarm.iter_cases_by_tags
+            kwargs["tags_included"] = tags_included
+            kwargs["tags_required"] = tags_required
+            kwargs["tags_excluded"] = tags_excluded
+        elif tags_included:
+            kwargs["tags_included"] = tags_included[0]
         return self.call_cydarm_api(func, kwargs)
 
+    @classmethod
+    def parse_case_filter(cls, param) -> CaseFilter:
+        def get_list(name: str) -> list[str]:
+            return cls.parse_list_param(param[name]) if param.get(name) else []
+
+        return CaseFilter(
+            statuses=get_list("status"),
+            statuses_excluded=get_list("status_excluded"),
+            severities=[int(x) for x in get_list("severity")],
+            assignees=get_list("assignee"),
+            orgs=get_list("org"),
+            created_from=param.get("created_from"),
+            created_to=param.get("created_to"),
+            modified_from=param.get("modified_from"),
+            modified_to=param.get("modified_to"),
+            sort=get_list("sort"),
+        )
+
     def _handle_create_action_instance_data(self, param):
         func = self.cydarm.create_action_instance_data
         kwargs = self.extract_args_dict(param, ["action_instance_uuid"])
@@ -88,6 +381,30 @@ class CydarmConnector(BaseConnector):
         kwargs["comment"] = param["data"]
         return self.call_cydarm_api(func, kwargs)
 
+    def _handle_create_case_data(self, param):
+        func = self.cydarm.create_case_data
+        kwargs = self.extract_args_dict(param, ["case_uuid", "mime_type", "significance"])
+        kwargs["data"] = self.get_upload_data(param)
+        return self.call_cydarm_api(func, kwargs)
+
+    @staticmethod
+    def get_upload_data(param) -> UploadData:
+        """
+        :return: the 'data' param, or the path of the vault file given by the 'vault_id' param.
+        """
+        vault_id = param.get("vault_id")
+        if vault_id and param.get("data"):
+            raise ValueError("Specify either data or vault_id, not both")
+        if not vault_id:
+            if "data" not in param:
+                raise ValueError("One of data or vault_id is required")
+            return param["data"]
+        success, message, vault_info = phantom_rules.vault_info(vault_id=vault_id)
+        if not success or not vault_info:
+            raise ValueError(f"Unable to find vault file {vault_id}: {message}")
+        # the file is streamed from disk rather than read into memory
+        return pathlib.Path(vault_info[0]["path"])
+
     @staticmethod
     def parse_case_args(param) -> dict:
         arg_names = [
@@ -123,11 +440,26 @@ class CydarmConnector(BaseConnector):
             if not 1 <= sev <= 5:
                 raise ValueError(f"Given severity ({sev}) is not valid - expected 1 to 5.")
 
-        for field in ("metadata", "tags", "members"):
+        for field in JSON_CASE_FIELDS:
             if field in output:
                 output[field] = json.loads(output[field])
         return output
 
+    @staticmethod
+    def parse_list_param(value) -> list[str]:
+        """
+        Parses a list parameter given as a JSON array or a comma-separated list. Duplicates and blank entries are dropped.
+        """
+        if isinstance(value, str) and value.strip().startswith("["):
+            items = json.loads(value)
+            if not isinstance(items, list):
+                raise ValueError(f"Expected a JSON array, got: {value}")
+        elif isinstance(value, str):
+            items = value.split(",")
+        else:
+            items = value
+        return list(dict.fromkeys(str(item).strip() for item in items if str(item).strip()))
+
     @staticmethod
     def extract_args_dict(param, arg_names: Iterable[str]) -> dict:
         output = {}
@@ -207,9 +539,9 @@ class CydarmConnector(BaseConnector):
         return self.call_cydarm_api(func, kwargs)
 
     def call_cydarm_api(self, cydarm_api_func, kwargs):
-        self.save_progress(f"Calling {cydarm_api_func.__name__} with kwargs: {kwargs}")
+        self.logger.info("Calling %s with kwargs: %s", cydarm_api_func.__name__, kwargs)
         result = cydarm_api_func(**kwargs)
-        self.save_progress(f"Output from {cydarm_api_func.__name__}: {result}")
+        self.logger.debug("Output from %s: %s", cydarm_api_func.__name__, result)
         return result
 
     def _handle_delete_case_tag(self, param):
@@ -217,31 +549,89 @@ class CydarmConnector(BaseConnector):
         kwargs = self.extract_args_dict(param, ["case_uuid", "tag_value"])
         return self.call_cydarm_api(func, kwargs)
 
+    def run_async(self, func: Callable[[AsyncCydarmAPI], Awaitable], rate_limit: Optional[float] = None):
+        """
+        Runs func(AsyncCydarmAPI) on a new event loop and returns its result. The async client shares self.cydarm's session and token.
+        """
+
+        async def runner():
+            async with AsyncCydarmAPI(self.cydarm, max_concurrency=self.max_concurrency, rate_limit=rate_limit) as api:
+                return await func(api)
+
+        return asyncio.run(runner())
+
     def generate_action_result(self, param, request_func: Callable):
         self.save_progress(f"In action handler for: {self.get_action_identifier()}")
 
         action_result = self.add_action_result(ActionResult(dict(param)))
-
-        response = request_func(param)
+        # compiled once, then applied to each data item as it is added
+        projector = compile_projection(self.parse_list_param(param["fields"])) if param.get("fields") else None
+
+        with self.cydarm.metrics.timer("generate_action_result"):
+            response = request_func(param)
+            if isinstance(response, BulkResult):
+                ret_val = self.generate_bulk_action_result(action_result, response, projector=projector)
+            else:
+                ret_val = self.generate_single_action_result(action_result, response, projector=projector)
+        self.add_metrics_summary(action_result)
+        return ret_val
+
+    def generate_single_action_result(self, action_result: ActionResult, response, projector: Optional[Projector] = None):
         num_items = 1
-        if isinstance(response, list):
-            num_items = len(response)
-            for item in response:
-                action_result.add_data(item)
+        partial = False
+        if isinstance(response, (list, Iterator)):
+            num_items = 0
+            try:
+                for item in response:
+                    action_result.add_data(projector(item) if projector else item)
+                    num_items += 1
+            except DeadlineExceededError:
+                # keep what was fetched before the deadline
+                partial = True
         elif isinstance(response, dict):
-            action_result.add_data(response)
+            action_result.add_data(projector(response) if projector else response)
         else:
             self.save_progress("No response data.")
 
-        action_result.update_summary(
-            {
-                "total_objects": num_items,
-                "total_objects_successful": num_items,
-            }
-        )
+        summary = {
+            "total_objects": num_items,
+            "total_objects_successful": num_items,
+        }
+        if partial:
+            summary["partial_results"] = True
+        action_result.update_summary(summary)
 
+        if partial:
+            return action_result.set_status(phantom.APP_SUCCESS, f"Action deadline reached, returning the first {num_items} results")
         return action_result.set_status(phantom.APP_SUCCESS)
 
+    def add_metrics_summary(self, action_result: ActionResult):
+        action_result.update_summary({"metrics": self.cydarm.metrics.summary()})
+
+    def generate_bulk_action_result(self, action_result: ActionResult, bulk_result: BulkResult, projector: Optional[Projector] = None):
+        for item in bulk_result.data:
+            action_result.add_data(projector(item) if projector else item)
+
+        num_successful = len(bulk_result.data)
+        num_failed = len(bulk_result.errors)
+        summary = {
+            "total_objects": num_successful + num_failed,
+            "total_objects_successful": num_successful,
+            "total_objects_failed": num_failed,
+        }
+        if bulk_result.errors:
+            summary["errors"] = bulk_result.errors
+        if bulk_result.partial:
+            summary["partial_results"] = True
+        action_result.update_summary({**bulk_result.summary, **summary})
+
+        message = f"{num_successful} succeeded, {num_failed} failed"
+        if bulk_result.partial:
+            message += " (action deadline reached)"
+        if num_failed and not num_successful:
+            return action_result.set_status(phantom.APP_ERROR, f"All {num_failed} operations failed")
+        return action_result.set_status(phantom.APP_SUCCESS, message)
+
     def handle_action(self, param):
         # Get the action that we are supposed to execute for this App Run
         action_id = self.get_action_identifier()
@@ -250,6 +640,8 @@ class CydarmConnector(BaseConnector):
 
         if action_id == "test_connectivity":
             return self._handle_test_connectivity(param)
+        if action_id == "on_poll":
+            return self._handle_on_poll(param)
 
         func_name = f"_handle_{action_id}"
         func = getattr(self, func_name, None)
@@ -257,10 +649,125 @@ class CydarmConnector(BaseConnector):
             raise RuntimeError(f"No function found called: {func_name}")
         return self.generate_action_result(param, func)
 
+    def load_bearer_token(self, config) -> Optional[str]:
+        token_state = self._state.get("bearer_token")
+        if not isinstance(token_state, dict):
+            return None
+        # a token issued for another Cydarm instance or user must not be reused
+        if token_state.get("base_url") != config.get("cydarm_api_base_url") or token_state.get("username") != config.get("cydarm_username"):
+            return None
+        try:
+            return encryption_helper.decrypt(token_state["token"], self.get_asset_id())
+        except Exception as e:
+            self.debug_print(f"Unable to decrypt cached bearer token, a new one will be generated: {e}")
+            return None
+
+    def save_bearer_token(self):
+        token = self.cydarm.bearer_token if self.cydarm else None
+        if not token:
+            self._state.pop("bearer_token", None)
+            return
+        self._state["bearer_token"] = {
+            "base_url": self.cydarm.base_url,
+            "username": self.cydarm.username,
+            "token": encryption_helper.encrypt(token, self.get_asset_id()),
+        }
+
+    def create_reference_cache(self, config) -> Optional[TTLCache]:
+        ttl = config.get("reference_cache_ttl")
+        if ttl is None:
+            ttl = DEFAULT_CACHE_TTL_SECONDS
+        if not ttl:
+            return None
+        reference_cache = TTLCache(max_size=int(config.get("reference_cache_size") or DEFAULT_CACHE_SIZE), ttl=float(ttl))
+
+        self.persist_reference_cache = bool(config.get("persist_reference_cache"))
+        if self.persist_reference_cache:
+            reference_cache.load(self._state.get("reference_cache", {}))
+        return reference_cache
+
+    def save_reference_cache(self):
+        reference_cache = self.cydarm.reference_cache if self.cydarm else None
+        if self.persist_reference_cache and reference_cache is not None:
+            self._state["reference_cache"] = reference_cache.to_dict()
+        else:
+            self._state.pop("reference_cache", None)
+
+    def create_validator_cache(self, config) -> Optional[TTLCache]:
+        size = config.get("validator_cache_size")
+        if size is None:
+            size = DEFAULT_VALIDATOR_CACHE_SIZE
+        if not size:
+            return None
+        validator_cache = TTLCache(max_size=int(size), ttl=None)
+
+        # polling a case is typically done by repeated action runs, but the state holds whole case bodies unencrypted
+        self.persist_validator_cache = bool(config.get("persist_validator_cache"))
+        if self.persist_validator_cache:
+            validator_cache.load(self._state.get("validator_cache", {}))
+        return validator_cache
+
+    def save_validator_cache(self):
+        validator_cache = self.cydarm.validator_cache if self.cydarm else None
+        if self.persist_validator_cache and validator_cache is not None:
+            self._state["validator_cache"] = validator_cache.to_dict()
+        else:
+            self._state.pop("validator_cache", None)
+
+    @staticmethod
+    def create_retry_policy(config) -> Optional[RetryPolicy]:
+        defaults = RetryPolicy()
+        max_retries = config.get("max_retries", defaults.max_retries)
+        if not max_retries:
+            return None
+        return RetryPolicy(
+            max_retries=int(max_retries),
+            backoff_base=float(config.get("retry_backoff_base", defaults.backoff_base)),
+            backoff_max=float(config.get("retry_backoff_max", defaults.backoff_max)),
+        )
+
+    def save_metrics(self):
+        if not (self.cydarm and self.metrics_file):
+            return
+        try:
+            self.cydarm.metrics.write_prometheus(self.metrics_file)
+        except OSError as e:
+            self.debug_print(f"Unable to write metrics to {self.metrics_file}: {e}")
+
+    def create_rate_limiter(self, config) -> Optional[RateLimiter]:
+        rates = {endpoint_class: config.get(f"rate_limit_{endpoint_class}") for endpoint_class in ENDPOINT_CLASSES}
+        # buckets are shared by every process on this node that calls the same Cydarm instance
+        state_dir = self.get_state_dir() if config.get("share_rate_limit", True) else None
+        state_key = hashlib.sha256(config.get("cydarm_api_base_url", "").encode()).hexdigest()[:16]
+        burst = config.get("rate_limit_burst")
+        return RateLimiter.from_rates(rates, burst=float(burst) if burst else None, state_dir=state_dir, state_key=state_key)
+
+    def create_circuit_breaker(self, config) -> Optional[CircuitBreaker]:
+        defaults = CircuitBreaker()
+        failure_threshold = config.get("circuit_breaker_threshold", defaults.failure_threshold)
+        if not failure_threshold:
+            return None
+        circuit_breaker = CircuitBreaker(
+            failure_threshold=int(failure_threshold),
+            reset_timeout=float(config.get("circuit_breaker_reset_seconds", defaults.reset_timeout)),
+        )
+        # kept between action runs, so runs started while Cydarm is down fail fast too
+        circuit_breaker.load(self._state.get("circuit_breaker", {}))
+        return circuit_breaker
+
+    def save_circuit_breaker(self):
+        circuit_breaker = self.cydarm.circuit_breaker if self.cydarm else None
+        if circuit_breaker is not None:
+            self._state["circuit_breaker"] = circuit_breaker.to_dict()
+        else:
+            self._state.pop("circuit_breaker", None)
+
     def initialize(self):
         # Load the state in initialize, use it to store data
         # that needs to be accessed across actions
         self._state = self.load_state()
+        if not isinstance(self._state, dict):
+            self._state = {}
 
         # get the asset config
         config = self.get_config()
@@ -280,18 +787,39 @@ class CydarmConnector(BaseConnector):
         if basic_auth_user and basic_auth_pass:
             basic_auth_creds = (basic_auth_user, basic_auth_pass)
 
+        self.logger = CydarmLogger.from_verbosity(self.save_progress, config.get("log_verbosity"))
         self.cydarm = CydarmAPI(
             base_url=config.get("cydarm_api_base_url"),
             username=config.get("cydarm_username"),
             password=config.get("cydarm_password"),
             basic_auth_creds=basic_auth_creds,
-            log_function=self.save_progress,
+            logger=self.logger,
+            bearer_token=self.load_bearer_token(config),
+            pool_maxsize=int(config.get("http_pool_size") or DEFAULT_POOL_MAXSIZE),
+            reference_cache=self.create_reference_cache(config),
+            validator_cache=self.create_validator_cache(config),
+            retry_policy=self.create_retry_policy(config),
+            circuit_breaker=self.create_circuit_breaker(config),
+            rate_limiter=self.create_rate_limiter(config),
+            connect_timeout=float(config.get("connect_timeout") or DEFAULT_CONNECT_TIMEOUT),
+            read_timeout=float(config.get("read_timeout") or DEFAULT_READ_TIMEOUT),
+            deadline=Deadline(float(config.get("action_timeout") or 0)),
         )
+        self.max_concurrency = int(config.get("max_concurrency") or DEFAULT_MAX_CONCURRENCY)
+        self.poll_batch_size = int(config.get("poll_batch_size") or DEFAULT_POLL_BATCH_SIZE)
+        self.metrics_file = config.get("metrics_file") or None
 
         return phantom.APP_SUCCESS
 
     def finalize(self):
         # Save the state, this data is saved across actions and app upgrades
+        self.save_bearer_token()
+        self.save_reference_cache()
+        self.save_validator_cache()
+        self.save_circuit_breaker()
+        self.save_metrics()
+        if self.cydarm:
+            self.cydarm.close()
         self.save_state(self._state)
         return phantom.APP_SUCCESS
 
@@ -0,0 +1,47 @@
+# File: cydarm_deadline.py
+#
+# Copyright (c) Splunk, 2023-2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import time
+from typing import Optional
+
+
+class DeadlineExceededError(Exception):
+    pass
+
+
+class Deadline:
+    """
+    A point in time after which no more Cydarm API calls should be started. A timeout of None (or 0) never expires.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout or None
+        self.expires_at = time.monotonic() + self.timeout if self.timeout else None
+
+    def remaining(self) -> Optional[float]:
+        """
+        :return: seconds left (never negative), or None if the deadline never expires.
+        """
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return self.remaining() == 0
+
+    def check(self):
+        if self.expired():
+            raise DeadlineExceededError(f"Action deadline of {self.timeout}s reached")
@@ -0,0 +1,126 @@
+# File: cydarm_ingest.py
+#
+# Copyright (c) Splunk, 2023-2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+
+# Cydarm severity (1 is most severe) -> SOAR container severity
+SEVERITY_MAP = {1: "high", 2: "high", 3: "medium", 4: "low", 5: "low"}
+CASE_CEF_FIELDS = ("locator", "description", "status", "severity", "severityName", "assignee", "org", "tags", "created", "modified", "closed")
+# how far before the start of a sweep the saved watermark is kept, allowing for Cydarm's clock being behind ours
+SWEEP_SKEW = timedelta(minutes=2)
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parses an ISO-8601 timestamp as returned by Cydarm. Timestamps without a timezone are taken to be UTC.
+    """
+    if not value:
+        return None
+    value = value.strip().replace("Z", "+00:00")
+    # datetime.fromisoformat() only accepts 3 or 6 fractional digits before Python 3.11
+    value = re.sub(r"\.(\d+)", lambda m: "." + m.group(1)[:6].ljust(6, "0"), value, count=1)
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class Watermark:
+    """
+    Tracks the latest 'modified' time ingested, and the cases ingested at exactly that time, so that each
+    (case, modified) pair is ingested once.
+    """
+
+    def __init__(self, modified: Optional[str] = None, uuids: Optional[list[str]] = None):
+        self.modified = modified
+        self.uuids = set(uuids or [])
+        self._modified_at = parse_timestamp(modified)
+
+    @classmethod
+    def from_dict(cls, state: Optional[dict]) -> "Watermark":
+        state = state or {}
+        return cls(modified=state.get("modified"), uuids=state.get("uuids"))
+
+    def to_dict(self) -> dict:
+        return {"modified": self.modified, "uuids": sorted(self.uuids)}
+
+    def is_new(self, case: dict) -> bool:
+        if self._modified_at is None:
+            return True
+        modified_at = parse_timestamp(case.get("modified"))
+        if modified_at is None:
+            return False
+        return modified_at > self._modified_at or (modified_at == self._modified_at and case.get("uuid") not in self.uuids)
+
+    def advance(self, case: dict):
+        modified_at = parse_timestamp(case.get("modified"))
+        if modified_at is None:
+            return
+        if self._modified_at is None or modified_at > self._modified_at:
+            self.modified = case["modified"]
+            self._modified_at = modified_at
+            self.uuids = {case["uuid"]}
+        elif modified_at == self._modified_at:
+            self.uuids.add(case["uuid"])
+
+    def cap(self, sweep_started_at: datetime):
+        """
+        Moves the watermark back to SWEEP_SKEW before the sweep that advanced it started. Cases arrive in no
+        particular order, so a case changed while the sweep ran may have been read before the change, while a later
+        change to another case was read. The next sweep reads everything modified after the cap again.
+        """
+        limit = sweep_started_at - SWEEP_SKEW
+        if self._modified_at is not None and self._modified_at > limit:
+            self.modified = limit.isoformat()
+            self._modified_at = limit
+            self.uuids = set()
+
+
+def case_to_container(case: dict, label: Optional[str] = None) -> dict:
+    """
+    Builds a SOAR container for a Cydarm case. The container is keyed by case UUID; each modification of the case
+    is added to it as a new artifact keyed by UUID and 'modified' time.
+    """
+    uuid = case["uuid"]
+    name = " - ".join(x for x in (case.get("locator"), case.get("description")) if x) or uuid
+    cef = {"cydarmCaseUuid": uuid}
+    cef.update({field: case[field] for field in CASE_CEF_FIELDS if case.get(field) is not None})
+
+    container = {
+        "name": name,
+        "description": case.get("description"),
+        "source_data_identifier": uuid,
+        "severity": SEVERITY_MAP.get(case.get("severity"), "medium"),
+        "artifacts": [
+            {
+                "name": "Cydarm case",
+                "source_data_identifier": f"{uuid}:{case.get('modified')}",
+                "severity": SEVERITY_MAP.get(case.get("severity"), "medium"),
+                "cef": cef,
+                "cef_types": {"cydarmCaseUuid": ["cydarm case uuid"]},
+            }
+        ],
+    }
+    if label:
+        container["label"] = label
+        container["artifacts"][0]["label"] = label
+    return container
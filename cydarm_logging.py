@@ -0,0 +1,114 @@
+# File: cydarm_logging.py
+#
+# Copyright (c) Splunk, 2023-2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import json
+import logging
+from collections.abc import Mapping
+from typing import Any, Callable, Optional
+
+
+# asset 'log_verbosity' setting -> minimum level that is logged
+LOG_VERBOSITY_LEVELS = {"off": logging.CRITICAL + 1, "warning": logging.WARNING, "info": logging.INFO, "debug": logging.DEBUG}
+DEFAULT_LOG_VERBOSITY = "info"
+# payloads are cut down to this many characters, and lists to this many items, when they are logged
+DEFAULT_MAX_LOG_CHARS = 1000
+DEFAULT_MAX_LOG_ITEMS = 10
+
+REDACTED = "***"
+SENSITIVE_KEYS = frozenset({"authorization", "x-cydarm-authz", "access-token", "cookie", "set-cookie", "password", "token", "auth"})
+
+
+def redact(mapping: Mapping) -> dict:
+    return {key: REDACTED if str(key).lower() in SENSITIVE_KEYS else value for key, value in mapping.items()}
+
+
+def summarize(value: Any, max_chars: int = DEFAULT_MAX_LOG_CHARS, max_items: int = DEFAULT_MAX_LOG_ITEMS) -> str:
+    """
+    Renders value for a log message with secrets redacted. Only the first max_items items of each list and the first
+    max_chars characters are kept, so that the cost of logging does not grow with the size of the payload.
+    """
+    shrunk = _shrink(value, max_chars, max_items)
+    if not isinstance(shrunk, (dict, list)):
+        return str(shrunk)
+    text = json.dumps(shrunk, default=str)
+    if len(text) > max_chars:
+        text = f"{text[:max_chars]}... ({len(text)} chars)"
+    return text
+
+
+def _shrink(value: Any, max_chars: int, max_items: int) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _shrink(item, max_chars, max_items) for key, item in redact(value).items()}
+    if isinstance(value, (list, tuple)):
+        items = [_shrink(item, max_chars, max_items) for item in value[:max_items]]
+        if len(value) > max_items:
+            items.append(f"... {len(value) - max_items} more items")
+        return items
+    if isinstance(value, (bytes, bytearray)):
+        return f"<{len(value)} bytes>"
+    if isinstance(value, str) and len(value) > max_chars:
+        return f"{value[:max_chars]}... ({len(value)} chars)"
+    return value
+
+
+class CydarmLogger:
+    """
+    Level-gated logging to a log function such as BaseConnector.save_progress.
+
+    Messages take %-style args, which are only formatted (and dicts and lists summarised with summarize()) if the
+    level is enabled.
+    """
+
+    def __init__(
+        self,
+        log_function: Optional[Callable[[str], None]] = None,
+        level: int = logging.INFO,
+        max_chars: int = DEFAULT_MAX_LOG_CHARS,
+        max_items: int = DEFAULT_MAX_LOG_ITEMS,
+    ):
+        self.log_function = log_function
+        self.level = level
+        self.max_chars = max_chars
+        self.max_items = max_items
+
+    @classmethod
+    def from_verbosity(cls, log_function: Optional[Callable[[str], None]], verbosity: Optional[str]) -> "CydarmLogger":
+        level = LOG_VERBOSITY_LEVELS.get((verbosity or DEFAULT_LOG_VERBOSITY).lower(), LOG_VERBOSITY_LEVELS[DEFAULT_LOG_VERBOSITY])
+        return cls(log_function, level=level)
+
+    def is_enabled_for(self, level: int) -> bool:
+        return self.log_function is not None and level >= self.level
+
+    def log(self, level: int, message: str, *args):
+        if not self.is_enabled_for(level):
+            return
+        if args:
+            message = message % tuple(self.format_arg(arg) for arg in args)
+        self.log_function(message)
+
+    def format_arg(self, arg: Any) -> Any:
+        if isinstance(arg, (Mapping, list, tuple, bytes, bytearray)):
+            return summarize(arg, self.max_chars, self.max_items)
+        return arg
+
+    def debug(self, message: str, *args):
+        self.log(logging.DEBUG, message, *args)
+
+    def info(self, message: str, *args):
+        self.log(logging.INFO, message, *args)
+
+    def warning(self, message: str, *args):
+        self.log(logging.WARNING, message, *args)
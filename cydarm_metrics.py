@@ -0,0 +1,188 @@
+# File: cydarm_metrics.py
+#
+# Copyright (c) Splunk, 2023-2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import dataclasses
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional
+
+
+# path segments that name a resource; any other segment is taken to be an identifier
+RESOURCE_SEGMENTS = frozenset(
+    {
+        "acl",
+        "action-instance",
+        "auth",
+        "case",
+        "data",
+        "history",
+        "member",
+        "password",
+        "playbook",
+        "playbook-action",
+        "quick-search",
+        "tag",
+        "user",
+        "watch",
+    }
+)
+QUANTILES = (0.5, 0.95)
+PROMETHEUS_PREFIX = "cydarm"
+
+
+def get_url_template(url_path: str) -> str:
+    """
+    Replaces the identifiers in a Cydarm API path, e.g. /case/1234/playbook becomes /case/{uuid}/playbook.
+    """
+    path = url_path.split("?", 1)[0]
+    return "/".join(segment if not segment or segment in RESOURCE_SEGMENTS else "{uuid}" for segment in path.split("/"))
+
+
+def get_quantile(sorted_values: list[float], quantile: float) -> float:
+    # nearest-rank method
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(math.ceil(quantile * len(sorted_values)) - 1, 0)]
+
+
+@dataclasses.dataclass
+class Timings:
+    durations: list[float] = dataclasses.field(default_factory=list)
+
+    def summary(self) -> dict:
+        durations = sorted(self.durations)
+        summary = {"count": len(durations), "total_ms": round(sum(durations) * 1000, 1)}
+        for quantile in QUANTILES:
+            summary[f"p{int(quantile * 100)}_ms"] = round(get_quantile(durations, quantile) * 1000, 1)
+        return summary
+
+
+@dataclasses.dataclass
+class EndpointStats(Timings):
+    status_codes: Counter = dataclasses.field(default_factory=Counter)
+    bytes_received: int = 0
+
+
+class Metrics:
+    """
+    Thread-safe request and operation timings for one connector run.
+
+    Requests are aggregated per method and URL template, so that e.g. every get_case() call is reported under
+    'GET /case/{uuid}'. Other operations, such as generating a bearer token, are timed by name.
+    """
+
+    def __init__(self):
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.operations: dict[str, Timings] = {}
+        self._lock = threading.Lock()
+
+    def record_request(self, method: str, url_path: str, status_code: Optional[int], seconds: float, num_bytes: int = 0):
+        """
+        :param status_code: None if no response was received.
+        """
+        key = f"{method.upper()} {get_url_template(url_path)}"
+        with self._lock:
+            stats = self.endpoints.setdefault(key, EndpointStats())
+            stats.durations.append(seconds)
+            stats.status_codes[str(status_code) if status_code is not None else "error"] += 1
+            stats.bytes_received += num_bytes
+
+    def record_operation(self, name: str, seconds: float):
+        with self._lock:
+            self.operations.setdefault(name, Timings()).durations.append(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_operation(name, time.perf_counter() - start)
+
+    def summary(self) -> dict:
+        """
+        Aggregates suitable for an action result summary.
+        """
+        with self._lock:
+            status_codes = Counter()
+            for stats in self.endpoints.values():
+                status_codes.update(stats.status_codes)
+            return {
+                "requests": sum(len(stats.durations) for stats in self.endpoints.values()),
+                "bytes_received": sum(stats.bytes_received for stats in self.endpoints.values()),
+                "status_codes": dict(status_codes),
+                "endpoints": {key: stats.summary() for key, stats in sorted(self.endpoints.items())},
+                "operations": {name: timings.summary() for name, timings in sorted(self.operations.items())},
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+        """
+        lines = []
+
+        def add_summary(metric: str, labels: str, durations: list[float]):
+            durations = sorted(durations)
+            for quantile in QUANTILES:
+                lines.append(f'{metric}{{{labels},quantile="{quantile}"}} {get_quantile(durations, quantile)}')
+            lines.append(f"{metric}_sum{{{labels}}} {sum(durations)}")
+            lines.append(f"{metric}_count{{{labels}}} {len(durations)}")
+
+        with self._lock:
+            request_metric = f"{PROMETHEUS_PREFIX}_http_request_duration_seconds"
+            lines.append(f"# TYPE {request_metric} summary")
+            for key, stats in sorted(self.endpoints.items()):
+                method, template = key.split(" ", 1)
+                add_summary(request_metric, f'method="{method}",endpoint="{template}"', stats.durations)
+
+            responses_metric = f"{PROMETHEUS_PREFIX}_http_responses_total"
+            lines.append(f"# TYPE {responses_metric} counter")
+            for key, stats in sorted(self.endpoints.items()):
+                method, template = key.split(" ", 1)
+                for status_code, count in sorted(stats.status_codes.items()):
+                    lines.append(f'{responses_metric}{{method="{method}",endpoint="{template}",status="{status_code}"}} {count}')
+
+            bytes_metric = f"{PROMETHEUS_PREFIX}_http_response_bytes_total"
+            lines.append(f"# TYPE {bytes_metric} counter")
+            for key, stats in sorted(self.endpoints.items()):
+                method, template = key.split(" ", 1)
+                lines.append(f'{bytes_metric}{{method="{method}",endpoint="{template}"}} {stats.bytes_received}')
+
+            operation_metric = f"{PROMETHEUS_PREFIX}_operation_duration_seconds"
+            lines.append(f"# TYPE {operation_metric} summary")
+            for name, timings in sorted(self.operations.items()):
+                add_summary(operation_metric, f'operation="{name}"', timings.durations)
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """
+        Writes to_prometheus() to path, replacing the file atomically so a scraper never reads a partial file.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".cydarm_metrics_")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
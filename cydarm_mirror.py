@@ -0,0 +1,208 @@
+# File: cydarm_mirror.py
+#
+# Copyright (c) Splunk, 2023-2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import json
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from typing import Optional
+
+from cydarm_ingest import Watermark
+
+
+# cases written per transaction during a sync
+SYNC_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    uuid TEXT PRIMARY KEY,
+    status TEXT COLLATE NOCASE,
+    severity INTEGER,
+    assignee TEXT,
+    org TEXT,
+    modified TEXT,
+    synced_at REAL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cases_status ON cases (status);
+CREATE INDEX IF NOT EXISTS cases_severity ON cases (severity);
+CREATE INDEX IF NOT EXISTS cases_assignee ON cases (assignee);
+CREATE INDEX IF NOT EXISTS cases_org ON cases (org);
+CREATE TABLE IF NOT EXISTS case_tags (
+    tag TEXT COLLATE NOCASE,
+    case_uuid TEXT,
+    PRIMARY KEY (tag, case_uuid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS case_tags_case_uuid ON case_tags (case_uuid);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class CaseMirror:
+    """
+    A local SQLite copy of Cydarm cases, kept up to date by sync() and queried without calling Cydarm.
+
+    Each sync only writes the cases modified since the last complete sync. Cases deleted in Cydarm stay in the mirror
+    until a full sync.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30)
+        # readers are not blocked while a sync writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self._conn.close()
+
+    def get_state(self, key: str):
+        row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_state(self, key: str, value):
+        self._conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    @property
+    def last_synced_at(self) -> Optional[float]:
+        """
+        Wall-clock time at which the last complete sync started, or None if there has not been one.
+        """
+        return self.get_state("last_synced_at")
+
+    @property
+    def watermark(self) -> Watermark:
+        """
+        The latest change in the mirror. An incremental sync only needs the cases modified since then.
+        """
+        return Watermark.from_dict(self.get_state("watermark"))
+
+    def get_age(self) -> Optional[float]:
+        """
+        Seconds since the last complete sync started, or None if there has not been one.
+        """
+        last_synced_at = self.last_synced_at
+        return None if last_synced_at is None else max(time.time() - last_synced_at, 0.0)
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM cases").fetchone()[0]
+
+    def sync(self, cases: Iterable[dict], full: bool = False) -> int:
+        """
+        Writes the cases modified since the last complete sync. Cases are written in batches as they arrive, but the
+        sync is only recorded once every case has been read, since they arrive in no particular order; if reading
+        fails part way, the next sync sees the same changes again. Changes made while the sync ran are also seen again.
+
+        :param cases: every case in Cydarm, e.g. from CydarmAPI.iter_cases_filtered(). Cases not modified since the
+            watermark are skipped.
+        :param full: rewrite the mirror from scratch, dropping cases that no longer exist.
+        :return: number of cases written.
+        """
+        started_at = time.time()
+        watermark = Watermark() if full else self.watermark
+        new_watermark = Watermark.from_dict(watermark.to_dict())
+        batch = []
+        num_written = 0
+        try:
+            for case in cases:
+                if not watermark.is_new(case):
+                    continue
+                batch.append(case)
+                new_watermark.advance(case)
+                if len(batch) >= SYNC_BATCH_SIZE:
+                    num_written += self._write_batch(batch, started_at)
+        finally:
+            # cases read before a failure are kept
+            num_written += self._write_batch(batch, started_at)
+
+        with self._conn:
+            if full:
+                # a full sync writes every case, so any case it did not write has been deleted
+                self._conn.execute("DELETE FROM cases WHERE synced_at < ?", (started_at,))
+                self._conn.execute("DELETE FROM case_tags WHERE case_uuid NOT IN (SELECT uuid FROM cases)")
+            new_watermark.cap(datetime.fromtimestamp(started_at, timezone.utc))
+            self.set_state("watermark", new_watermark.to_dict())
+            self.set_state("last_synced_at", started_at)
+        return num_written
+
+    def _write_batch(self, batch: list[dict], synced_at: float) -> int:
+        num_cases = len(batch)
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cases (uuid, status, severity, assignee, org, modified, synced_at, body) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        case["uuid"],
+                        case.get("status"),
+                        case.get("severity"),
+                        case.get("assignee"),
+                        case.get("org"),
+                        case.get("modified"),
+                        synced_at,
+                        json.dumps(case),
+                    )
+                    for case in batch
+                ],
+            )
+            self._conn.executemany("DELETE FROM case_tags WHERE case_uuid = ?", [(case["uuid"],) for case in batch])
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO case_tags (tag, case_uuid) VALUES (?, ?)",
+                [(tag, case["uuid"]) for case in batch for tag in case.get("tags") or []],
+            )
+        batch.clear()
+        return num_cases
+
+    def query(
+        self,
+        statuses: Optional[list[str]] = None,
+        severities: Optional[list[int]] = None,
+        tags: Optional[list[str]] = None,
+        assignees: Optional[list[str]] = None,
+        orgs: Optional[list[str]] = None,
+        max_results: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """
+        Cases matching every given filter, most recently modified first. Each filter matches any of its values;
+        statuses and tags are compared case-insensitively.
+        """
+        conditions = []
+        args = []
+        for column, values in (("status", statuses), ("severity", severities), ("assignee", assignees), ("org", orgs)):
+            if values:
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+                args += values
+        if tags:
+            conditions.append(f"uuid IN (SELECT case_uuid FROM case_tags WHERE tag IN ({', '.join('?' * len(tags))}))")
+            args += tags
+        sql = "SELECT body FROM cases"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY modified DESC"
+        if max_results:
+            sql += " LIMIT ?"
+            args.append(max_results)
+        for (body,) in self._conn.execute(sql, args):
+            yield json.loads(body)
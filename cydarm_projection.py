@@ -0,0 +1,98 @@
+# File: cydarm_projection.py
+#
+# Copyright (c) Splunk, 2023-2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+from collections.abc import Iterable
+from typing import Any, Callable, Optional
+
+
+# prefix of the output data paths in the app JSON, e.g. action_result.data.*.atc.uuid
+DATA_PATH_PREFIX = "action_result.data.*."
+
+Projector = Callable[[Any], Any]
+
+
+def get_field_path(path: str) -> list[str]:
+    """
+    Splits a dotted path, given either relative to a data item or as a full data path of the app JSON.
+    """
+    path = path.strip()
+    if path.startswith(DATA_PATH_PREFIX):
+        path = path[len(DATA_PATH_PREFIX) :]
+    return [segment for segment in path.split(".") if segment]
+
+
+def merge_trees(tree: Optional[dict], other: Optional[dict]) -> Optional[dict]:
+    """
+    Combines two trees of compile_projection(), so that the result keeps what either keeps.
+    """
+    if tree is None or other is None:
+        return None
+    merged = dict(tree)
+    for key, child in other.items():
+        merged[key] = merge_trees(merged[key], child) if key in merged else child
+    return merged
+
+
+def merge_wildcards(node: Optional[dict]) -> Optional[dict]:
+    """
+    Adds what the '*' entry of each node keeps to the node's named entries, since '*' also matches those names.
+    """
+    if node is None:
+        return None
+    wildcard = node.get("*", {})
+    return {key: merge_wildcards(child if key == "*" else merge_trees(child, wildcard)) for key, child in node.items()}
+
+
+def compile_projection(paths: Iterable[str]) -> Optional[Projector]:
+    """
+    Compiles dotted paths into a function that copies a data item keeping only those paths. '*' selects every element
+    of a list or value of a dict; a list met where a field name is expected is projected element by element too.
+    Paths that do not exist in an item are left out.
+
+    :return: None if there are no paths, meaning items are kept whole.
+    """
+    # nested dicts of path segments; None marks the end of a path, below which everything is kept
+    tree: dict = {}
+    for segments in map(get_field_path, paths):
+        if not segments:
+            continue
+        node = tree
+        for segment in segments[:-1]:
+            child = node.get(segment, {})
+            if child is None:
+                # a shorter path already keeps the whole value
+                break
+            node = node.setdefault(segment, child)
+        else:
+            node[segments[-1]] = None
+    if not tree:
+        return None
+    tree = merge_wildcards(tree)
+
+    def project(value, node: Optional[dict]):
+        if node is None:
+            return value
+        if isinstance(value, list):
+            # named entries under a list apply to its elements, as '*' does
+            element_node = merge_trees(node["*"], {key: child for key, child in node.items() if key != "*"}) if "*" in node else node
+            return [project(element, element_node) for element in value]
+        if isinstance(value, dict):
+            projected = {key: project(element, node["*"]) for key, element in value.items()} if "*" in node else {}
+            projected.update((key, project(value[key], child)) for key, child in node.items() if key != "*" and key in value)
+            return projected
+        return value
+
+    return lambda item: project(item, tree)
@@ -0,0 +1,149 @@
+# File: cydarm_rate_limit.py
+#
+# Copyright (c) Splunk, 2023-2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import fcntl
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+
+# requests are rate limited separately for each endpoint class
+ENDPOINT_CLASS_AUTH = "auth"
+ENDPOINT_CLASS_READ = "read"
+ENDPOINT_CLASS_WRITE = "write"
+ENDPOINT_CLASSES = (ENDPOINT_CLASS_AUTH, ENDPOINT_CLASS_READ, ENDPOINT_CLASS_WRITE)
+READ_METHODS = frozenset({"get", "head", "options"})
+
+
+def get_endpoint_class(method: str, url_path: str) -> str:
+    if url_path.startswith("/auth/"):
+        return ENDPOINT_CLASS_AUTH
+    if method.lower() in READ_METHODS:
+        return ENDPOINT_CLASS_READ
+    return ENDPOINT_CLASS_WRITE
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that allows rate requests per second on average, in bursts of up to burst requests.
+
+    If state_path is set, the bucket is kept in that file under an exclusive lock, so that every process using the
+    same file (e.g. connector runs on one SOAR node) shares the one bucket.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, state_path: Optional[str] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(burst or rate, 1.0)
+        self.state_path = state_path
+        self._tokens = self.burst
+        # wall-clock time, so the state file can be shared between processes
+        self._updated_at = time.time()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes a token, waiting for one to become available if necessary.
+
+        :return: seconds waited.
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire()
+            if delay <= 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def try_acquire(self) -> float:
+        """
+        Takes a token if one is available.
+
+        :return: 0 if a token was taken, otherwise seconds until one will be available.
+        """
+        with self._lock:
+            if not self.state_path:
+                return self._take()
+            with open(self.state_path, "a+") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    self._read_state(f)
+                    delay = self._take()
+                    self._write_state(f)
+                    return delay
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _take(self) -> float:
+        now = time.time()
+        # max() guards against the clock going backwards
+        self._tokens = min(self.burst, self._tokens + max(now - self._updated_at, 0.0) * self.rate)
+        self._updated_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def _read_state(self, f):
+        f.seek(0)
+        try:
+            state = json.loads(f.read() or "{}")
+            self._tokens = min(float(state["tokens"]), self.burst)
+            self._updated_at = float(state["updated_at"])
+        except (KeyError, TypeError, ValueError):
+            # a new or corrupt state file starts with a full bucket
+            self._tokens = self.burst
+            self._updated_at = time.time()
+
+    def _write_state(self, f):
+        f.seek(0)
+        f.truncate()
+        f.write(json.dumps({"tokens": self._tokens, "updated_at": self._updated_at}))
+        f.flush()
+
+
+class RateLimiter:
+    """
+    A TokenBucket per endpoint class. Endpoint classes without a bucket are not rate limited.
+    """
+
+    def __init__(self, buckets: dict[str, TokenBucket]):
+        self.buckets = buckets
+
+    @classmethod
+    def from_rates(
+        cls, rates: dict[str, Optional[float]], burst: Optional[float] = None, state_dir: Optional[str] = None, state_key: str = "cydarm"
+    ) -> Optional["RateLimiter"]:
+        """
+        :param rates: requests per second for each endpoint class. Classes with no rate, or a rate of 0, are not limited.
+        :param state_dir: if set, buckets are shared with other processes through files in this directory.
+        :param state_key: identifies the buckets to share, e.g. the Cydarm base URL.
+        :return: None if no endpoint class is limited.
+        """
+        buckets = {}
+        for endpoint_class, rate in rates.items():
+            if not rate:
+                continue
+            state_path = os.path.join(state_dir, f"{state_key}_rate_limit_{endpoint_class}.json") if state_dir else None
+            buckets[endpoint_class] = TokenBucket(float(rate), burst=burst, state_path=state_path)
+        return cls(buckets) if buckets else None
+
+    def acquire(self, method: str, url_path: str) -> float:
+        bucket = self.buckets.get(get_endpoint_class(method, url_path))
+        return bucket.acquire() if bucket else 0.0
@@ -0,0 +1,109 @@
+# File: cydarm_retry.py
+#
+# Copyright (c) Splunk, 2023-2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import dataclasses
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+# responses that mean "try again later" rather than "this request is wrong"
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"get", "head", "options", "put", "delete"})
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header, given either in seconds or as an HTTP date.
+
+    :return: seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclasses.dataclass
+class RetryPolicy:
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+
+    def should_retry(self, method: str, attempt: int) -> bool:
+        return method.lower() in IDEMPOTENT_METHODS and attempt < self.max_retries
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Seconds to wait before retry number attempt + 1. Honours Retry-After, otherwise uses exponential backoff with full jitter.
+        """
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = random.uniform(0, self.backoff_base * 2**attempt)
+        return min(delay, self.backoff_max)
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast with CircuitOpenError after failure_threshold consecutive failures.
+
+    After reset_timeout seconds, calls are let through again; the next failure re-opens the circuit straight away and
+    a success closes it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        # wall-clock time, so the state can be persisted between action runs
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.opened_at is not None and time.time() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"Cydarm API calls are paused for {self.reset_timeout}s after {self.failures} consecutive failures")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.time()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {"failures": self.failures, "opened_at": self.opened_at}
+
+    def load(self, state: dict):
+        with self._lock:
+            self.failures = state.get("failures", 0)
+            self.opened_at = state.get("opened_at")
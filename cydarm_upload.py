@@ -0,0 +1,85 @@
+# File: cydarm_upload.py
+#
+# Copyright (c) Splunk, 2023-2025
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import json
+import math
+import os
+from base64 import b64encode
+from collections.abc import Iterator
+from typing import Union
+
+
+# bytes read and encoded at a time. A multiple of 3, so that each chunk encodes to base64 without padding.
+CHUNK_SIZE = 3 * 64 * 1024
+
+# text is sent UTF-8 encoded; a path is read from the file (e.g. a SOAR vault file)
+UploadData = Union[str, bytes, os.PathLike]
+
+
+class Base64JSONBody:
+    """
+    A request body of the form {"mimeType": ..., "significance": ..., "data": "<base64 of data>"} that is encoded
+    chunk by chunk as it is sent, so the whole encoded payload is never held in memory.
+
+    The body can be iterated more than once (e.g. when a request is retried), and has a length so that it is sent
+    with a Content-Length rather than chunked.
+    """
+
+    def __init__(self, data: UploadData, mime_type: str = "text/plain", significance: str = "Comment", chunk_size: int = CHUNK_SIZE):
+        if chunk_size % 3:
+            raise ValueError("chunk_size must be a multiple of 3")
+        self.data = data.encode("utf-8") if isinstance(data, str) else data
+        self.chunk_size = chunk_size
+        fields = json.dumps({"mimeType": mime_type, "significance": significance})
+        # base64 needs no JSON escaping, so the encoded data can be written straight between the quotes
+        self._prefix = f'{fields[:-1]}, "data": "'.encode()
+        self._suffix = b'"}'
+
+    def get_data_size(self) -> int:
+        if isinstance(self.data, os.PathLike):
+            return os.path.getsize(self.data)
+        return len(self.data)
+
+    def __len__(self) -> int:
+        return len(self._prefix) + 4 * math.ceil(self.get_data_size() / 3) + len(self._suffix)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} of {self.get_data_size()} bytes>"
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._prefix
+        for chunk in self.iter_data_chunks():
+            yield b64encode(chunk)
+        yield self._suffix
+
+    def iter_data_chunks(self) -> Iterator[bytes]:
+        if isinstance(self.data, os.PathLike):
+            with open(self.data, "rb") as f:
+                while True:
+                    # read() can return less than asked for, so fill the chunk to keep it a multiple of 3
+                    chunk = f.read(self.chunk_size)
+                    while chunk and len(chunk) < self.chunk_size:
+                        more = f.read(self.chunk_size - len(chunk))
+                        if not more:
+                            break
+                        chunk += more
+                    if not chunk:
+                        return
+                    yield chunk
+        else:
+            view = memoryview(self.data)
+            for start in range(0, len(view), self.chunk_size):
+                yield view[start : start + self.chunk_size]
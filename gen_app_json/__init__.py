@@ -79,6 +79,62 @@ OUTPUT_CASE_PLAYBOOK_MODEL = as_list_of_dicts(
         OutputField(data_path="action_result.data.*.action_statuses.*.actionInstanceUuid"),
     ]
 )
+OUTPUT_CASE_PLAYBOOK_TREE_MODEL = as_list_of_dicts(
+    [
+        OutputField(data_path="action_result.data.*.caseUuid"),
+        OutputField(data_path="action_result.data.*.totalActionsInAllPlaybooks", data_type="numeric"),
+        OutputField(data_path="action_result.data.*.totalCompletedActionsInAllPlaybooks", data_type="numeric"),
+        OutputField(data_path="action_result.data.*.playbooks.*.casePlaybookUuid"),
+        OutputField(data_path="action_result.data.*.playbooks.*.playbookName"),
+        OutputField(data_path="action_result.data.*.playbooks.*.total_actions", data_type="numeric"),
+        OutputField(data_path="action_result.data.*.playbooks.*.action_statuses.*.actionName"),
+        OutputField(data_path="action_result.data.*.playbooks.*.action_statuses.*.actionInstanceUuid"),
+        OutputField(data_path="action_result.data.*.playbooks.*.action_statuses.*.action.atc.uuid"),
+        OutputField(data_path="action_result.data.*.playbooks.*.action_statuses.*.action.atc.description"),
+        OutputField(data_path="summary.total_playbooks", data_type="numeric"),
+        OutputField(data_path="summary.total_actions", data_type="numeric"),
+        OutputField(data_path="summary.total_completed_actions", data_type="numeric"),
+    ]
+)
+OUTPUT_BULK_CREATE_CASE_MODEL = as_list_of_dicts(
+    [
+        OutputField(data_path="action_result.data.*.row", data_type="numeric"),
+        OutputField(data_path="action_result.data.*.uuid"),
+    ]
+)
+OUTPUT_SYNC_LOCAL_CASES_MODEL = as_list_of_dicts(
+    [
+        OutputField(data_path="action_result.data.*.cases_written", data_type="numeric"),
+        OutputField(data_path="action_result.data.*.cases_in_mirror", data_type="numeric"),
+        OutputField(data_path="action_result.data.*.last_synced_at"),
+        OutputField(data_path="summary.cases_written", data_type="numeric"),
+        OutputField(data_path="summary.cases_in_mirror", data_type="numeric"),
+    ]
+)
+OUTPUT_MIRROR_AGE_SUMMARY = as_list_of_dicts([OutputField(data_path="summary.mirror_age_seconds", data_type="numeric")])
+OUTPUT_CASE_TAG_MODEL = as_list_of_dicts(
+    [
+        OutputField(data_path="action_result.data.*.case_uuid"),
+        OutputField(data_path="action_result.data.*.tag_value"),
+    ]
+)
+OUTPUT_CASE_DATA_MODEL = as_list_of_dicts(
+    [
+        OutputField(data_path="action_result.data.*.uuid"),
+        OutputField(data_path="action_result.data.*.significance"),
+        OutputField(data_path="action_result.data.*.mimeType"),
+        OutputField(data_path="action_result.data.*.data"),
+        OutputField(data_path="action_result.data.*.data_size", data_type="numeric"),
+        OutputField(data_path="action_result.data.*.data_truncated", data_type="boolean"),
+        OutputField(data_path="action_result.data.*.decoded_data"),
+    ]
+)
+OUTPUT_BULK_SUMMARY = as_list_of_dicts(
+    [
+        OutputField(data_path="summary.total_objects_failed", data_type="numeric"),
+        OutputField(data_path="summary.partial_results", data_type="boolean"),
+    ]
+)
 OUTPUT_STATUS_MESSAGE_SUMMARY = as_list_of_dicts(
     [
         OutputField(data_path="action_result.status"),
@@ -104,6 +160,84 @@ INPUT_PARAMS_ADD_ACTION_TO_PLAYBOOK = [
     InputParam(name="action_uuid", description="UUID of action to add.", required=True),
 ]
 
+INPUT_PARAMS_BULK_CASE_TAGS = [
+    InputParam(name="case_uuids", description="UUIDs of cases. Expected format: JSON Array or comma-separated list.", required=True),
+    InputParam(name="tag_values", description="Names of tags. Expected format: JSON Array or comma-separated list.", required=True),
+    InputParam(name="requests_per_second", data_type="numeric", description="Maximum number of tag requests to start per second."),
+]
+
+INPUT_PARAMS_BULK_CREATE_CASES = [
+    InputParam(name="data", description="Case definitions. Expected format: JSON Array of objects."),
+    InputParam(name="vault_id", description="Vault ID of a JSON Lines file with one case definition per line", contains=["vault id"]),
+    InputParam(name="requests_per_second", data_type="numeric", description="Maximum number of create requests to start per second."),
+]
+
+INPUT_PARAMS_QUERY_LOCAL_CASES = [
+    InputParam(name="status", description="Case statuses to match. Expected format: JSON Array or comma-separated list."),
+    InputParam(name="severity", description="Case severities (1 to 5) to match. Expected format: JSON Array or comma-separated list."),
+    InputParam(name="tags", description="Match cases with any of these tags. Expected format: JSON Array or comma-separated list."),
+    InputParam(name="assignee", description="Case assignees to match. Expected format: JSON Array or comma-separated list."),
+    InputParam(name="org", description="Case organisations to match. Expected format: JSON Array or comma-separated list."),
+    InputParam(name="max_results", data_type="numeric", description="Maximum number of cases to return, most recently modified first"),
+    InputParam(
+        name="max_age",
+        data_type="numeric",
+        description="Fail if the mirror was last synced more than this many seconds ago. 0 accepts any age",
+        default=3600,
+    ),
+]
+
+INPUT_PARAMS_GET_CASES_FILTERED = [
+    InputParam(name="filter_text", description="Text to search for in case locator, description, and metadata values"),
+    InputParam(name="tags_included", description="Match cases with any of these tags. Expected format: JSON Array or comma-separated list."),
+    InputParam(name="tags_required", description="Match cases with all of these tags. Expected format: JSON Array or comma-separated list."),
+    InputParam(name="tags_excluded", description="Skip cases with any of these tags. Expected format: JSON Array or comma-separated list."),
+    InputParam(name="status", description="Case statuses to match. Expected format: JSON Array or comma-separated list."),
+    InputParam(name="status_excluded", description="Case statuses to skip. Expected format: JSON Array or comma-separated list."),
+    InputParam(name="severity", description="Case severities (1 to 5) to match. Expected format: JSON Array or comma-separated list."),
+    InputParam(name="assignee", description="Case assignees to match. Expected format: JSON Array or comma-separated list."),
+    InputParam(name="org", description="Case organisations to match. Expected format: JSON Array or comma-separated list."),
+    InputParam(name="created_from", description="Match cases created at or after this ISO-8601 time"),
+    InputParam(name="created_to", description="Match cases created at or before this ISO-8601 time"),
+    InputParam(name="modified_from", description="Match cases modified at or after this ISO-8601 time"),
+    InputParam(name="modified_to", description="Match cases modified at or before this ISO-8601 time"),
+    InputParam(name="sort", description="Fields to sort by, each prefixed with '-' for descending order, e.g. -severity,created"),
+    InputParam(
+        name="fields",
+        description=(
+            "Only keep these data paths in the results, e.g. status,metadata.Email-From.value. "
+            "Expected format: JSON Array or comma-separated list."
+        ),
+    ),
+    InputParam(name="page_size", data_type="numeric", description="Number of cases fetched per request", default=1000),
+    InputParam(
+        name="max_workers",
+        data_type="numeric",
+        description="Number of result pages to fetch concurrently. 1 fetches pages sequentially",
+        default=1,
+    ),
+    InputParam(
+        name="max_results", data_type="numeric", description="Maximum number of cases to return. Leave empty to return all matching cases"
+    ),
+]
+
+# added to every read action
+INPUT_PARAM_FIELDS = InputParam(
+    name="fields",
+    description=(
+        "Only keep these data paths in the results, e.g. uuid,metadata.*.value or action_result.data.*.uuid. "
+        "Leave empty to keep everything. Expected format: JSON Array or comma-separated list."
+    ),
+)
+
+INPUT_PARAMS_ON_POLL = [
+    InputParam(name="container_id", description="Parameter ignored in this app"),
+    InputParam(name="start_time", data_type="numeric", description="Parameter ignored in this app"),
+    InputParam(name="end_time", data_type="numeric", description="Parameter ignored in this app"),
+    InputParam(name="container_count", data_type="numeric", description="Maximum number of cases to ingest during 'poll now'"),
+    InputParam(name="artifact_count", data_type="numeric", description="Parameter ignored in this app"),
+]
+
 INPUT_PARAMS_UPDATE_CASE_HISTORY = [
     InputParam(name="case_uuid", description="Case UUID", required=True),
     InputParam(name="modified", description="The time at which the case was modified. Expected format: ISO-8601.", required=True),
@@ -128,9 +262,14 @@ def generate_action(
     read_only=False,
     verbose=None,
     action_name: Optional[str] = None,
+    projectable=True,
 ):
     # action names must be lower case
     resolved_action_name = action_name or identifier.replace("_", " ").lower()
+    if projectable and read_only and action_type == "generic" and "fields" not in parameters:
+        # read actions can cut their results down to the data paths a playbook uses. Pass projectable=False for
+        # actions whose result is only a summary.
+        parameters = {**parameters, "fields": {**dataclasses.asdict(INPUT_PARAM_FIELDS), "order": len(parameters)}}
     result = {
         "action": resolved_action_name,
         "identifier": identifier,
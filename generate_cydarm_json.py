@@ -15,6 +15,7 @@
 #
 
 import os
+from copy import deepcopy
 
 from gen_app_json import *
 
@@ -29,6 +30,18 @@ ACTIONS = [
         parameters={},
         output=[],
     ),
+    generate_action(
+        identifier="on_poll",
+        action_type="ingest",
+        description="Ingest Cydarm cases modified since the last poll into containers",
+        verbose=(
+            "Each case is ingested as a container keyed by the case UUID. Every change to the case adds an artifact "
+            "with the case fields. During 'poll now', at most 'container_count' cases are ingested and the last poll time is not updated."
+        ),
+        read_only=True,
+        parameters=generate_input_params_dict(INPUT_PARAMS_ON_POLL),
+        output=[],
+    ),
     generate_action(
         identifier="get_case",
         description="Get a Cydarm case by UUID",
@@ -40,31 +53,52 @@ ACTIONS = [
         ),
         output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_CASE_MODEL,
     ),
+    generate_action(
+        identifier="get_cases",
+        description="Get multiple Cydarm cases by UUID",
+        verbose="Cases are fetched concurrently. A case that can't be fetched is reported in the summary errors without failing the others.",
+        read_only=True,
+        parameters=generate_input_params_dict(
+            [
+                InputParam(
+                    name="case_uuids",
+                    description="UUIDs of cases to get. Expected format: JSON Array or comma-separated list.",
+                    required=True,
+                ),
+            ]
+        ),
+        output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_BULK_SUMMARY + OUTPUT_CASE_MODEL,
+    ),
     generate_action(
         action_name="quick search cases",
         identifier="get_case_quick_search",
         description="Query Cydarm cases with a keyword filter",
+        verbose=(
+            "With 'hydrate', the full case of each hit is fetched concurrently and returned with its rank, in rank order. "
+            "A case that can't be fetched is reported in the summary errors without failing the others."
+        ),
         read_only=True,
         parameters=generate_input_params_dict(
             [
                 InputParam(name="search_string", description="Search string", required=True),
+                InputParam(name="hydrate", data_type="boolean", description="Return the full case of each hit instead of just its UUID and ACL"),
+                InputParam(name="max_results", data_type="numeric", description="Maximum number of hits to return, highest ranked first"),
             ]
         ),
-        output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_UUID_AND_ACL_MODEL + OUTPUT_RANK_MODEL,
-    ),
-    # generate_action(identifier="get_cases_filtered",
-    #                 description="Query Cydarm cases with fine-grain filters",
-    #                 verbose="Warning: Not fully implemented.",
-    #                 read_only=True,
-    #                 parameters=generate_input_params_dict([
-    #                     # TODO: add other params
-    #                     # InputParam(name="filter_text",
-    #                     #            description="""(NOTE: this API field is not yet implemented).
-    #                     #            Text to search for in case locator, description, and metadata values."""),
-    #                     # InputParam(name="tags_included", description="Comma-delimited list of tags to include."),
-    #                 ]),
-    #                 output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_CASE_MODEL
-    #                 ),
+        output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_BULK_SUMMARY + OUTPUT_CASE_MODEL + OUTPUT_RANK_MODEL,
+    ),
+    generate_action(
+        identifier="get_cases_filtered",
+        description="Query Cydarm cases with fine-grain filters",
+        verbose=(
+            "Only the text filter and a single included tag are sent to Cydarm. The other filters are applied to each case "
+            "as it is read, and sorting reads every matching case before returning the first. Several included tags, or any "
+            "required or excluded tags, are queried one tag at a time and combined by case UUID."
+        ),
+        read_only=True,
+        parameters=generate_input_params_dict(INPUT_PARAMS_GET_CASES_FILTERED),
+        output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_CASE_MODEL,
+    ),
     generate_action(
         action_name="create action comment",
         identifier="create_action_instance_data",
@@ -92,6 +126,49 @@ ACTIONS = [
         ),
         output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_UUID_AND_ACL_MODEL,
     ),
+    generate_action(
+        identifier="create_case_data",
+        description="Upload text or a vault file to a case as case data",
+        verbose=(
+            "Give either 'data' or 'vault_id'. Text is uploaded UTF-8 encoded. "
+            "The content is base64 encoded as it is sent, so large files are not held in memory."
+        ),
+        read_only=False,
+        parameters=generate_input_params_dict(
+            [
+                InputParam(name="case_uuid", description="UUID of the case", required=True),
+                InputParam(name="data", description="Text to upload"),
+                InputParam(name="vault_id", description="Vault ID of a file to upload", contains=["vault id"]),
+                InputParam(name="mime_type", description="MIME type of the data", default="text/plain"),
+                InputParam(name="significance", description="Significance of the data, e.g. Comment", default="Comment"),
+            ]
+        ),
+        output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_UUID_AND_ACL_MODEL,
+    ),
+    generate_action(
+        identifier="list_case_data",
+        description="List the data items (comments, evidence, attachments) of a case",
+        verbose=(
+            "Items are fetched a page at a time. Data is returned base64 encoded; with 'decode_data', the data of text items "
+            "is also returned decoded in 'decoded_data'. Items larger than 'max_item_size' bytes are cut down to that size and "
+            "have 'data_truncated' set."
+        ),
+        read_only=True,
+        parameters=generate_input_params_dict(
+            [
+                InputParam(name="case_uuid", description="UUID of the case", required=True),
+                InputParam(name="significance", description="Comma separated significances to list, e.g. Comment. Leave empty to list all"),
+                InputParam(
+                    name="mime_type", description="Comma separated mime types to list, e.g. text/plain or image/*. Leave empty to list all"
+                ),
+                InputParam(name="decode_data", data_type="boolean", description="Decode the data of text items"),
+                InputParam(name="max_item_size", data_type="numeric", description="Maximum bytes of data returned per item", default=1048576),
+                InputParam(name="max_results", data_type="numeric", description="Maximum number of items to return"),
+                InputParam(name="page_size", data_type="numeric", description="Number of items fetched per request", default=50),
+            ]
+        ),
+        output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_CASE_DATA_MODEL,
+    ),
     generate_action(
         identifier="create_case",
         description="Create case",
@@ -155,6 +232,21 @@ ACTIONS = [
         ),
         output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_CASE_PLAYBOOK_MODEL,
     ),
+    generate_action(
+        identifier="get_case_playbook_tree",
+        description="Get all playbooks of a case with their action statuses and playbook actions",
+        verbose=(
+            "Fetches the case, its playbook instances and their playbook actions concurrently, and returns them as one nested "
+            "document with the case's total and completed action counts. Failed lookups are reported in the summary errors."
+        ),
+        read_only=True,
+        parameters=generate_input_params_dict(
+            [
+                InputParam(name="case_uuid", description="Case UUID", required=True),
+            ]
+        ),
+        output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_BULK_SUMMARY + OUTPUT_CASE_PLAYBOOK_TREE_MODEL,
+    ),
     generate_action(
         identifier="get_playbook_action",
         description="Get playbook action",
@@ -261,6 +353,69 @@ ACTIONS = [
         ),
         output=OUTPUT_STATUS_MESSAGE_SUMMARY,
     ),
+    generate_action(
+        identifier="bulk_add_case_tags",
+        description="Add tags to many cases",
+        verbose=(
+            "Adds every tag to every case, with up to 'max_concurrency' concurrent requests. "
+            "Failed case/tag pairs are reported in the summary errors without failing the others."
+        ),
+        read_only=False,
+        parameters=generate_input_params_dict(INPUT_PARAMS_BULK_CASE_TAGS),
+        output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_BULK_SUMMARY + OUTPUT_CASE_TAG_MODEL,
+    ),
+    generate_action(
+        identifier="bulk_delete_case_tags",
+        description="Delete tags from many cases",
+        verbose=(
+            "Deletes every tag from every case, with up to 'max_concurrency' concurrent requests. "
+            "Failed case/tag pairs are reported in the summary errors without failing the others."
+        ),
+        read_only=False,
+        parameters=generate_input_params_dict(deepcopy(INPUT_PARAMS_BULK_CASE_TAGS)),
+        output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_BULK_SUMMARY + OUTPUT_CASE_TAG_MODEL,
+    ),
+    generate_action(
+        identifier="sync_local_cases",
+        description="Update the local case mirror from Cydarm",
+        verbose=(
+            "Keeps a copy of every case in a SQLite file in the app's state directory, for 'query local cases'. "
+            "Only cases modified since the last complete sync are written. Cases deleted in Cydarm are only removed by a full sync."
+        ),
+        read_only=True,
+        # the result is a summary of the sync, not Cydarm data
+        projectable=False,
+        parameters=generate_input_params_dict(
+            [
+                InputParam(name="full_sync", data_type="boolean", description="Rewrite the mirror, removing cases deleted in Cydarm"),
+            ]
+        ),
+        output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_BULK_SUMMARY + OUTPUT_SYNC_LOCAL_CASES_MODEL,
+    ),
+    generate_action(
+        identifier="query_local_cases",
+        description="Find cases in the local case mirror",
+        verbose=(
+            "Answers from the mirror kept by 'sync local cases', without calling Cydarm. Cases must match every given "
+            "filter, and any of the values of each filter. Fails if the mirror is older than 'max_age'."
+        ),
+        read_only=True,
+        parameters=generate_input_params_dict(INPUT_PARAMS_QUERY_LOCAL_CASES),
+        output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_BULK_SUMMARY + OUTPUT_MIRROR_AGE_SUMMARY + OUTPUT_CASE_MODEL,
+    ),
+    generate_action(
+        identifier="bulk_create_cases",
+        description="Create many cases from a JSON array or a JSON Lines vault file",
+        verbose=(
+            "Give either 'data' or 'vault_id'. Each case definition is an object with the parameters of 'create case', "
+            "and is validated before it is sent; 'metadata', 'tags' and 'members' may be JSON values or JSON strings. "
+            "Cases are created with up to 'max_concurrency' concurrent requests. The new case UUIDs are returned by row "
+            "number, and failed rows are reported in the summary errors without failing the others."
+        ),
+        read_only=False,
+        parameters=generate_input_params_dict(INPUT_PARAMS_BULK_CREATE_CASES),
+        output=OUTPUT_STATUS_MESSAGE_SUMMARY + OUTPUT_BULK_SUMMARY + OUTPUT_BULK_CREATE_CASE_MODEL,
+    ),
 ]
 JSON = {
     "appid": "2205e95a-16ab-479d-9c10-363d05153dcb",
@@ -330,6 +485,241 @@ JSON = {
             "name": "basic_auth_password",
             "id": 4,
         },
+        "http_pool_size": {
+            "description": "Maximum number of pooled keep-alive connections to the Cydarm API",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 10,
+            "order": 5,
+            "name": "http_pool_size",
+            "id": 5,
+        },
+        "max_concurrency": {
+            "description": "Maximum number of concurrent Cydarm API requests made by bulk actions",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 10,
+            "order": 6,
+            "name": "max_concurrency",
+            "id": 6,
+        },
+        "reference_cache_ttl": {
+            "description": "Seconds to cache users, ACLs, playbooks and playbook actions for. 0 disables the cache",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 300,
+            "order": 7,
+            "name": "reference_cache_ttl",
+            "id": 7,
+        },
+        "reference_cache_size": {
+            "description": "Maximum number of cached users, ACLs, playbooks and playbook actions",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 256,
+            "order": 8,
+            "name": "reference_cache_size",
+            "id": 8,
+        },
+        "persist_reference_cache": {
+            "description": "Keep cached users, ACLs, playbooks and playbook actions in the asset state between action runs",
+            "data_type": "boolean",
+            "required": False,
+            "value_list": [],
+            "default": False,
+            "order": 9,
+            "name": "persist_reference_cache",
+            "id": 9,
+        },
+        "validator_cache_size": {
+            "description": ("Number of case and case playbook responses cached and revalidated with ETag/Last-Modified. 0 disables it"),
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 32,
+            "order": 10,
+            "name": "validator_cache_size",
+            "id": 10,
+        },
+        "max_retries": {
+            "description": "Number of times to retry an idempotent request that failed with a connection error or HTTP 429/502/503/504. 0 disables retries",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 3,
+            "order": 11,
+            "name": "max_retries",
+            "id": 11,
+        },
+        "retry_backoff_base": {
+            "description": "Base delay in seconds of the jittered exponential backoff between retries, unless the response has a Retry-After header",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 0.5,
+            "order": 12,
+            "name": "retry_backoff_base",
+            "id": 12,
+        },
+        "retry_backoff_max": {
+            "description": "Maximum delay in seconds between retries",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 30,
+            "order": 13,
+            "name": "retry_backoff_max",
+            "id": 13,
+        },
+        "circuit_breaker_threshold": {
+            "description": "Number of consecutive failed requests after which requests fail fast without contacting Cydarm. 0 disables it",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 5,
+            "order": 14,
+            "name": "circuit_breaker_threshold",
+            "id": 14,
+        },
+        "circuit_breaker_reset_seconds": {
+            "description": "Seconds to fail fast for before trying Cydarm again",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 30,
+            "order": 15,
+            "name": "circuit_breaker_reset_seconds",
+            "id": 15,
+        },
+        "poll_batch_size": {
+            "description": "Number of containers saved at a time while polling",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 100,
+            "order": 16,
+            "name": "poll_batch_size",
+            "id": 16,
+        },
+        "log_verbosity": {
+            "description": "Level of detail logged for Cydarm API calls. 'debug' logs request and response details with secrets redacted and large payloads truncated",
+            "data_type": "string",
+            "required": False,
+            "value_list": ["off", "warning", "info", "debug"],
+            "default": "info",
+            "order": 17,
+            "name": "log_verbosity",
+            "id": 17,
+        },
+        "rate_limit_auth": {
+            "description": "Maximum Cydarm authentication requests per second. 0 means unlimited",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 0,
+            "order": 18,
+            "name": "rate_limit_auth",
+            "id": 18,
+        },
+        "rate_limit_read": {
+            "description": "Maximum Cydarm read (GET) requests per second. 0 means unlimited",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 0,
+            "order": 19,
+            "name": "rate_limit_read",
+            "id": 19,
+        },
+        "rate_limit_write": {
+            "description": "Maximum Cydarm write (POST, PUT, DELETE) requests per second. 0 means unlimited",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 0,
+            "order": 20,
+            "name": "rate_limit_write",
+            "id": 20,
+        },
+        "rate_limit_burst": {
+            "description": "Number of requests that may be sent at once before the rate limits apply. Defaults to one second's worth",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "order": 21,
+            "name": "rate_limit_burst",
+            "id": 21,
+        },
+        "share_rate_limit": {
+            "description": "Share the rate limits between all actions running on this SOAR node for the same Cydarm instance",
+            "data_type": "boolean",
+            "required": False,
+            "value_list": [],
+            "default": True,
+            "order": 22,
+            "name": "share_rate_limit",
+            "id": 22,
+        },
+        "metrics_file": {
+            "description": "File to write request and action timings to in the Prometheus text format after each action, e.g. for the node exporter textfile collector",
+            "data_type": "string",
+            "required": False,
+            "value_list": [],
+            "default": "",
+            "order": 23,
+            "name": "metrics_file",
+            "id": 23,
+        },
+        "connect_timeout": {
+            "description": "Seconds to wait for a connection to Cydarm",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 10,
+            "order": 24,
+            "name": "connect_timeout",
+            "id": 24,
+        },
+        "read_timeout": {
+            "description": "Seconds to wait for Cydarm to send response data",
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 60,
+            "order": 25,
+            "name": "read_timeout",
+            "id": 25,
+        },
+        "action_timeout": {
+            "description": (
+                "Seconds after which an action stops making Cydarm API calls and returns the results it has so far, "
+                "with 'partial_results' set in the summary. 0 means no limit"
+            ),
+            "data_type": "numeric",
+            "required": False,
+            "value_list": [],
+            "default": 0,
+            "order": 26,
+            "name": "action_timeout",
+            "id": 26,
+        },
+        "persist_validator_cache": {
+            "description": (
+                "Keep cached case and case playbook responses in the asset state between action runs, so that repeated runs can be "
+                "revalidated. The state is not encrypted"
+            ),
+            "data_type": "boolean",
+            "required": False,
+            "value_list": [],
+            "default": False,
+            "order": 27,
+            "name": "persist_validator_cache",
+            "id": 27,
+        },
     },
     "actions": ACTIONS,
 }
@@ -0,0 +1,144 @@
+# File: conftest.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+"""
+Minimal stand-ins for the Splunk SOAR modules the connector imports, so that cydarm_connector can be tested outside
+SOAR. Only the parts of the platform API that the connector uses are provided.
+"""
+
+import sys
+import types
+
+
+class ActionResult:
+    def __init__(self, param=None):
+        self.param = param or {}
+        self.data = []
+        self.summary = {}
+        self.status = None
+        self.message = None
+
+    def add_data(self, data):
+        self.data.append(data)
+
+    def get_data(self):
+        return self.data
+
+    def update_summary(self, summary):
+        self.summary.update(summary)
+        return self.summary
+
+    def get_summary(self):
+        return self.summary
+
+    def set_status(self, status, message=None, exception=None):
+        self.status = status
+        self.message = message
+        return status
+
+    def get_status(self):
+        return self.status
+
+    def get_message(self):
+        return self.message
+
+
+class BaseConnector:
+    def __init__(self):
+        # set by tests in place of the asset config, the saved state and the action being run
+        self.asset_config = {}
+        self.saved_state = {}
+        self.action_id = None
+        self.poll_now = False
+        self.state_dir = None
+        # recorded for tests to check
+        self.action_results = []
+        self.progress_messages = []
+        self.saved_containers = []
+
+    def get_config(self):
+        return self.asset_config
+
+    def get_action_identifier(self):
+        return self.action_id
+
+    def get_asset_id(self):
+        return "asset-1"
+
+    def get_state_dir(self):
+        return self.state_dir
+
+    def is_poll_now(self):
+        return self.poll_now
+
+    def load_state(self):
+        return dict(self.saved_state)
+
+    def save_state(self, state):
+        self.saved_state = dict(state)
+
+    def add_action_result(self, action_result):
+        self.action_results.append(action_result)
+        return action_result
+
+    def save_progress(self, message, *args, **kwargs):
+        self.progress_messages.append(message)
+
+    def debug_print(self, *args, **kwargs):
+        pass
+
+    def error_print(self, *args, **kwargs):
+        pass
+
+    def save_containers(self, containers):
+        results = []
+        for container in containers:
+            self.saved_containers.append(container)
+            results.append({"success": True, "id": len(self.saved_containers)})
+        return True, "", results
+
+
+def vault_info(vault_id=None, **kwargs):
+    return False, f"Vault file {vault_id} not found", []
+
+
+def encrypt(value, salt):
+    return f"encrypted:{salt}:{value}"
+
+
+def decrypt(value, salt):
+    return value.removeprefix(f"encrypted:{salt}:")
+
+
+def install_module(name: str, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    return module
+
+
+phantom = install_module("phantom")
+phantom.app = install_module(
+    "phantom.app",
+    APP_SUCCESS=True,
+    APP_ERROR=False,
+    is_fail=lambda ret_val: not ret_val,
+    is_success=lambda ret_val: bool(ret_val),
+)
+phantom.action_result = install_module("phantom.action_result", ActionResult=ActionResult)
+phantom.base_connector = install_module("phantom.base_connector", BaseConnector=BaseConnector)
+phantom.rules = install_module("phantom.rules", vault_info=vault_info)
+install_module("encryption_helper", encrypt=encrypt, decrypt=decrypt)
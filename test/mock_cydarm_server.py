@@ -0,0 +1,243 @@
+# File: mock_cydarm_server.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+"""
+An in-process stand-in for the Cydarm API, for offline tests and benchmarks.
+
+    with MockCydarmServer(num_cases=1000, latency=0.005) as server:
+        api = CydarmAPI(base_url=server.base_url, username="user", password="pass")
+"""
+
+import base64
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+STATUSES = ("Open", "In Progress", "Closed")
+TAGS = ("phishing", "malware", "insider", "ddos", "fraud")
+
+
+def make_token(lifetime: float = 3600) -> str:
+    def encode(obj) -> str:
+        return base64.urlsafe_b64encode(json.dumps(obj).encode()).decode().rstrip("=")
+
+    return f"{encode({'alg': 'HS256'})}.{encode({'exp': time.time() + lifetime})}.signature"
+
+
+def make_case(index: int) -> dict:
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=index)
+    return {
+        "uuid": str(uuid.UUID(int=index + 1)),
+        "locator": f"CASE-{index}",
+        "description": f"Mock case {index}",
+        "status": STATUSES[index % len(STATUSES)],
+        "severity": index % 5 + 1,
+        "tags": [TAGS[index % len(TAGS)]],
+        "assignee": f"user-{index % 7}",
+        "org": f"org-{index % 3}",
+        "acl": "00000000-0000-0000-0000-00000000acl0",
+        "created": created.isoformat(),
+        "modified": (created + timedelta(hours=index % 48)).isoformat(),
+    }
+
+
+class MockCydarmServer:
+    """
+    Threaded HTTP server implementing the parts of the Cydarm API used by CydarmAPI.
+
+    :param num_cases: number of generated cases.
+    :param latency: seconds added to every response.
+    :param error_rate: fraction of requests, other than auth, that fail with error_status.
+    """
+
+    def __init__(self, num_cases: int = 100, latency: float = 0.0, error_rate: float = 0.0, error_status: int = 503, seed: int = 0):
+        self.cases = {case["uuid"]: case for case in map(make_case, range(num_cases))}
+        self.case_data: dict[str, list[dict]] = {}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.request_counts = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._routes = [
+            ("POST", re.compile(r"/auth/password"), self.handle_auth),
+            ("GET", re.compile(r"/case"), self.handle_list_cases),
+            ("POST", re.compile(r"/case"), self.handle_create_case),
+            ("GET", re.compile(r"/case/(?P<case_uuid>[^/]+)"), self.handle_get_case),
+            ("PUT", re.compile(r"/case/(?P<case_uuid>[^/]+)"), self.handle_update_case),
+            ("POST", re.compile(r"/case/(?P<case_uuid>[^/]+)/tag"), self.handle_add_tag),
+            ("DELETE", re.compile(r"/case/(?P<case_uuid>[^/]+)/tag"), self.handle_delete_tag),
+            ("GET", re.compile(r"/case/(?P<case_uuid>[^/]+)/data"), self.handle_list_case_data),
+            ("POST", re.compile(r"/case/(?P<case_uuid>[^/]+)/data"), self.handle_create_case_data),
+        ]
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # send each response in one write, so keep-alive clients don't wait on delayed ACKs
+            disable_nagle_algorithm = True
+            wbufsize = -1
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server.dispatch(self)
+
+            do_POST = do_PUT = do_DELETE = do_GET
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def dispatch(self, request: BaseHTTPRequestHandler):
+        url = urlsplit(request.path)
+        length = int(request.headers.get("Content-Length") or 0)
+        body = json.loads(request.rfile.read(length)) if length else None
+        if self.latency:
+            time.sleep(self.latency)
+
+        for method, pattern, handler in self._routes:
+            match = pattern.fullmatch(url.path)
+            if method != request.command or not match:
+                continue
+            with self._lock:
+                self.request_counts[f"{method} {pattern.pattern}"] += 1
+                inject_error = handler != self.handle_auth and self._random.random() < self.error_rate
+            if inject_error:
+                return self.respond(request, self.error_status, {"error": "injected"})
+            if handler != self.handle_auth and not request.headers.get("x-cydarm-authz"):
+                return self.respond(request, 401, {"error": "unauthorized"})
+            status, resp_body, headers = handler(body=body, query=parse_qs(url.query), **match.groupdict())
+            return self.respond(request, status, resp_body, headers)
+        return self.respond(request, 404, {"error": "not found"})
+
+    @staticmethod
+    def respond(request: BaseHTTPRequestHandler, status: int, body, headers: Optional[dict] = None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def handle_auth(self, body, query):
+        return 200, None, {"Access-Token": make_token()}
+
+    def handle_list_cases(self, body, query):
+        page_number = int(query.get("page[number]", ["0"])[0])
+        page_size = int(query.get("page[size]", ["1000"])[0])
+        cases = list(self.cases.values())
+        if "filter[inc_tag]" in query:
+            tags = set(query["filter[inc_tag]"][0].split(","))
+            cases = [case for case in cases if tags & set(case["tags"])]
+            # reproduces the Cydarm bug with several tags in the filter and cases with several tags
+            if len(tags) > 1 and any(len(case["tags"]) > 1 for case in cases):
+                return 500, {"error": "internal server error"}, None
+        if "filter[text]" in query:
+            text = query["filter[text]"][0].lower()
+            cases = [case for case in cases if text in case["description"].lower()]
+
+        start = page_number * page_size
+        last_page_number = max((len(cases) - 1) // page_size, 0)
+        links = {"last": f"/case?page[number]={last_page_number}&page[size]={page_size}"}
+        if page_number < last_page_number:
+            links["next"] = f"/case?page[number]={page_number + 1}&page[size]={page_size}"
+        return 200, {"data": cases[start : start + page_size], "links": links, "meta": {"total": len(cases)}}, None
+
+    def handle_create_case(self, body, query):
+        with self._lock:
+            case = {**make_case(len(self.cases)), **body}
+            self.cases[case["uuid"]] = case
+        return 201, {"uuid": case["uuid"]}, None
+
+    def handle_get_case(self, body, query, case_uuid):
+        case = self.cases.get(case_uuid)
+        return (200, case, None) if case else (404, {"error": "not found"}, None)
+
+    def handle_update_case(self, body, query, case_uuid):
+        if case_uuid not in self.cases:
+            return 404, {"error": "not found"}, None
+        self.cases[case_uuid].update(body)
+        return 204, None, None
+
+    def handle_add_tag(self, body, query, case_uuid):
+        if case_uuid not in self.cases:
+            return 404, {"error": "not found"}, None
+        with self._lock:
+            tags = self.cases[case_uuid]["tags"]
+            if body["tagValue"] not in tags:
+                tags.append(body["tagValue"])
+        return 200, {}, None
+
+    def handle_delete_tag(self, body, query, case_uuid):
+        if case_uuid not in self.cases:
+            return 404, {"error": "not found"}, None
+        with self._lock:
+            tags = self.cases[case_uuid]["tags"]
+            if body["tagValue"] in tags:
+                tags.remove(body["tagValue"])
+        return 200, {}, None
+
+    def handle_list_case_data(self, body, query, case_uuid):
+        items = self.case_data.get(case_uuid, [])
+        if "page[size]" not in query:
+            return 200, {"case_data": items}, None
+        page_number = int(query.get("page[number]", ["0"])[0])
+        page_size = int(query["page[size]"][0])
+        start = page_number * page_size
+        links = {"next": f"/case/{case_uuid}/data?page[number]={page_number + 1}"} if start + page_size < len(items) else {}
+        return 200, {"case_data": items[start : start + page_size], "links": links}, None
+
+    def handle_create_case_data(self, body, query, case_uuid):
+        item = {"uuid": str(uuid.uuid4()), **body}
+        with self._lock:
+            self.case_data.setdefault(case_uuid, []).append(item)
+        return 201, {"uuid": item["uuid"]}, None
@@ -22,6 +22,8 @@ from random import randint
 import pytest
 
 from cydarm_api import CydarmAPI
+from cydarm_case_filter import TIME_FILTERS, CaseFilter
+from cydarm_ingest import parse_timestamp
 
 
 ACL_UUID = "e26a30a0-2b4e-4d39-a1d3-5fd0792e6f84"
@@ -85,6 +87,53 @@ def test_get_cases_filtered_1(cydarm_api_instance):
     assert "Citrix ADC and Citrix Gateway Security Bulletin for CVE-2022-27518" in case_descriptions
 
 
+def within_time_bound(field: str, earliest: bool):
+    def matches(case, sample) -> bool:
+        case_time, sample_time = parse_timestamp(case.get(field)), parse_timestamp(sample[field])
+        return case_time is not None and (case_time >= sample_time if earliest else case_time <= sample_time)
+
+    return matches
+
+
+# CaseFilter field -> (case field the filter value is taken from, whether a case matches the filter made from sample)
+CASE_FILTER_CHECKS = {
+    "statuses": ("status", lambda case, sample: case.get("status") == sample["status"]),
+    "statuses_excluded": ("status", lambda case, sample: case.get("status") != sample["status"]),
+    "severities": ("severity", lambda case, sample: case.get("severity") == sample["severity"]),
+    "assignees": ("assignee", lambda case, sample: case.get("assignee") == sample["assignee"]),
+    "orgs": ("org", lambda case, sample: case.get("org") == sample["org"]),
+    "created_from": ("created", within_time_bound("created", earliest=True)),
+    "created_to": ("created", within_time_bound("created", earliest=False)),
+    "modified_from": ("modified", within_time_bound("modified", earliest=True)),
+    "modified_to": ("modified", within_time_bound("modified", earliest=False)),
+}
+
+
+@pytest.mark.parametrize("filter_name", CASE_FILTER_CHECKS)
+def test_get_cases_filtered_narrows(cydarm_api_instance, filter_name):
+    # checks the filter matches the fields of real cases: it must drop some, but not all, of the unfiltered cases
+    field, matches = CASE_FILTER_CHECKS[filter_name]
+    cases = list(cydarm_api_instance.iter_cases_filtered(page_size=100, max_results=200))
+    # a case to take the filter value from, such that some of the cases don't match
+    sample = next((x for x in cases if x.get(field) and not all(matches(case, x) for case in cases)), None)
+    if sample is None:
+        pytest.skip(f"The first {len(cases)} cases can't show that {filter_name} narrows the results")
+
+    value = sample[field]
+    case_filter = CaseFilter(**{filter_name: value if filter_name in TIME_FILTERS else [value]})
+    filtered = list(cydarm_api_instance.iter_cases_filtered(page_size=100, max_results=200, case_filter=case_filter))
+    assert filtered
+    assert all(matches(case, sample) for case in filtered)
+
+
+def test_get_cases_filtered_sort(cydarm_api_instance):
+    case_filter = CaseFilter(sort=["-created"])
+    cases = list(cydarm_api_instance.iter_cases_filtered(page_size=50, max_results=50, case_filter=case_filter))
+    assert cases
+    created = [parse_timestamp(case["created"]) for case in cases]
+    assert created == sorted(created, reverse=True)
+
+
 def test_get_case_quick_search(cydarm_api_instance):
     cases = cydarm_api_instance.get_case_quick_search(search_string="CVE")
     assert len(cases) > 0
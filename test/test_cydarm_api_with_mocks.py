@@ -15,11 +15,22 @@
 #
 
 import base64
+import json
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
 
 from cydarm_api import CydarmAPI
+from cydarm_cache import TTLCache
+from cydarm_case_filter import CaseFilter
+from cydarm_retry import CircuitBreaker, CircuitOpenError, RetryPolicy
 
 
 BASE_URL = "mock://cydarm.com/api"
+# requests only encodes query params into http(s) URLs
+HTTPS_BASE_URL = "https://cydarm.com/api"
 USERNAME = "user"
 PASSWORD = "pass"  # pragma: allowlist secret
 BEARER_TOKEN = "bearer token jwt"
@@ -29,6 +40,13 @@ def as_b64_string(string) -> str:
     return base64.b64encode(string.encode("ascii")).decode("ascii")
 
 
+def make_jwt(exp: float) -> str:
+    def encode(obj) -> str:
+        return base64.urlsafe_b64encode(json.dumps(obj).encode()).decode().rstrip("=")
+
+    return f"{encode({'alg': 'HS256'})}.{encode({'exp': exp})}.signature"
+
+
 class TestGenerateBearerToken:
     def custom_matcher(self, request):
         # check json payload
@@ -78,3 +96,255 @@ class TestGetCase:
         )
         api = CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD, basic_auth_creds=("basic", "basic"))
         assert response_object == api.get_case(case_uuid="abc123")
+
+
+class TestBearerTokenCache:
+    def test_token_is_reused_across_calls(self, requests_mock):
+        auth = requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        requests_mock.get(f"{BASE_URL}/case/abc123", request_headers={"x-cydarm-authz": BEARER_TOKEN}, json={"uuid": "abc123"})
+
+        api = CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD)
+        api.get_case(case_uuid="abc123")
+        api.get_case(case_uuid="abc123")
+        assert auth.call_count == 1
+        assert api.bearer_token == BEARER_TOKEN
+
+    def test_cached_token_skips_auth(self, requests_mock):
+        token = make_jwt(time.time() + 3600)
+        auth = requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        requests_mock.get(f"{BASE_URL}/case/abc123", request_headers={"x-cydarm-authz": token}, json={"uuid": "abc123"})
+
+        api = CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD, bearer_token=token)
+        assert api.get_case(case_uuid="abc123") == {"uuid": "abc123"}
+        assert auth.call_count == 0
+
+    def test_token_near_expiry_is_refreshed(self, requests_mock):
+        new_token = make_jwt(time.time() + 3600)
+        auth = requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": new_token})
+        requests_mock.get(f"{BASE_URL}/case/abc123", request_headers={"x-cydarm-authz": new_token}, json={"uuid": "abc123"})
+
+        api = CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD, bearer_token=make_jwt(time.time() + 5))
+        api.get_case(case_uuid="abc123")
+        assert auth.call_count == 1
+        assert api.bearer_token == new_token
+
+    def test_retries_once_on_401(self, requests_mock):
+        auth = requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        case = requests_mock.get(
+            f"{BASE_URL}/case/abc123",
+            [{"status_code": 401}, {"json": {"uuid": "abc123"}}],
+        )
+
+        api = CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD, bearer_token="revoked token")
+        assert api.get_case(case_uuid="abc123") == {"uuid": "abc123"}
+        assert auth.call_count == 1
+        assert case.call_count == 2
+        assert case.last_request.headers["x-cydarm-authz"] == BEARER_TOKEN
+
+    def test_get_token_expiry(self):
+        assert CydarmAPI.get_token_expiry(make_jwt(1700000000)) == 1700000000
+        assert CydarmAPI.get_token_expiry(BEARER_TOKEN) is None
+
+
+class TestSession:
+    def test_session_is_reused_across_calls(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        requests_mock.get(f"{BASE_URL}/case/abc123", json={"uuid": "abc123"})
+
+        api = CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD)
+        api.get_case(case_uuid="abc123")
+        session = api.session
+        api.get_case(case_uuid="abc123")
+        assert api.session is session
+        assert session.get_adapter("https://xyz.cydarm.io")._pool_maxsize == api.pool_maxsize
+
+    def test_close_releases_session(self):
+        with CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD, pool_maxsize=4) as api:
+            session = api.session
+            assert session.get_adapter("https://xyz.cydarm.io")._pool_maxsize == 4
+        assert api._session is None
+        assert api.session is not session
+
+
+def mock_case_pages(requests_mock, num_cases, page_size, with_last_link=True):
+    def callback(request, context):
+        page_number = int(parse_qs(urlsplit(request.url).query)["page[number]"][0])
+        start = page_number * page_size
+        resp = {
+            "data": [{"uuid": f"case-{i}"} for i in range(start, min(start + page_size, num_cases))],
+            "links": {},
+        }
+        last_page_number = max((num_cases - 1) // page_size, 0)
+        if page_number < last_page_number:
+            resp["links"]["next"] = f"/case?page[number]={page_number + 1}&page[size]={page_size}"
+        if with_last_link:
+            resp["links"]["last"] = f"/case?page[number]={last_page_number}&page[size]={page_size}"
+        return resp
+
+    requests_mock.post(f"{HTTPS_BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+    return requests_mock.get(f"{HTTPS_BASE_URL}/case", json=callback)
+
+
+class TestGetCasesFiltered:
+    def test_sequential(self, requests_mock):
+        pages = mock_case_pages(requests_mock, num_cases=25, page_size=10, with_last_link=False)
+        api = CydarmAPI(base_url=HTTPS_BASE_URL, username=USERNAME, password=PASSWORD)
+        cases = api.get_cases_filtered(page_size=10)
+        assert [x["uuid"] for x in cases] == [f"case-{i}" for i in range(25)]
+        assert pages.call_count == 3
+
+    def test_concurrent_keeps_page_order(self, requests_mock):
+        pages = mock_case_pages(requests_mock, num_cases=95, page_size=10)
+        api = CydarmAPI(base_url=HTTPS_BASE_URL, username=USERNAME, password=PASSWORD)
+        cases = api.get_cases_filtered(page_size=10, max_workers=4)
+        assert [x["uuid"] for x in cases] == [f"case-{i}" for i in range(95)]
+        assert pages.call_count == 10
+
+    def test_concurrent_falls_back_to_sequential(self, requests_mock):
+        mock_case_pages(requests_mock, num_cases=25, page_size=10, with_last_link=False)
+        api = CydarmAPI(base_url=HTTPS_BASE_URL, username=USERNAME, password=PASSWORD)
+        assert len(api.get_cases_filtered(page_size=10, max_workers=4)) == 25
+
+    def test_get_last_page_number(self):
+        assert CydarmAPI.get_last_page_number({"links": {"last": "/case?page[number]=7&page[size]=10"}}, 10) == 7
+        assert CydarmAPI.get_last_page_number({"links": {}, "meta": {"total": 21}}, 10) == 2
+        assert CydarmAPI.get_last_page_number({"links": {"next": "/case?page[number]=1"}}, 10) is None
+
+
+class TestIterCasesFiltered:
+    def test_yields_all_cases(self, requests_mock):
+        mock_case_pages(requests_mock, num_cases=25, page_size=10, with_last_link=False)
+        api = CydarmAPI(base_url=HTTPS_BASE_URL, username=USERNAME, password=PASSWORD)
+        cases = api.iter_cases_filtered(page_size=10)
+        assert not isinstance(cases, list)
+        assert [x["uuid"] for x in cases] == [f"case-{i}" for i in range(25)]
+
+    def test_max_results_stops_paging(self, requests_mock):
+        pages = mock_case_pages(requests_mock, num_cases=100, page_size=10, with_last_link=False)
+        api = CydarmAPI(base_url=HTTPS_BASE_URL, username=USERNAME, password=PASSWORD)
+        cases = list(api.iter_cases_filtered(page_size=10, max_results=15))
+        assert [x["uuid"] for x in cases] == [f"case-{i}" for i in range(15)]
+        assert pages.call_count == 2
+
+    def test_max_results_with_concurrent_pages(self, requests_mock):
+        mock_case_pages(requests_mock, num_cases=100, page_size=10)
+        api = CydarmAPI(base_url=HTTPS_BASE_URL, username=USERNAME, password=PASSWORD)
+        cases = list(api.iter_cases_filtered(page_size=10, max_workers=3, max_results=35))
+        assert [x["uuid"] for x in cases] == [f"case-{i}" for i in range(35)]
+
+    def test_case_filter_applied_client_side(self, requests_mock):
+        cases = [{"uuid": f"case-{i}", "severity": i % 5 + 1, "created": f"2024-01-01T00:{i:02d}:00Z"} for i in range(20)]
+        requests_mock.post(f"{HTTPS_BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        pages = requests_mock.get(f"{HTTPS_BASE_URL}/case", json={"data": cases, "links": {}})
+        api = CydarmAPI(base_url=HTTPS_BASE_URL, username=USERNAME, password=PASSWORD)
+        case_filter = CaseFilter(severities=[1, 2], created_to="2024-01-01T00:10:00Z", sort=["-severity", "created"])
+        filtered = list(api.iter_cases_filtered(filter_text="phish", max_results=3, case_filter=case_filter))
+        assert [x["uuid"] for x in filtered] == ["case-1", "case-6", "case-0"]
+        # only the filters Cydarm is known to support are sent
+        assert set(parse_qs(urlsplit(pages.last_request.url).query)) == {"page[number]", "page[size]", "filter[text]"}
+
+
+class TestReferenceCache:
+    def test_reference_objects_are_cached(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        user = requests_mock.get(f"{BASE_URL}/user/abc123", json={"uuid": "abc123"})
+
+        api = CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD, reference_cache=TTLCache())
+        assert api.get_user(user_uuid="abc123") == {"uuid": "abc123"}
+        assert api.get_user(user_uuid="abc123") == {"uuid": "abc123"}
+        assert user.call_count == 1
+
+    def test_add_action_to_playbook_invalidates_playbook(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        playbook = requests_mock.get(f"{BASE_URL}/playbook/pb1", json={"atc": {"uuid": "pb1", "actions": []}})
+        requests_mock.post(f"{BASE_URL}/playbook/pb1/playbook-action/act1", status_code=201)
+
+        api = CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD, reference_cache=TTLCache())
+        api.get_playbook(playbook_uuid="pb1")
+        api.add_action_to_playbook(playbook_uuid="pb1", action_uuid="act1")
+        api.get_playbook(playbook_uuid="pb1")
+        assert playbook.call_count == 2
+
+    def test_add_action_to_playbook_drops_playbook_cached_during_request(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        playbook = requests_mock.get(f"{BASE_URL}/playbook/pb1", json={"atc": {"uuid": "pb1", "actions": []}})
+        api = CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD, reference_cache=TTLCache())
+
+        def get_playbook_concurrently(request, context):
+            # another thread reads the playbook before the action is added
+            api.get_playbook(playbook_uuid="pb1")
+            context.status_code = 201
+            return ""
+
+        requests_mock.post(f"{BASE_URL}/playbook/pb1/playbook-action/act1", text=get_playbook_concurrently)
+        api.add_action_to_playbook(playbook_uuid="pb1", action_uuid="act1")
+        api.get_playbook(playbook_uuid="pb1")
+        assert playbook.call_count == 2
+
+
+class TestConditionalGet:
+    def test_not_modified_serves_cached_body(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        case = requests_mock.get(
+            f"{BASE_URL}/case/abc123",
+            [
+                {"json": {"uuid": "abc123"}, "headers": {"ETag": '"v1"', "Last-Modified": "Wed, 21 Oct 2026 07:28:00 GMT"}},
+                {"status_code": 304},
+            ],
+        )
+
+        api = CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD, validator_cache=TTLCache(ttl=None))
+        assert api.get_case(case_uuid="abc123") == {"uuid": "abc123"}
+        assert api.get_case(case_uuid="abc123") == {"uuid": "abc123"}
+        assert case.last_request.headers["If-None-Match"] == '"v1"'
+        assert case.last_request.headers["If-Modified-Since"] == "Wed, 21 Oct 2026 07:28:00 GMT"
+
+    def test_unchanged_body_is_not_parsed_again(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        requests_mock.get(f"{BASE_URL}/case/abc123", json={"uuid": "abc123"})
+
+        api = CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD, validator_cache=TTLCache(ttl=None))
+        first = api.get_case(case_uuid="abc123")
+        assert api.get_case(case_uuid="abc123") is first
+
+    def test_changed_body_is_returned(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        requests_mock.get(f"{BASE_URL}/case/abc123/playbook", [{"json": [{"playbookName": "a"}]}, {"json": [{"playbookName": "b"}]}])
+
+        api = CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD, validator_cache=TTLCache(ttl=None))
+        assert api.get_case_playbooks(case_uuid="abc123") == [{"playbookName": "a"}]
+        assert api.get_case_playbooks(case_uuid="abc123") == [{"playbookName": "b"}]
+
+
+class TestRetries:
+    def test_get_is_retried_after_retry_after(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        case = requests_mock.get(
+            f"{BASE_URL}/case/abc123",
+            [{"status_code": 503, "headers": {"Retry-After": "0"}}, {"status_code": 502}, {"json": {"uuid": "abc123"}}],
+        )
+
+        api = CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD, retry_policy=RetryPolicy(backoff_base=0.001))
+        assert api.get_case(case_uuid="abc123") == {"uuid": "abc123"}
+        assert case.call_count == 3
+
+    def test_post_is_not_retried(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        tag = requests_mock.post(f"{BASE_URL}/case/abc123/tag", status_code=503)
+
+        api = CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD, retry_policy=RetryPolicy(backoff_base=0.001))
+        with pytest.raises(requests.HTTPError):
+            api.add_case_tag(case_uuid="abc123", tag_value="testing")
+        assert tag.call_count == 1
+
+    def test_circuit_breaker_fails_fast(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        case = requests_mock.get(f"{BASE_URL}/case/abc123", status_code=502)
+
+        api = CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD, circuit_breaker=CircuitBreaker(failure_threshold=2))
+        for _ in range(2):
+            with pytest.raises(requests.HTTPError):
+                api.get_case(case_uuid="abc123")
+        with pytest.raises(CircuitOpenError):
+            api.get_case(case_uuid="abc123")
+        assert case.call_count == 2
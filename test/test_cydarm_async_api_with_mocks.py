@@ -0,0 +1,167 @@
+# File: test_cydarm_async_api_with_mocks.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import asyncio
+import threading
+import time
+
+from cydarm_api import CydarmAPI
+from cydarm_async_api import AsyncCydarmAPI
+
+
+BASE_URL = "mock://cydarm.com/api"
+USERNAME = "user"
+PASSWORD = "pass"  # pragma: allowlist secret
+BEARER_TOKEN = "bearer token jwt"
+
+
+class TestAsyncCydarmAPI:
+    def test_get_cases_concurrently_with_one_token(self, requests_mock):
+        auth = requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        for i in range(20):
+            requests_mock.get(f"{BASE_URL}/case/case-{i}", request_headers={"x-cydarm-authz": BEARER_TOKEN}, json={"uuid": f"case-{i}"})
+
+        async def get_cases():
+            async with AsyncCydarmAPI(CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD), max_concurrency=5) as api:
+                return await api.gather(*[api.get_case(f"case-{i}") for i in range(20)])
+
+        cases = asyncio.run(get_cases())
+        assert [x["uuid"] for x in cases] == [f"case-{i}" for i in range(20)]
+        assert auth.call_count == 1
+
+    def test_failed_calls_are_returned_as_exceptions(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        requests_mock.get(f"{BASE_URL}/case/good", json={"uuid": "good"})
+        requests_mock.get(f"{BASE_URL}/case/bad", status_code=404)
+
+        async def get_cases():
+            async with AsyncCydarmAPI(CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD)) as api:
+                return await api.gather(api.get_case("good"), api.get_case("bad"))
+
+        good, bad = asyncio.run(get_cases())
+        assert good == {"uuid": "good"}
+        assert isinstance(bad, Exception)
+
+    def test_quick_search_hydrated_keeps_rank_order(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        hits = [{"uuid": f"case-{i}", "acl": "acl", "rank": 10 - i} for i in range(5)]
+        requests_mock.post(f"{BASE_URL}/case/quick-search", json=hits)
+        for i in range(5):
+            if i == 1:
+                requests_mock.get(f"{BASE_URL}/case/case-{i}", status_code=403)
+            else:
+                requests_mock.get(f"{BASE_URL}/case/case-{i}", json={"uuid": f"case-{i}", "description": f"case {i}"})
+
+        async def search():
+            async with AsyncCydarmAPI(CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD)) as api:
+                return await api.get_case_quick_search_hydrated("phishing", max_results=3)
+
+        found, cases = asyncio.run(search())
+        assert found == hits[:3]
+        assert cases[0] == {"uuid": "case-0", "description": "case 0", "rank": 10}
+        assert isinstance(cases[1], Exception)
+        assert cases[2]["rank"] == 8
+        assert not requests_mock.request_history[-1].url.endswith("case-3")
+
+    def test_case_playbook_tree_fetches_each_action_once(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        requests_mock.get(f"{BASE_URL}/case/c1", json={"uuid": "c1", "totalActionsInAllPlaybooks": 5, "totalCompletedActionsInAllPlaybooks": 2})
+        requests_mock.get(
+            f"{BASE_URL}/case/c1/playbook",
+            json=[
+                {"casePlaybookUuid": "cp1", "caseUuid": "c1", "playbookName": "Phishing"},
+                {"casePlaybookUuid": "cp2", "caseUuid": "c1", "playbookName": "Malware", "action_statuses": []},
+            ],
+        )
+        requests_mock.get(
+            f"{BASE_URL}/case/c1/playbook/cp1",
+            json={
+                "casePlaybookUuid": "cp1",
+                "caseUuid": "c1",
+                "playbookName": "Phishing",
+                "playbookDescription": "Respond to a phishing email",
+                "action_statuses": [
+                    {"actionName": "Triage", "actionInstanceUuid": "ai1"},
+                    {"actionName": "Triage", "actionInstanceUuid": "ai1"},
+                    {"actionName": "Contain", "actionInstanceUuid": "ai2"},
+                    {"actionName": "Eradicate", "actionInstanceUuid": "ai3"},
+                ],
+            },
+        )
+        requests_mock.get(f"{BASE_URL}/case/c1/playbook/cp2", status_code=500)
+        action = requests_mock.get(f"{BASE_URL}/playbook-action/ai1", json={"atc": {"uuid": "ai1", "description": "Triage the email"}})
+        requests_mock.get(f"{BASE_URL}/playbook-action/ai2", json={"atc": {"uuid": "ai2", "description": "Block the sender"}})
+        requests_mock.get(f"{BASE_URL}/playbook-action/ai3", status_code=404)
+
+        async def get_tree():
+            async with AsyncCydarmAPI(CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD)) as api:
+                return await api.get_case_playbook_tree("c1")
+
+        tree, errors = asyncio.run(get_tree())
+        assert action.call_count == 1
+        assert set(errors) == {"cp2", "ai3"}
+        cp1, cp2 = tree["playbooks"]
+        assert [status["action"] and status["action"]["atc"]["uuid"] for status in cp1["action_statuses"]] == ["ai1", "ai1", "ai2", None]
+        assert cp1["total_actions"] == 4
+        # the failed instance falls back to its entry in the case's playbook list
+        assert cp2 == {"casePlaybookUuid": "cp2", "caseUuid": "c1", "playbookName": "Malware", "action_statuses": [], "total_actions": 0}
+        # the counts are the case's, not recounted from the statuses
+        assert (tree["totalActionsInAllPlaybooks"], tree["totalCompletedActionsInAllPlaybooks"]) == (5, 2)
+
+    def test_case_playbook_tree_without_case(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+        requests_mock.get(f"{BASE_URL}/case/c1", status_code=503)
+        requests_mock.get(f"{BASE_URL}/case/c1/playbook", json=[])
+
+        async def get_tree():
+            async with AsyncCydarmAPI(CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD)) as api:
+                return await api.get_case_playbook_tree("c1")
+
+        tree, errors = asyncio.run(get_tree())
+        assert set(errors) == {"c1"}
+        assert tree == {"caseUuid": "c1", "playbooks": [], "totalActionsInAllPlaybooks": None, "totalCompletedActionsInAllPlaybooks": None}
+
+    def test_concurrency_is_bounded(self):
+        lock = threading.Lock()
+        in_flight = 0
+        max_in_flight = 0
+
+        def slow_call():
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+
+        async def run():
+            async with AsyncCydarmAPI(CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD), max_concurrency=3) as api:
+                await api.gather(*[api.call(slow_call) for _ in range(12)])
+
+        asyncio.run(run())
+        assert max_in_flight == 3
+
+    def test_rate_limit_spaces_out_calls(self):
+        start_times = []
+
+        async def run():
+            async with AsyncCydarmAPI(CydarmAPI(base_url=BASE_URL, username=USERNAME, password=PASSWORD), rate_limit=50) as api:
+                await api.gather(*[api.call(lambda: start_times.append(time.monotonic())) for _ in range(6)])
+
+        asyncio.run(run())
+        # 6 calls at 50/s need at least 5 gaps of 20ms
+        assert max(start_times) - min(start_times) >= 0.09
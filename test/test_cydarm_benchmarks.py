@@ -0,0 +1,109 @@
+# File: test_cydarm_benchmarks.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+"""
+Benchmarks against MockCydarmServer. Requires pytest-benchmark, installed with the other test requirements:
+
+    pip install -r test/requirements.txt
+    pytest test/test_cydarm_benchmarks.py --benchmark-columns=mean,max,ops
+
+Each benchmark also reports its throughput, and the peak memory allocated by one extra untimed round, in the
+'extra_info' of the results.
+"""
+
+import asyncio
+import tracemalloc
+from typing import Callable
+
+import pytest
+from mock_cydarm_server import MockCydarmServer
+
+from cydarm_api import CydarmAPI
+from cydarm_async_api import AsyncCydarmAPI
+
+
+pytest.importorskip("pytest_benchmark")
+
+USERNAME = "user"
+PASSWORD = "pass"  # pragma: allowlist secret
+# simulated network round trip
+LATENCY = 0.002
+
+
+def get_peak_memory_mb(func: Callable) -> float:
+    """
+    Peak Python memory allocated while func runs, including by MockCydarmServer to serve it. Measured on a separate
+    call, as tracing allocations would slow down the timed rounds; unlike the process's peak RSS, it is not carried
+    over from earlier benchmarks.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if was_tracing:
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        func()
+        return (tracemalloc.get_traced_memory()[1] - baseline) / (1024 * 1024)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def record_throughput(benchmark, num_items: int, func: Callable):
+    if benchmark.stats is None:
+        # with --benchmark-disable, func ran once untimed and nothing is reported
+        return
+    benchmark.extra_info["items"] = num_items
+    benchmark.extra_info["items_per_second"] = round(num_items / benchmark.stats.stats.mean, 1)
+    benchmark.extra_info["peak_memory_mb"] = round(get_peak_memory_mb(func), 1)
+
+
+@pytest.mark.parametrize("max_workers", [1, 8])
+@pytest.mark.parametrize("num_cases", [1_000, 10_000, 100_000])
+def test_get_cases_filtered(benchmark, num_cases, max_workers):
+    with MockCydarmServer(num_cases=num_cases, latency=LATENCY) as server, CydarmAPI(server.base_url, USERNAME, PASSWORD) as api:
+        cases = benchmark.pedantic(api.get_cases_filtered, kwargs={"max_workers": max_workers}, rounds=3, warmup_rounds=1)
+        assert len(cases) == num_cases
+        del cases
+        record_throughput(benchmark, num_cases, lambda: api.get_cases_filtered(max_workers=max_workers))
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 10])
+def test_bulk_add_case_tags(benchmark, max_concurrency):
+    num_cases = 500
+    with MockCydarmServer(num_cases=num_cases, latency=LATENCY) as server, CydarmAPI(server.base_url, USERNAME, PASSWORD) as api:
+
+        async def add_tags():
+            async with AsyncCydarmAPI(api, max_concurrency=max_concurrency) as async_api:
+                return await async_api.gather(*[async_api.add_case_tag(case_uuid, "benchmark") for case_uuid in server.cases])
+
+        results = benchmark.pedantic(lambda: asyncio.run(add_tags()), rounds=3)
+        assert not [result for result in results if isinstance(result, Exception)]
+        record_throughput(benchmark, num_cases, lambda: asyncio.run(add_tags()))
+
+
+def test_generate_bearer_token(benchmark):
+    with MockCydarmServer(latency=LATENCY) as server, CydarmAPI(server.base_url, USERNAME, PASSWORD) as api:
+        assert benchmark(api.generate_bearer_token)
+        record_throughput(benchmark, 1, api.generate_bearer_token)
+
+
+def test_cached_bearer_token(benchmark):
+    with MockCydarmServer(latency=LATENCY) as server, CydarmAPI(server.base_url, USERNAME, PASSWORD) as api:
+        api.get_bearer_token()
+        assert benchmark(api.get_bearer_token)
+        record_throughput(benchmark, 1, api.get_bearer_token)
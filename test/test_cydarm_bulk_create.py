@@ -0,0 +1,52 @@
+# File: test_cydarm_bulk_create.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import json
+
+import pytest
+
+from cydarm_bulk_create import iter_case_rows, validate_case_row
+
+
+CASE = {"description": "Phishing", "org": "Acme", "deletable": True, "editable": True, "manageable": True, "readable": True}
+
+
+class TestBulkCreate:
+    def test_rows_from_json_lines_file(self, tmp_path):
+        path = tmp_path / "cases.jsonl"
+        path.write_text(f"{json.dumps(CASE)}\n\n{{not json\n{json.dumps(CASE)}\n")
+        rows = list(iter_case_rows(path))
+        assert [row_num for row_num, _ in rows] == [1, 3, 4]
+        assert rows[0][1] == CASE
+        assert isinstance(rows[1][1], ValueError)
+
+    def test_rows_from_json_array(self):
+        assert list(iter_case_rows(json.dumps([CASE, CASE]))) == [(1, CASE), (2, CASE)]
+        with pytest.raises(ValueError):
+            list(iter_case_rows(json.dumps(CASE)))
+
+    def test_validate_parses_json_fields(self):
+        kwargs = validate_case_row({**CASE, "tags": '["a", "b"]', "metadata": {"k": {"value": "v"}}, "severity": 2})
+        assert kwargs["tags"] == ["a", "b"]
+        assert kwargs["metadata"] == {"k": {"value": "v"}}
+
+    def test_validate_reports_every_problem(self):
+        row = {**CASE, "severity": 9, "readable": "yes", "colour": "red"}
+        del row["org"]
+        with pytest.raises(ValueError) as e:
+            validate_case_row(row)
+        for problem in ("unknown field 'colour'", "missing required field 'org'", "'readable' must be a boolean", "'severity' must be 1 to 5"):
+            assert problem in str(e.value)
@@ -0,0 +1,59 @@
+# File: test_cydarm_cache.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import time
+
+from cydarm_cache import TTLCache
+
+
+class TestTTLCache:
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_entries_expire(self):
+        cache = TTLCache(ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_invalidate(self):
+        cache = TTLCache()
+        cache.set("a", 1)
+        cache.invalidate("a")
+        assert "a" not in cache
+
+    def test_round_trip(self):
+        cache = TTLCache()
+        cache.set("a", {"uuid": "a"})
+        restored = TTLCache()
+        restored.load(cache.to_dict())
+        assert restored.get("a") == {"uuid": "a"}
+
+    def test_load_respects_lower_ttl(self):
+        cache = TTLCache(ttl=3600)
+        cache.set("a", 1)
+        restored = TTLCache(ttl=0.01)
+        restored.load(cache.to_dict())
+        time.sleep(0.02)
+        assert restored.get("a") is None
@@ -0,0 +1,85 @@
+# File: test_cydarm_case_data.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import base64
+
+import pytest
+
+from cydarm_api import CydarmAPI
+from cydarm_case_data import get_data_size, matches_case_data, prepare_case_data
+
+
+HTTPS_BASE_URL = "https://cydarm.com/api"
+
+
+def make_item(data: bytes, mime_type="text/plain", significance="Comment", uuid="item") -> dict:
+    return {"uuid": uuid, "data": base64.b64encode(data).decode(), "mimeType": mime_type, "significance": significance}
+
+
+class TestCaseData:
+    @pytest.mark.parametrize("size", [0, 1, 2, 3, 4, 100])
+    def test_data_size(self, size):
+        assert get_data_size(make_item(b"x" * size)) == size
+
+    def test_matches(self):
+        item = make_item(b"", mime_type="image/png; name=x.png", significance="Evidence")
+        assert matches_case_data(item)
+        assert matches_case_data(item, significances=["evidence"], mime_types=["image/*"])
+        assert matches_case_data(item, mime_types=["text/plain", "image/png"])
+        assert not matches_case_data(item, significances=["Comment"])
+        assert not matches_case_data(item, mime_types=["text/*"])
+
+    def test_decode_only_text(self):
+        text = "ünïcödé note"
+        assert prepare_case_data(make_item(text.encode()), decode=True)["decoded_data"] == text
+        assert "decoded_data" not in prepare_case_data(make_item(text.encode()))
+        assert "decoded_data" not in prepare_case_data(make_item(b"\x89PNG", mime_type="image/png"), decode=True)
+
+    def test_truncate(self):
+        item = prepare_case_data(make_item("ä".encode() * 10), decode=True, max_size=7)
+        assert item["data_size"] == 20
+        assert item["data_truncated"]
+        assert base64.b64decode(item["data"]) == "ä".encode() * 3
+        assert item["decoded_data"] == "äää"
+        assert not prepare_case_data(make_item(b"abc"), max_size=3)["data_truncated"]
+
+
+class TestIterCaseData:
+    def test_pages_and_filters(self, requests_mock):
+        items = [make_item(f"item {i}".encode(), significance="Comment" if i % 2 else "Evidence", uuid=f"item-{i}") for i in range(7)]
+
+        def callback(request, context):
+            page_number = int(request.qs["page[number]"][0])
+            page_size = int(request.qs["page[size]"][0])
+            resp = {"case_data": items[page_number * page_size : (page_number + 1) * page_size], "links": {}}
+            if (page_number + 1) * page_size < len(items):
+                resp["links"]["next"] = "/case/abc/data"
+            return resp
+
+        pages = requests_mock.get(f"{HTTPS_BASE_URL}/case/abc/data", json=callback)
+        api = CydarmAPI(base_url=HTTPS_BASE_URL, username="user", password="pass", bearer_token="token")  # pragma: allowlist secret
+        result = list(api.iter_case_data("abc", page_size=3, significances=["Comment"], decode=True))
+        assert [x["uuid"] for x in result] == ["item-1", "item-3", "item-5"]
+        assert [x["decoded_data"] for x in result] == ["item 1", "item 3", "item 5"]
+        assert pages.call_count == 3
+
+        assert len(list(api.iter_case_data("abc", page_size=3, max_results=2))) == 2
+        assert pages.call_count == 4
+
+    def test_unpaginated_response(self, requests_mock):
+        requests_mock.get(f"{HTTPS_BASE_URL}/case/abc/data", json={"case_data": [make_item(b"x")]})
+        api = CydarmAPI(base_url=HTTPS_BASE_URL, username="user", password="pass", bearer_token="token")  # pragma: allowlist secret
+        assert len(list(api.iter_case_data("abc"))) == 1
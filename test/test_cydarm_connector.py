@@ -0,0 +1,408 @@
+# File: test_cydarm_connector.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from phantom.action_result import ActionResult
+
+import cydarm_connector
+from cydarm_bulk_create import iter_case_rows
+from cydarm_connector import BulkResult, CydarmConnector
+from cydarm_deadline import DeadlineExceededError
+from cydarm_ingest import SWEEP_SKEW, parse_timestamp
+
+
+# requests only encodes query params into http(s) URLs
+BASE_URL = "https://cydarm.com/api"
+BEARER_TOKEN = "bearer token jwt"
+
+
+@pytest.fixture
+def connector(requests_mock, tmp_path):
+    requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": BEARER_TOKEN})
+    connector = CydarmConnector()
+    connector.asset_config = {"cydarm_api_base_url": BASE_URL, "cydarm_username": "user", "cydarm_password": "pass"}  # pragma: allowlist secret
+    connector.state_dir = str(tmp_path)
+    connector.initialize()
+    yield connector
+    connector.finalize()
+
+
+def run_action(connector, action_id: str, param: dict) -> ActionResult:
+    connector.action_id = action_id
+    connector.handle_action(param)
+    return connector.action_results[-1]
+
+
+def make_case_row(description, **fields):
+    return {"description": description, "org": "Cydarm", "deletable": True, "editable": True, "manageable": True, "readable": True, **fields}
+
+
+def make_case(uuid, modified):
+    return {"uuid": uuid, "modified": modified, "description": f"Case {uuid}", "severity": 3}
+
+
+class TestBulkResult:
+    def test_from_results(self):
+        bulk_result = BulkResult.from_results(["a", "b", "c"], [{"uuid": "a"}, ValueError("bad tag"), DeadlineExceededError("deadline")])
+        assert bulk_result.data == [{"uuid": "a"}]
+        assert bulk_result.errors == {"b": "bad tag", "c": "deadline"}
+        assert bulk_result.partial
+
+    def test_partial_summary(self, connector):
+        action_result = ActionResult()
+        bulk_result = BulkResult(data=[{"uuid": "a"}], errors={"b": "deadline"}, partial=True, summary={"rate_limited": 2})
+        assert connector.generate_bulk_action_result(action_result, bulk_result)
+        assert action_result.summary == {
+            "rate_limited": 2,
+            "total_objects": 2,
+            "total_objects_successful": 1,
+            "total_objects_failed": 1,
+            "errors": {"b": "deadline"},
+            "partial_results": True,
+        }
+        assert action_result.message == "1 succeeded, 1 failed (action deadline reached)"
+
+    def test_all_failed(self, connector):
+        action_result = ActionResult()
+        assert not connector.generate_bulk_action_result(action_result, BulkResult(errors={"a": "not found", "b": "not found"}))
+        assert action_result.summary["total_objects_failed"] == 2
+        assert action_result.message == "All 2 operations failed"
+
+
+class TestParseListParam:
+    def test_comma_separated(self):
+        assert CydarmConnector.parse_list_param(" phishing, sev1,,phishing ") == ["phishing", "sev1"]
+
+    def test_json_array(self):
+        # items of a JSON array may contain commas
+        assert CydarmConnector.parse_list_param('["phishing, spear", "sev1"]') == ["phishing, spear", "sev1"]
+
+    def test_invalid_json_array(self):
+        with pytest.raises(ValueError):
+            CydarmConnector.parse_list_param('["phishing"')
+
+    def test_list(self):
+        assert CydarmConnector.parse_list_param(["a", 1]) == ["a", "1"]
+
+
+class TestGetCases:
+    def test_errors_reported_per_case(self, connector, requests_mock):
+        requests_mock.get(f"{BASE_URL}/case/a", json={"uuid": "a"})
+        requests_mock.get(f"{BASE_URL}/case/b", status_code=404, json={"error": "not found"})
+        action_result = run_action(connector, "get_cases", {"case_uuids": "a, b, a"})
+        # a repeated UUID is fetched once
+        assert sorted(x.path for x in requests_mock.request_history if x.method == "GET") == ["/api/case/a", "/api/case/b"]
+        assert action_result.status
+        assert action_result.data == [{"uuid": "a"}]
+        assert list(action_result.summary["errors"]) == ["b"]
+        assert (action_result.summary["total_objects"], action_result.summary["total_objects_failed"]) == (2, 1)
+        assert action_result.message == "1 succeeded, 1 failed"
+
+    def test_all_failed(self, connector, requests_mock):
+        requests_mock.get(f"{BASE_URL}/case/a", status_code=404, json={"error": "not found"})
+        action_result = run_action(connector, "get_cases", {"case_uuids": '["a"]'})
+        assert not action_result.status
+        assert action_result.message == "All 1 operations failed"
+
+
+class TestBulkCaseTags:
+    @pytest.fixture
+    def calls(self, connector, monkeypatch):
+        calls = []
+
+        def record_calls(name):
+            def func(case_uuid, tag_value):
+                calls.append((name, case_uuid, tag_value))
+                if tag_value == "bad":
+                    raise ValueError(f"Can't update {tag_value} on {case_uuid}")
+                return {}
+
+            return func
+
+        for name in ("add_case_tag", "delete_case_tag"):
+            monkeypatch.setattr(connector.cydarm, name, record_calls(name))
+        return calls
+
+    @pytest.mark.parametrize("action_id, name", [("bulk_add_case_tags", "add_case_tag"), ("bulk_delete_case_tags", "delete_case_tag")])
+    def test_every_tag_on_every_case(self, connector, calls, action_id, name):
+        action_result = run_action(connector, action_id, {"case_uuids": "c1, c2", "tag_values": '["t1", "t2"]'})
+        assert sorted(calls) == [(name, "c1", "t1"), (name, "c1", "t2"), (name, "c2", "t1"), (name, "c2", "t2")]
+        assert action_result.status
+        assert action_result.data == [
+            {"case_uuid": "c1", "tag_value": "t1"},
+            {"case_uuid": "c1", "tag_value": "t2"},
+            {"case_uuid": "c2", "tag_value": "t1"},
+            {"case_uuid": "c2", "tag_value": "t2"},
+        ]
+        assert (action_result.summary["total_objects"], action_result.summary["total_objects_successful"]) == (4, 4)
+
+    def test_failed_pairs(self, connector, calls):
+        action_result = run_action(connector, "bulk_add_case_tags", {"case_uuids": "c1, c2", "tag_values": "t1, bad"})
+        assert action_result.status
+        assert action_result.summary["errors"] == {"c1:bad": "Can't update bad on c1", "c2:bad": "Can't update bad on c2"}
+        assert (action_result.summary["total_objects_successful"], action_result.summary["total_objects_failed"]) == (2, 2)
+        assert action_result.message == "2 succeeded, 2 failed"
+
+    def test_all_failed(self, connector, calls):
+        action_result = run_action(connector, "bulk_delete_case_tags", {"case_uuids": "c1", "tag_values": "bad"})
+        assert not action_result.status
+        assert action_result.message == "All 1 operations failed"
+
+
+class TestGetCasePlaybookTree:
+    def test_tree(self, connector, requests_mock):
+        requests_mock.get(f"{BASE_URL}/case/c1", json={"uuid": "c1", "totalActionsInAllPlaybooks": 3, "totalCompletedActionsInAllPlaybooks": 1})
+        requests_mock.get(f"{BASE_URL}/case/c1/playbook", json=[{"casePlaybookUuid": "cp1", "caseUuid": "c1", "playbookName": "Phishing"}])
+        requests_mock.get(
+            f"{BASE_URL}/case/c1/playbook/cp1",
+            json={
+                "casePlaybookUuid": "cp1",
+                "caseUuid": "c1",
+                "playbookName": "Phishing",
+                "action_statuses": [
+                    {"actionName": "Triage", "actionInstanceUuid": "ai1"},
+                    {"actionName": "Contain", "actionInstanceUuid": "ai2"},
+                    {"actionName": "Eradicate", "actionInstanceUuid": "ai3"},
+                ],
+            },
+        )
+        requests_mock.get(f"{BASE_URL}/playbook-action/ai1", json={"atc": {"uuid": "ai1"}})
+        requests_mock.get(f"{BASE_URL}/playbook-action/ai2", json={"atc": {"uuid": "ai2"}})
+        requests_mock.get(f"{BASE_URL}/playbook-action/ai3", status_code=404)
+        action_result = run_action(connector, "get_case_playbook_tree", {"case_uuid": "c1"})
+        assert action_result.status
+        [tree] = action_result.data
+        assert [status["actionName"] for status in tree["playbooks"][0]["action_statuses"]] == ["Triage", "Contain", "Eradicate"]
+        assert list(action_result.summary["errors"]) == ["ai3"]
+        assert (
+            action_result.summary["total_playbooks"],
+            action_result.summary["total_actions"],
+            action_result.summary["total_completed_actions"],
+        ) == (1, 3, 1)
+
+
+class TestGetCaseQuickSearch:
+    def test_max_results(self, connector, requests_mock):
+        requests_mock.post(f"{BASE_URL}/case/quick-search", json=[{"uuid": "a", "rank": 1}, {"uuid": "b", "rank": 2}])
+        action_result = run_action(connector, "get_case_quick_search", {"search_string": "CVE", "max_results": 1})
+        assert action_result.data == [{"uuid": "a", "rank": 1}]
+
+    @pytest.mark.parametrize("hydrate", [False, True])
+    def test_hits_not_a_list(self, connector, requests_mock, hydrate):
+        requests_mock.post(f"{BASE_URL}/case/quick-search", json={"error": "search index unavailable"})
+        with pytest.raises(ValueError, match="Expected a list of hits"):
+            run_action(connector, "get_case_quick_search", {"search_string": "CVE", "hydrate": hydrate})
+
+
+class TestGetCasesFiltered:
+    @pytest.fixture
+    def calls(self, connector, monkeypatch):
+        calls = []
+
+        def record_calls(name):
+            def func(**kwargs):
+                calls.append((name, kwargs))
+                return iter([])
+
+            return func
+
+        for name in ("iter_cases_filtered", "iter_cases_by_tags"):
+            monkeypatch.setattr(connector.cydarm, name, record_calls(name))
+        return calls
+
+    def test_json_array_of_tags(self, connector, calls):
+        run_action(connector, "get_cases_filtered", {"tags_included": '["phishing", "sev1"]'})
+        name, kwargs = calls[0]
+        assert name == "iter_cases_by_tags"
+        assert kwargs["tags_included"] == ["phishing", "sev1"]
+
+    def test_comma_separated_tags(self, connector, calls):
+        run_action(connector, "get_cases_filtered", {"tags_included": "phishing, sev1", "tags_required": "open"})
+        name, kwargs = calls[0]
+        assert name == "iter_cases_by_tags"
+        assert (kwargs["tags_included"], kwargs["tags_required"]) == (["phishing", "sev1"], ["open"])
+
+    def test_excluded_tags(self, connector, calls):
+        run_action(connector, "get_cases_filtered", {"tags_included": "phishing", "tags_excluded": "closed", "status": "Open"})
+        name, kwargs = calls[0]
+        assert name == "iter_cases_by_tags"
+        assert (kwargs["tags_included"], kwargs["tags_excluded"], kwargs["case_filter"].statuses) == (["phishing"], ["closed"], ["Open"])
+
+    def test_one_tag(self, connector, calls):
+        run_action(connector, "get_cases_filtered", {"tags_included": '["phishing"]', "max_results": "5"})
+        name, kwargs = calls[0]
+        assert name == "iter_cases_filtered"
+        assert (kwargs["tags_included"], kwargs["max_results"]) == ("phishing", 5)
+
+
+class TestOnPoll:
+    @pytest.fixture
+    def cases(self, connector, monkeypatch):
+        cases = []
+        monkeypatch.setattr(connector.cydarm, "iter_cases_filtered", lambda **kwargs: iter(list(cases)))
+        return cases
+
+    def test_watermark_advances(self, connector, cases):
+        cases += [make_case("a", "2024-05-01T10:00:00Z"), make_case("b", "2024-05-01T11:00:00Z")]
+        action_result = run_action(connector, "on_poll", {})
+        assert action_result.status
+        assert [x["source_data_identifier"] for x in connector.saved_containers] == ["a", "b"]
+        assert connector._state["poll_watermark"] == {"modified": "2024-05-01T11:00:00Z", "uuids": ["b"]}
+
+        # only changes since the last poll are ingested
+        cases.append(make_case("a", "2024-05-01T12:00:00Z"))
+        run_action(connector, "on_poll", {})
+        assert [x["source_data_identifier"] for x in connector.saved_containers] == ["a", "b", "a"]
+
+    def test_change_during_sweep_is_not_skipped(self, connector, cases):
+        now = datetime.now(timezone.utc)
+        # 'a' was read before it changed; 'b' changed after that and was read with its change
+        cases += [make_case("a", (now - timedelta(hours=1)).isoformat()), make_case("b", (now + timedelta(seconds=6)).isoformat())]
+        run_action(connector, "on_poll", {})
+        assert parse_timestamp(connector._state["poll_watermark"]["modified"]) < now - SWEEP_SKEW + timedelta(seconds=1)
+
+        cases[0] = make_case("a", (now + timedelta(seconds=5)).isoformat())
+        run_action(connector, "on_poll", {})
+        artifact_ids = [x["artifacts"][0]["source_data_identifier"] for x in connector.saved_containers]
+        assert f"a:{cases[0]['modified']}" in artifact_ids
+
+    def test_watermark_kept_when_save_fails(self, connector, cases, monkeypatch):
+        connector._state["poll_watermark"] = {"modified": "2024-05-01T09:00:00Z", "uuids": []}
+        cases += [make_case("a", "2024-05-01T10:00:00Z"), make_case("b", "2024-05-01T11:00:00Z")]
+        connector.poll_batch_size = 1
+        results = iter([(True, "", [{"success": True}]), (False, "database locked", [])])
+        monkeypatch.setattr(connector, "save_containers", lambda containers: next(results))
+
+        action_result = run_action(connector, "on_poll", {})
+        assert not action_result.status
+        assert action_result.summary["total_objects_successful"] == 1
+        assert connector._state["poll_watermark"] == {"modified": "2024-05-01T09:00:00Z", "uuids": []}
+
+    def test_watermark_kept_on_poll_now(self, connector, cases):
+        cases += [make_case(f"case-{i}", f"2024-05-01T1{i}:00:00Z") for i in range(5)]
+        connector.poll_now = True
+        action_result = run_action(connector, "on_poll", {"container_count": 2})
+        assert action_result.status
+        assert len(connector.saved_containers) == 2
+        assert "poll_watermark" not in connector._state
+
+    def test_watermark_kept_at_deadline(self, connector, monkeypatch):
+        def iter_cases_filtered(**kwargs):
+            yield make_case("a", "2024-05-01T10:00:00Z")
+            raise DeadlineExceededError("deadline")
+
+        monkeypatch.setattr(connector.cydarm, "iter_cases_filtered", iter_cases_filtered)
+        action_result = run_action(connector, "on_poll", {})
+        assert action_result.status
+        assert action_result.summary["partial_results"]
+        assert len(connector.saved_containers) == 1
+        assert "poll_watermark" not in connector._state
+
+
+class TestSyncLocalCases:
+    def test_incremental_sync_writes_changed_cases(self, connector, monkeypatch):
+        cases = [make_case("a", "2024-05-01T10:00:00Z"), make_case("b", "2024-05-01T11:00:00Z")]
+        monkeypatch.setattr(connector.cydarm, "iter_cases_filtered", lambda **kwargs: iter(list(cases)))
+        action_result = run_action(connector, "sync_local_cases", {})
+        assert action_result.summary["cases_written"] == 2
+
+        cases[0] = make_case("a", "2024-05-01T12:00:00Z")
+        assert run_action(connector, "sync_local_cases", {}).summary["cases_written"] == 1
+        assert run_action(connector, "sync_local_cases", {"full_sync": True}).summary["cases_written"] == 2
+
+
+class TestBulkCreateCases:
+    def test_worker_pool(self, connector, requests_mock, monkeypatch):
+        # requests_mock sends one request at a time, so the pool is checked by how far ahead of the finished requests
+        # the workers read rows
+        connector.max_concurrency = 3
+        num_read = 0
+        num_created = 0
+        max_outstanding = 0
+
+        def iter_rows(source):
+            nonlocal num_read, max_outstanding
+            for row in iter_case_rows(source):
+                num_read += 1
+                max_outstanding = max(max_outstanding, num_read - num_created)
+                yield row
+
+        def create_case(request, context):
+            nonlocal num_created
+            num_created += 1
+            return {"uuid": f"uuid-{request.json()['description']}"}
+
+        monkeypatch.setattr(cydarm_connector, "iter_case_rows", iter_rows)
+        requests_mock.post(f"{BASE_URL}/case", json=create_case)
+        rows = [make_case_row(str(i)) for i in range(1, 11)]
+
+        action_result = run_action(connector, "bulk_create_cases", {"data": json.dumps(rows)})
+        assert action_result.status
+        assert max_outstanding == 3
+        assert [x["row"] for x in action_result.data] == list(range(1, 11))
+        assert [x["uuid"] for x in action_result.data] == [f"uuid-{i}" for i in range(1, 11)]
+
+    def test_invalid_rows(self, connector, requests_mock):
+        requests_mock.post(f"{BASE_URL}/case", json={"uuid": "abc123"})
+        rows = [make_case_row("1"), make_case_row("2", severity=9), make_case_row("3")]
+        del rows[2]["org"]
+
+        action_result = run_action(connector, "bulk_create_cases", {"data": json.dumps(rows)})
+        assert action_result.status
+        assert action_result.data == [{"row": 1, "uuid": "abc123"}]
+        assert action_result.summary["errors"] == {"row 2": "'severity' must be 1 to 5, got 9", "row 3": "missing required field 'org'"}
+
+    def test_deadline(self, connector, requests_mock):
+        connector.max_concurrency = 2
+        num_created = 0
+
+        def create_case(request, context):
+            nonlocal num_created
+            num_created += 1
+            if num_created == 3:
+                # no request is started after this one
+                connector.cydarm.deadline.expires_at = time.monotonic()
+            return {"uuid": f"uuid-{num_created}"}
+
+        connector.cydarm.deadline.expires_at = time.monotonic() + 60
+        requests_mock.post(f"{BASE_URL}/case", json=create_case)
+        rows = [make_case_row(str(i)) for i in range(1, 21)]
+
+        action_result = run_action(connector, "bulk_create_cases", {"data": json.dumps(rows)})
+        assert action_result.status
+        assert action_result.summary["partial_results"]
+        assert len(action_result.data) == num_created
+        # each worker stops at the deadline, leaving the remaining rows unread
+        assert len(action_result.data) + len(action_result.summary["errors"]) <= num_created + connector.max_concurrency
+        assert all("deadline" in error for error in action_result.summary["errors"].values())
+
+
+class TestFieldsProjection:
+    def test_fields_applied_to_data(self, connector, requests_mock):
+        case = {"uuid": "abc123", "status": "Open", "metadata": {"Email-From": {"value": "a@b.com", "name": "Email-From"}}}
+        requests_mock.get(f"{BASE_URL}/case/abc123", json=case)
+        action_result = run_action(connector, "get_case", {"case_uuid": "abc123", "fields": '["uuid", "metadata.*.value"]'})
+        assert action_result.data == [{"uuid": "abc123", "metadata": {"Email-From": {"value": "a@b.com"}}}]
+
+    def test_no_fields(self, connector, requests_mock):
+        case = {"uuid": "abc123", "status": "Open"}
+        requests_mock.get(f"{BASE_URL}/case/abc123", json=case)
+        action_result = run_action(connector, "get_case", {"case_uuid": "abc123"})
+        assert action_result.data == [case]
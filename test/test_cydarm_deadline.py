@@ -0,0 +1,96 @@
+# File: test_cydarm_deadline.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import time
+
+import pytest
+import requests
+
+from cydarm_api import CydarmAPI
+from cydarm_deadline import Deadline, DeadlineExceededError
+from cydarm_retry import RetryPolicy
+
+
+BASE_URL = "mock://cydarm.com/api"
+HTTPS_BASE_URL = "https://cydarm.com/api"
+USERNAME = "user"
+PASSWORD = "pass"  # pragma: allowlist secret
+
+
+def make_api(base_url=BASE_URL, **kwargs) -> CydarmAPI:
+    return CydarmAPI(base_url=base_url, username=USERNAME, password=PASSWORD, bearer_token="token", **kwargs)
+
+
+class TestDeadline:
+    def test_no_deadline(self):
+        for deadline in (Deadline(), Deadline(0)):
+            assert deadline.remaining() is None
+            assert not deadline.expired()
+            deadline.check()
+
+    def test_expiry(self):
+        deadline = Deadline(60)
+        assert 59 < deadline.remaining() <= 60
+        deadline.expires_at = time.monotonic() - 1
+        assert deadline.remaining() == 0
+        with pytest.raises(DeadlineExceededError):
+            deadline.check()
+
+
+class TestTimeouts:
+    def test_timeouts_are_passed(self, requests_mock):
+        requests_mock.get(f"{BASE_URL}/case/abc", json={"uuid": "abc"})
+        make_api(connect_timeout=3, read_timeout=30).rest_get("/case/abc")
+        assert requests_mock.last_request.timeout == (3, 30)
+
+    def test_timeouts_are_cut_to_deadline(self, requests_mock):
+        requests_mock.get(f"{BASE_URL}/case/abc", json={"uuid": "abc"})
+        make_api(connect_timeout=3, read_timeout=30, deadline=Deadline(5)).rest_get("/case/abc")
+        connect_timeout, read_timeout = requests_mock.last_request.timeout
+        assert connect_timeout == 3
+        assert 4 < read_timeout <= 5
+
+    def test_no_request_after_deadline(self, requests_mock):
+        case = requests_mock.get(f"{BASE_URL}/case/abc", json={"uuid": "abc"})
+        deadline = Deadline(60)
+        deadline.expires_at = time.monotonic() - 1
+        with pytest.raises(DeadlineExceededError):
+            make_api(deadline=deadline).rest_get("/case/abc")
+        assert case.call_count == 0
+
+    def test_no_retry_past_deadline(self, requests_mock):
+        case = requests_mock.get(f"{BASE_URL}/case/abc", status_code=503, headers={"Retry-After": "30"})
+        api = make_api(deadline=Deadline(5), retry_policy=RetryPolicy(max_retries=3, backoff_max=60))
+        with pytest.raises(requests.HTTPError):
+            api.rest_get("/case/abc")
+        assert case.call_count == 1
+
+    def test_pagination_stops_at_deadline(self, requests_mock):
+        deadline = Deadline(60)
+
+        def callback(request, context):
+            # the deadline passes while the second page is being fetched
+            if "page%5Bnumber%5D=1" in request.url:
+                deadline.expires_at = time.monotonic() - 1
+            page_number = int(request.qs["page[number]"][0])
+            return {"data": [{"uuid": f"case-{page_number}"}], "links": {"next": "/case"}}
+
+        requests_mock.get(f"{HTTPS_BASE_URL}/case", json=callback)
+        cases = []
+        with pytest.raises(DeadlineExceededError):
+            for case in make_api(base_url=HTTPS_BASE_URL, deadline=deadline).iter_cases_filtered(page_size=1):
+                cases.append(case)
+        assert cases == [{"uuid": "case-0"}, {"uuid": "case-1"}]
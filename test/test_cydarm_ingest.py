@@ -0,0 +1,106 @@
+# File: test_cydarm_ingest.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+from datetime import datetime, timezone
+
+from cydarm_ingest import SWEEP_SKEW, Watermark, case_to_container, parse_timestamp
+
+
+def make_case(uuid, modified, **fields):
+    return {"uuid": uuid, "modified": modified, **fields}
+
+
+class TestParseTimestamp:
+    def test_formats(self):
+        expected = datetime(2024, 5, 1, 10, 0, 0, 123456, tzinfo=timezone.utc)
+        assert parse_timestamp("2024-05-01T10:00:00.123456Z") == expected
+        assert parse_timestamp("2024-05-01T10:00:00.123456789Z") == expected
+        assert parse_timestamp("2024-05-01T20:00:00.123456+10:00") == expected
+        assert parse_timestamp("2024-05-01T10:00:00.123456") == expected
+
+    def test_invalid(self):
+        assert parse_timestamp(None) is None
+        assert parse_timestamp("yesterday") is None
+
+
+class TestWatermark:
+    def test_empty_watermark_accepts_everything(self):
+        assert Watermark().is_new(make_case("a", "2024-05-01T10:00:00Z"))
+
+    def test_is_new(self):
+        watermark = Watermark(modified="2024-05-01T10:00:00Z", uuids=["a"])
+        assert not watermark.is_new(make_case("a", "2024-05-01T10:00:00Z"))
+        assert not watermark.is_new(make_case("b", "2024-05-01T09:59:59Z"))
+        assert watermark.is_new(make_case("b", "2024-05-01T10:00:00Z"))
+        assert watermark.is_new(make_case("a", "2024-05-01T10:00:00.5Z"))
+        assert not watermark.is_new({"uuid": "c"})
+
+    def test_advance_in_any_order(self):
+        watermark = Watermark()
+        for case in [
+            make_case("b", "2024-05-01T10:00:00Z"),
+            make_case("a", "2024-05-01T11:00:00Z"),
+            make_case("c", "2024-05-01T09:00:00Z"),
+            make_case("d", "2024-05-01T11:00:00Z"),
+        ]:
+            watermark.advance(case)
+        assert watermark.to_dict() == {"modified": "2024-05-01T11:00:00Z", "uuids": ["a", "d"]}
+
+    def test_cap(self):
+        sweep_started_at = datetime(2024, 5, 1, 11, 0, 0, tzinfo=timezone.utc)
+        watermark = Watermark(modified="2024-05-01T10:00:00Z", uuids=["a"])
+        watermark.cap(sweep_started_at)
+        assert watermark.to_dict() == {"modified": "2024-05-01T10:00:00Z", "uuids": ["a"]}
+
+        watermark = Watermark(modified="2024-05-01T10:59:00Z", uuids=["a"])
+        watermark.cap(sweep_started_at)
+        assert watermark.to_dict() == {"modified": (sweep_started_at - SWEEP_SKEW).isoformat(), "uuids": []}
+        assert watermark.is_new(make_case("a", "2024-05-01T10:59:00Z"))
+
+        watermark = Watermark()
+        watermark.cap(sweep_started_at)
+        assert watermark.to_dict() == {"modified": None, "uuids": []}
+
+    def test_round_trip(self):
+        watermark = Watermark.from_dict({"modified": "2024-05-01T10:00:00Z", "uuids": ["a"]})
+        assert Watermark.from_dict(watermark.to_dict()).to_dict() == watermark.to_dict()
+        assert Watermark.from_dict(None).to_dict() == {"modified": None, "uuids": []}
+
+
+class TestCaseToContainer:
+    def test_container(self):
+        case = make_case("a", "2024-05-01T10:00:00Z", locator="CASE-1", description="Phishing", severity=2, tags=["x"], closed=None)
+        container = case_to_container(case, label="events")
+        assert container["name"] == "CASE-1 - Phishing"
+        assert container["source_data_identifier"] == "a"
+        assert container["severity"] == "high"
+        assert container["label"] == "events"
+        artifact = container["artifacts"][0]
+        assert artifact["source_data_identifier"] == "a:2024-05-01T10:00:00Z"
+        assert artifact["cef"] == {
+            "cydarmCaseUuid": "a",
+            "locator": "CASE-1",
+            "description": "Phishing",
+            "severity": 2,
+            "tags": ["x"],
+            "modified": "2024-05-01T10:00:00Z",
+        }
+
+    def test_defaults(self):
+        container = case_to_container(make_case("a", "2024-05-01T10:00:00Z"))
+        assert container["name"] == "a"
+        assert container["severity"] == "medium"
+        assert "label" not in container
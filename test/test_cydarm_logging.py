@@ -0,0 +1,84 @@
+# File: test_cydarm_logging.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import logging
+
+from cydarm_api import CydarmAPI
+from cydarm_logging import CydarmLogger, summarize
+
+
+BASE_URL = "mock://cydarm.com/api"
+BEARER_TOKEN = "bearer token jwt"
+
+
+class TestSummarize:
+    def test_redacts_secrets(self):
+        text = summarize({"headers": {"x-cydarm-authz": BEARER_TOKEN, "Accept": "application/json"}, "Password": "pass"})
+        assert BEARER_TOKEN not in text
+        assert "pass" not in text.replace("***", "")
+        assert "application/json" in text
+
+    def test_truncates_lists_and_strings(self):
+        text = summarize({"data": list(range(1000))}, max_items=3)
+        assert text == '{"data": [0, 1, 2, "... 997 more items"]}'
+        text = summarize("x" * 5000, max_chars=10)
+        assert text == "xxxxxxxxxx... (5000 chars)"
+        assert summarize(b"\x00" * 100) == "<100 bytes>"
+
+
+class TestCydarmLogger:
+    def test_level_gating(self):
+        messages = []
+        logger = CydarmLogger(messages.append, level=logging.INFO)
+        logger.debug("not logged: %s", {"a": 1})
+        logger.info("logged: %s", {"a": 1})
+        logger.warning("plain")
+        assert messages == ['logged: {"a": 1}', "plain"]
+
+    def test_args_are_not_formatted_when_disabled(self):
+        class Unformattable:
+            def __str__(self):
+                raise AssertionError("should not be formatted")
+
+        logger = CydarmLogger.from_verbosity(print, "off")
+        logger.warning("%s", Unformattable())
+        assert not CydarmLogger(None).is_enabled_for(logging.CRITICAL)
+
+    def test_from_verbosity(self):
+        assert CydarmLogger.from_verbosity(print, "DEBUG").level == logging.DEBUG
+        assert CydarmLogger.from_verbosity(print, None).level == logging.INFO
+        assert CydarmLogger.from_verbosity(print, "loud").level == logging.INFO
+
+    def test_request_logging_redacts_token(self, requests_mock):
+        requests_mock.get(f"{BASE_URL}/case/abc", json={"uuid": "abc", "data": ["x"] * 100})
+        messages = []
+        api = CydarmAPI(
+            base_url=BASE_URL,
+            username="user",
+            password="pass",  # pragma: allowlist secret
+            bearer_token=BEARER_TOKEN,
+            logger=CydarmLogger(messages.append, level=logging.DEBUG),
+        )
+        api.get_case("abc")
+        assert messages
+        assert all(BEARER_TOKEN not in message for message in messages)
+
+    def test_no_request_logging_at_info(self, requests_mock):
+        requests_mock.get(f"{BASE_URL}/case/abc", json={"uuid": "abc"})
+        messages = []
+        api = CydarmAPI(base_url=BASE_URL, username="user", password="pass", bearer_token=BEARER_TOKEN, log_function=messages.append)
+        api.get_case("abc")
+        assert messages == []
@@ -0,0 +1,75 @@
+# File: test_cydarm_metrics.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import pytest
+import requests
+
+from cydarm_api import CydarmAPI
+from cydarm_metrics import Metrics, get_quantile, get_url_template
+
+
+BASE_URL = "mock://cydarm.com/api"
+
+
+class TestMetrics:
+    def test_url_template(self):
+        assert get_url_template("/case/1234") == "/case/{uuid}"
+        assert get_url_template("/case/1234/playbook/5678") == "/case/{uuid}/playbook/{uuid}"
+        assert get_url_template("/case/quick-search") == "/case/quick-search"
+        assert get_url_template("/case?page[number]=2") == "/case"
+
+    def test_quantiles(self):
+        values = [float(i) for i in range(1, 101)]
+        assert get_quantile(values, 0.5) == 50
+        assert get_quantile(values, 0.95) == 95
+        assert get_quantile([], 0.5) == 0
+
+    def test_summary(self):
+        metrics = Metrics()
+        metrics.record_request("get", "/case/a", 200, 0.010, num_bytes=100)
+        metrics.record_request("get", "/case/b", 200, 0.030, num_bytes=50)
+        metrics.record_request("get", "/case/c", None, 0.5)
+        with metrics.timer("generate_bearer_token"):
+            pass
+        summary = metrics.summary()
+        assert summary["requests"] == 3
+        assert summary["bytes_received"] == 150
+        assert summary["status_codes"] == {"200": 2, "error": 1}
+        assert summary["endpoints"]["GET /case/{uuid}"] == {"count": 3, "total_ms": 540.0, "p50_ms": 30.0, "p95_ms": 500.0}
+        assert summary["operations"]["generate_bearer_token"]["count"] == 1
+
+    def test_prometheus(self, tmp_path):
+        metrics = Metrics()
+        metrics.record_request("post", "/case/a/tag", 201, 0.25)
+        path = tmp_path / "cydarm.prom"
+        metrics.write_prometheus(str(path))
+        text = path.read_text()
+        assert 'cydarm_http_request_duration_seconds{method="POST",endpoint="/case/{uuid}/tag",quantile="0.95"} 0.25' in text
+        assert 'cydarm_http_responses_total{method="POST",endpoint="/case/{uuid}/tag",status="201"} 1' in text
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_api_records_requests(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": "token"})
+        requests_mock.get(f"{BASE_URL}/case/abc", json={"uuid": "abc"})
+        requests_mock.get(f"{BASE_URL}/case/missing", status_code=404)
+        api = CydarmAPI(base_url=BASE_URL, username="user", password="pass")  # pragma: allowlist secret
+        api.get_case("abc")
+        with pytest.raises(requests.HTTPError):
+            api.get_case("missing")
+        summary = api.metrics.summary()
+        assert summary["endpoints"]["GET /case/{uuid}"]["count"] == 2
+        assert summary["status_codes"] == {"200": 2, "404": 1}
+        assert set(summary["operations"]) == {"generate_bearer_token", "json_decode"}
@@ -0,0 +1,73 @@
+# File: test_cydarm_mirror.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from mock_cydarm_server import make_case
+
+from cydarm_mirror import CaseMirror
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    with CaseMirror(str(tmp_path / "cases.db")) as mirror:
+        yield mirror
+
+
+class TestCaseMirror:
+    def test_query_filters(self, mirror):
+        cases = [make_case(i) for i in range(30)]
+        mirror.sync(cases)
+        found = list(mirror.query(statuses=["open"], severities=[1], tags=["PHISHING"]))
+        expected = [case for case in cases if case["status"] == "Open" and case["severity"] == 1 and "phishing" in case["tags"]]
+        assert found and sorted(case["uuid"] for case in found) == sorted(case["uuid"] for case in expected)
+        assert len(list(mirror.query(orgs=["org-1"], max_results=3))) == 3
+
+    def test_sync_only_writes_changed_cases(self, mirror):
+        cases = [make_case(i) for i in range(10)]
+        assert mirror.sync(cases) == 10
+        assert mirror.get_age() < 60
+        cases[2] = {**cases[2], "tags": ["malware"], "modified": "2030-01-01T00:00:00+00:00"}
+        assert mirror.sync(cases) == 1
+        assert next(mirror.query(tags=["malware"]))["uuid"] == cases[2]["uuid"]
+
+    def test_change_during_sync_is_not_skipped(self, mirror):
+        now = datetime.now(timezone.utc)
+        x, y = ({"uuid": uuid, "modified": (now - timedelta(hours=1)).isoformat()} for uuid in ("x", "y"))
+        assert mirror.sync([x, y]) == 2
+        # x is read before it changes at t+5, y after it changes at t+6
+        y = {**y, "modified": (now + timedelta(seconds=6)).isoformat()}
+        assert mirror.sync([x, y]) == 1
+        x = {**x, "status": "Closed", "modified": (now + timedelta(seconds=5)).isoformat()}
+        assert mirror.sync([x, y]) == 2
+        assert next(mirror.query(statuses=["closed"]))["uuid"] == "x"
+
+    def test_failed_sync_is_not_recorded(self, mirror):
+        def cases():
+            yield make_case(0)
+            raise RuntimeError("connection lost")
+
+        with pytest.raises(RuntimeError):
+            mirror.sync(cases())
+        assert mirror.get_age() is None
+        assert mirror.count() == 1
+
+    def test_full_sync_removes_deleted_cases(self, mirror):
+        mirror.sync([make_case(i) for i in range(5)])
+        assert mirror.sync([make_case(i) for i in range(3)], full=True) == 3
+        assert mirror.count() == 3
+        assert not list(mirror.query(tags=[make_case(4)["tags"][0]], orgs=[make_case(4)["org"]], statuses=[make_case(4)["status"]]))
@@ -0,0 +1,65 @@
+# File: test_cydarm_projection.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+from cydarm_projection import compile_projection
+
+
+CASE = {
+    "uuid": "c1",
+    "status": "Open",
+    "acl": {"uuid": "acl1", "entries": ["a", "b"]},
+    "metadata": {"Email-From": {"value": "a@example.com", "acl": "x"}, "Email-To": {"value": "b@example.com", "acl": "x"}},
+    "action_statuses": [{"actionName": "Triage", "actionInstanceUuid": "ai1"}, {"actionName": "Contain", "actionInstanceUuid": "ai2"}],
+}
+
+
+class TestProjection:
+    def test_no_paths_keeps_items_whole(self):
+        assert compile_projection([]) is None
+        assert compile_projection([" ", ""]) is None
+
+    def test_dotted_paths(self):
+        project = compile_projection(["uuid", "action_result.data.*.metadata.Email-From.value", "missing.field"])
+        assert project(CASE) == {"uuid": "c1", "metadata": {"Email-From": {"value": "a@example.com"}}}
+        # the item itself is not changed
+        assert "acl" in CASE
+
+    def test_wildcards(self):
+        project = compile_projection(["metadata.*.value", "action_statuses.*.actionName", "acl"])
+        assert project(CASE) == {
+            "acl": CASE["acl"],
+            "metadata": {"Email-From": {"value": "a@example.com"}, "Email-To": {"value": "b@example.com"}},
+            "action_statuses": [{"actionName": "Triage"}, {"actionName": "Contain"}],
+        }
+        # a list is projected element by element without an explicit '*'
+        assert compile_projection(["action_statuses.actionInstanceUuid"])(CASE)["action_statuses"] == [
+            {"actionInstanceUuid": "ai1"},
+            {"actionInstanceUuid": "ai2"},
+        ]
+
+    def test_wildcard_and_named_key(self):
+        expected = {"metadata": {"Email-From": {"value": "a@example.com", "acl": "x"}, "Email-To": {"value": "b@example.com"}}}
+        assert compile_projection(["metadata.*.value", "metadata.Email-From.acl"])(CASE) == expected
+        assert compile_projection(["metadata.Email-From.acl", "metadata.*.value"])(CASE) == expected
+        assert compile_projection(["metadata.*.value", "metadata.Email-From"])(CASE)["metadata"]["Email-From"] == CASE["metadata"]["Email-From"]
+        assert compile_projection(["action_statuses.*.actionName", "action_statuses.actionInstanceUuid"])(CASE)["action_statuses"] == [
+            {"actionName": "Triage", "actionInstanceUuid": "ai1"},
+            {"actionName": "Contain", "actionInstanceUuid": "ai2"},
+        ]
+
+    def test_shorter_path_keeps_whole_value(self):
+        assert compile_projection(["metadata.Email-From.value", "metadata"])(CASE) == {"metadata": CASE["metadata"]}
+        assert compile_projection(["metadata", "metadata.Email-From.value"])(CASE) == {"metadata": CASE["metadata"]}
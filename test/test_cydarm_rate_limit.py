@@ -0,0 +1,88 @@
+# File: test_cydarm_rate_limit.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cydarm_api import CydarmAPI
+from cydarm_rate_limit import RateLimiter, TokenBucket, get_endpoint_class
+
+
+BASE_URL = "mock://cydarm.com/api"
+
+
+class TestTokenBucket:
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate=10, burst=3)
+        assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+        assert 0.05 < bucket.try_acquire() <= 0.1
+
+    def test_rate_must_be_positive(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_threads_share_the_bucket(self):
+        bucket = TokenBucket(rate=100, burst=1)
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: bucket.acquire(), range(20)))
+        assert time.monotonic() - start >= 0.18
+
+    def test_state_file_is_shared(self, tmp_path):
+        state_path = str(tmp_path / "bucket.json")
+        first = TokenBucket(rate=1, burst=2, state_path=state_path)
+        second = TokenBucket(rate=1, burst=2, state_path=state_path)
+        assert first.try_acquire() == 0
+        assert second.try_acquire() == 0
+        assert first.try_acquire() > 0
+        assert second.try_acquire() > 0
+
+    def test_corrupt_state_file_starts_full(self, tmp_path):
+        state_path = tmp_path / "bucket.json"
+        state_path.write_text("not json")
+        assert TokenBucket(rate=1, state_path=str(state_path)).try_acquire() == 0
+
+
+class TestRateLimiter:
+    def test_endpoint_classes(self):
+        assert get_endpoint_class("post", "/auth/password") == "auth"
+        assert get_endpoint_class("get", "/case/abc") == "read"
+        assert get_endpoint_class("PUT", "/case/abc/tag/x") == "write"
+
+    def test_from_rates(self, tmp_path):
+        assert RateLimiter.from_rates({"auth": 0, "read": None}) is None
+        limiter = RateLimiter.from_rates({"auth": 0, "write": 5}, state_dir=str(tmp_path), state_key="abc")
+        assert list(limiter.buckets) == ["write"]
+        assert limiter.buckets["write"].state_path == str(tmp_path / "abc_rate_limit_write.json")
+
+    def test_only_limited_classes_wait(self, requests_mock):
+        requests_mock.get(f"{BASE_URL}/case/abc", json={"uuid": "abc"})
+        requests_mock.post(f"{BASE_URL}/case/abc/tag/x", json={})
+        api = CydarmAPI(
+            base_url=BASE_URL,
+            username="user",
+            password="pass",  # pragma: allowlist secret
+            bearer_token="token",
+            rate_limiter=RateLimiter.from_rates({"write": 1}),
+        )
+        start = time.monotonic()
+        for _ in range(5):
+            api.rest_get("/case/abc")
+        api.rest_post("/case/abc/tag/x")
+        assert time.monotonic() - start < 0.5
+        assert api.rate_limiter.buckets["write"].try_acquire() > 0
@@ -0,0 +1,69 @@
+# File: test_cydarm_retry.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import time
+from email.utils import formatdate
+
+import pytest
+
+from cydarm_retry import CircuitBreaker, CircuitOpenError, RetryPolicy, parse_retry_after
+
+
+class TestRetryPolicy:
+    def test_parse_retry_after(self):
+        assert parse_retry_after("5") == 5
+        assert 55 <= parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+    def test_delay_honours_retry_after_up_to_max(self):
+        policy = RetryPolicy(backoff_max=10)
+        assert policy.get_delay(0, "3") == 3
+        assert policy.get_delay(0, "3600") == 10
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=5)
+        assert all(0 <= policy.get_delay(2) <= 4 for _ in range(20))
+        assert all(0 <= policy.get_delay(10) <= 5 for _ in range(20))
+
+    def test_only_idempotent_methods_are_retried(self):
+        policy = RetryPolicy(max_retries=2)
+        assert policy.should_retry("get", 1)
+        assert not policy.should_retry("get", 2)
+        assert not policy.should_retry("post", 0)
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_resets(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        time.sleep(0.06)
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.failures == 0
+
+    def test_state_round_trip(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        breaker.record_failure()
+        restored = CircuitBreaker(failure_threshold=1)
+        restored.load(breaker.to_dict())
+        with pytest.raises(CircuitOpenError):
+            restored.before_call()
@@ -0,0 +1,87 @@
+# File: test_cydarm_upload.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import base64
+import json
+import os
+
+import pytest
+
+from cydarm_api import CydarmAPI
+from cydarm_retry import RetryPolicy
+from cydarm_upload import Base64JSONBody
+
+
+BASE_URL = "mock://cydarm.com/api"
+TEXT = "Forensic note: ünïcödé ✓ \U0001f50d\n" * 100
+
+
+def decode_body(body) -> dict:
+    payload = b"".join(body)
+    assert len(payload) == len(body)
+    return json.loads(payload)
+
+
+class TestBase64JSONBody:
+    @pytest.mark.parametrize("chunk_size", [3, 30, 3 * 1024])
+    def test_text(self, chunk_size):
+        body = decode_body(Base64JSONBody(TEXT, mime_type="text/markdown", significance="Note", chunk_size=chunk_size))
+        assert base64.b64decode(body["data"]).decode("utf-8") == TEXT
+        assert body["mimeType"] == "text/markdown"
+        assert body["significance"] == "Note"
+
+    def test_bytes_and_empty(self):
+        data = bytes(range(256)) * 10
+        assert base64.b64decode(decode_body(Base64JSONBody(data, chunk_size=30))["data"]) == data
+        assert decode_body(Base64JSONBody(b""))["data"] == ""
+
+    def test_file(self, tmp_path):
+        data = os.urandom(100_000)
+        path = tmp_path / "evidence.bin"
+        path.write_bytes(data)
+        body = Base64JSONBody(path, mime_type="application/octet-stream", chunk_size=3 * 1000)
+        # bodies can be sent more than once, e.g. when the request is retried
+        assert decode_body(body) == decode_body(body)
+        assert base64.b64decode(decode_body(body)["data"]) == data
+
+    def test_chunk_size_must_be_multiple_of_3(self):
+        with pytest.raises(ValueError):
+            Base64JSONBody("x", chunk_size=1000)
+
+
+class TestUploadData:
+    def test_create_case_data_is_streamed(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/case/abc/data", json={"uuid": "data-uuid"})
+        api = CydarmAPI(base_url=BASE_URL, username="user", password="pass", bearer_token="token")  # pragma: allowlist secret
+        assert api.create_case_data("abc", TEXT, mime_type="text/plain", significance="Evidence") == {"uuid": "data-uuid"}
+        request = requests_mock.last_request
+        assert request.headers["Content-Type"] == "application/json"
+        assert int(request.headers["Content-Length"]) == len(request.body)
+        body = decode_body(request.body)
+        assert base64.b64decode(body["data"]).decode("utf-8") == TEXT
+        assert body["significance"] == "Evidence"
+
+    def test_retried_upload_resends_body(self, requests_mock):
+        requests_mock.post(f"{BASE_URL}/case/abc/data", [{"status_code": 401}, {"json": {"uuid": "data-uuid"}}])
+        requests_mock.post(f"{BASE_URL}/auth/password", headers={"Access-Token": "new token"})
+        api = CydarmAPI(
+            base_url=BASE_URL, username="user", password="pass", bearer_token="token", retry_policy=RetryPolicy()
+        )  # pragma: allowlist secret
+        api.create_case_data_comment("abc", TEXT)
+        assert base64.b64decode(decode_body(requests_mock.last_request.body)["data"]).decode("utf-8") == TEXT
+
+    def test_non_ascii_credentials(self):
+        assert base64.b64decode(CydarmAPI.to_base64("pässwörd")).decode("utf-8") == "pässwörd"
@@ -0,0 +1,124 @@
+# File: test_mock_cydarm_server.py
+#
+# Copyright (c) 2023-2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+
+import base64
+
+import pytest
+import requests
+from mock_cydarm_server import MockCydarmServer
+
+from cydarm_api import CydarmAPI
+from cydarm_case_filter import CaseFilter
+from cydarm_retry import RetryPolicy
+
+
+USERNAME = "user"
+PASSWORD = "pass"  # pragma: allowlist secret
+
+
+@pytest.fixture(scope="module")
+def server():
+    with MockCydarmServer(num_cases=250) as server:
+        yield server
+
+
+class TestMockCydarmServer:
+    def test_get_cases_filtered(self, server):
+        with CydarmAPI(base_url=server.base_url, username=USERNAME, password=PASSWORD) as api:
+            assert len(api.get_cases_filtered(page_size=100)) == 250
+            assert len(api.get_cases_filtered(page_size=100, max_workers=4)) == 250
+            assert len(api.get_cases_filtered(page_size=100, tags_included="phishing")) == 50
+
+    def test_cases_by_tags(self):
+        with MockCydarmServer(num_cases=50) as server:
+            for index, case in enumerate(server.cases.values()):
+                if index % 2:
+                    case["tags"].append("urgent")
+            by_tag = {tag: {uuid for uuid, case in server.cases.items() if tag in case["tags"]} for tag in ("phishing", "malware", "urgent")}
+            with CydarmAPI(base_url=server.base_url, username=USERNAME, password=PASSWORD) as api:
+                # a multi-tag filter is split into single-tag queries rather than sent to Cydarm
+                cases = api.get_cases_filtered(page_size=10, tags_included="phishing,malware,urgent")
+                assert sorted(case["uuid"] for case in cases) == sorted(by_tag["phishing"] | by_tag["malware"] | by_tag["urgent"])
+
+                cases = api.iter_cases_by_tags(tags_required=["urgent", "phishing"], page_size=10, max_workers=2)
+                assert {case["uuid"] for case in cases} == by_tag["urgent"] & by_tag["phishing"]
+
+                cases = api.iter_cases_by_tags(tags_included=["phishing", "malware"], tags_excluded=["urgent"], page_size=10)
+                assert {case["uuid"] for case in cases} == (by_tag["phishing"] | by_tag["malware"]) - by_tag["urgent"]
+
+                cases = list(api.iter_cases_by_tags(tags_excluded=["urgent"], max_results=5))
+                assert len(cases) == 5 and not {case["uuid"] for case in cases} & by_tag["urgent"]
+
+    def test_sorted_cases_by_tags(self, server):
+        by_severity = CaseFilter(sort=["-severity", "created"])
+        with CydarmAPI(base_url=server.base_url, username=USERNAME, password=PASSWORD) as api:
+            # the cases of both tags are sorted together
+            expected = sorted(
+                (case for case in server.cases.values() if {"phishing", "malware"} & set(case["tags"])),
+                key=lambda case: (-case["severity"], case["created"]),
+            )
+            cases = api.iter_cases_filtered(tags_included="phishing,malware", max_results=10, case_filter=by_severity)
+            assert [case["uuid"] for case in cases] == [case["uuid"] for case in expected[:10]]
+
+    def test_case_filter(self, server):
+        with CydarmAPI(base_url=server.base_url, username=USERNAME, password=PASSWORD) as api:
+            case_filter = CaseFilter(
+                statuses=["Open"],
+                severities=[1, 2],
+                orgs=["org-0"],
+                modified_from="2024-01-01T12:00:00Z",
+                sort=["-severity", "created"],
+            )
+            cases = api.get_cases_filtered(page_size=10, case_filter=case_filter)
+            expected = [
+                case
+                for case in server.cases.values()
+                if case["status"] == "Open" and case["severity"] in (1, 2) and case["org"] == "org-0" and case["modified"] >= "2024-01-01T12"
+            ]
+            expected.sort(key=lambda case: (-case["severity"], case["created"]))
+            assert cases == expected
+
+            cases = api.get_cases_filtered(case_filter=CaseFilter(statuses_excluded=["Closed"], created_to="2024-01-01T00:30:00+00:00"))
+            assert {case["uuid"] for case in cases} == {
+                case["uuid"] for case in server.cases.values() if case["status"] != "Closed" and case["created"] < "2024-01-01T00:31"
+            }
+
+    def test_case_tags(self, server):
+        case_uuid = next(iter(server.cases))
+        with CydarmAPI(base_url=server.base_url, username=USERNAME, password=PASSWORD) as api:
+            api.add_case_tag(case_uuid, "benchmark")
+            assert "benchmark" in api.get_case(case_uuid)["tags"]
+            api.delete_case_tag(case_uuid, "benchmark")
+            assert "benchmark" not in server.cases[case_uuid]["tags"]
+
+    def test_error_injection(self):
+        with MockCydarmServer(num_cases=10, error_rate=1.0) as server:
+            api = CydarmAPI(
+                base_url=server.base_url, username=USERNAME, password=PASSWORD, retry_policy=RetryPolicy(max_retries=2, backoff_max=0)
+            )
+            with pytest.raises(requests.HTTPError):
+                api.get_cases_filtered()
+            assert server.request_counts["GET /case"] == 3
+
+    def test_upload_file(self, server, tmp_path):
+        case_uuid = next(iter(server.cases))
+        path = tmp_path / "log.txt"
+        path.write_text("ünïcödé log line\n" * 50_000, encoding="utf-8")
+        with CydarmAPI(base_url=server.base_url, username=USERNAME, password=PASSWORD) as api:
+            api.create_case_data(case_uuid, path, mime_type="text/plain", significance="Evidence")
+        item = server.case_data[case_uuid][-1]
+        assert base64.b64decode(item["data"]) == path.read_bytes()
+        assert item["significance"] == "Evidence"